@@ -136,14 +136,14 @@ def run_backtest(params):
         
         # 计算结果
         total_return = (current_capital - initial_capital) / initial_capital * 100
-        total_trades = len([t for t in trades if t['action'] == 'BUY'])
-
-        # 计算胜率和盈亏比
-        winning_trades = [t for t in trades if t.get('pnl', 0) > 0]
-        losing_trades = [t for t in trades if t.get('pnl', 0) < 0]
-        win_rate = len(winning_trades) / total_trades * 100 if total_trades > 0 else 0
-        avg_win = sum([t['pnl'] for t in winning_trades]) / len(winning_trades) if winning_trades else 0
-        avg_loss = sum([t['pnl'] for t in losing_trades]) / len(losing_trades) if losing_trades else 0
+        total_trades = sum(1 for t in trades if t['action'] == 'BUY')
+
+        # 计算胜率和盈亏比（生成器计数/求和，不构造中间列表）
+        win_count = sum(1 for t in trades if t.get('pnl', 0) > 0)
+        loss_count = sum(1 for t in trades if t.get('pnl', 0) < 0)
+        win_rate = win_count / total_trades * 100 if total_trades > 0 else 0
+        avg_win = sum(t['pnl'] for t in trades if t.get('pnl', 0) > 0) / win_count if win_count else 0
+        avg_loss = sum(t['pnl'] for t in trades if t.get('pnl', 0) < 0) / loss_count if loss_count else 0
         profit_factor = abs(avg_win / avg_loss) if avg_loss != 0 else 0
 
         logger.info(f"✓ 回测完成")
@@ -176,8 +176,8 @@ def run_backtest(params):
                 'final_capital': current_capital,
                 'return_pct': total_return,
                 'total_trades': total_trades,
-                'winning_trades': len(winning_trades),
-                'losing_trades': len(losing_trades),
+                'winning_trades': win_count,
+                'losing_trades': loss_count,
                 'win_rate': win_rate,
                 'avg_win': avg_win,
                 'avg_loss': avg_loss,
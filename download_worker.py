@@ -6,7 +6,13 @@
 
 import sys
 import json
-from tools.data_downloader import DataDownloader
+import asyncio
+from tools.data_downloader import DataDownloader, to_okx_symbol, write_csv, write_parquet
+
+
+def report_progress(percent: int, message: str):
+    """向GUI报告进度（GUI按 PROGRESS:<百分比>:<消息> 格式解析标准输出）"""
+    print(f"PROGRESS:{percent}:{message}", flush=True)
 
 
 def main():
@@ -23,26 +29,28 @@ def main():
         market = params['market']
         interval = params['interval']
         start_date = params['start_date']
+        storage_format = params.get('storage_format', 'parquet')
         
         # 创建下载器
+        report_progress(10, "初始化下载器...")
         downloader = DataDownloader(exchange=exchange)
+
+        report_progress(30, f"开始下载 {symbol} 数据...")
         
         # 下载数据
         df = None
         if exchange == 'binance':
-            df = downloader.download_klines_binance(
+            # 按时间分段并发下载
+            df = asyncio.run(downloader.download_klines_binance_async(
                 symbol=symbol,
                 interval=interval,
                 start_time=start_date,
                 end_time=None
-            )
+            ))
         elif exchange == 'okx':
             # OKX需要横杠格式
-            symbol_okx = symbol
-            if '-' not in symbol_okx:
-                symbol_okx = symbol_okx.replace('USDT', '-USDT')
             df = downloader.download_klines_okx(
-                symbol=symbol_okx,
+                symbol=to_okx_symbol(symbol),
                 interval=interval,
                 start_time=start_date
             )
@@ -61,6 +69,8 @@ def main():
             print(json.dumps({"success": False, "message": "未下载到数据"}))
             sys.exit(1)
 
+        report_progress(80, "保存数据...")
+
         # 保存数据 - 使用与crypto_data_loader一致的目录结构
         # 路径格式: data/historical/{exchange}/{market}/{symbol}/
         from datetime import datetime
@@ -69,11 +79,17 @@ def main():
 
         # 文件名包含时间戳
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{symbol}_{interval}_{timestamp}.parquet"
+        suffix = 'csv' if storage_format == 'csv' else 'parquet'
+        filename = f"{symbol}_{interval}_{timestamp}.{suffix}"
         filepath = symbol_dir / filename
 
-        # 保存为parquet格式
-        df.to_parquet(str(filepath), index=False)
+        # 默认保存为parquet格式（zstd压缩），CSV仅在配置 storage_format=csv 时使用
+        if suffix == 'parquet':
+            write_parquet(df, filepath)
+        else:
+            write_csv(df, filepath)
+
+        report_progress(100, "下载完成！")
 
         # 返回成功
         result = {
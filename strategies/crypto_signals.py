@@ -16,6 +16,20 @@ from strategies.crypto_data_loader import load_crypto_data
 from loguru import logger
 
 
+def _rising(a: np.ndarray) -> np.ndarray:
+    """a > REF(a, 1)，首根为False（等价于 pandas 的 s > s.shift(1)）"""
+    out = np.zeros(len(a), dtype=bool)
+    out[1:] = a[1:] > a[:-1]
+    return out
+
+
+def _falling(a: np.ndarray) -> np.ndarray:
+    """a < REF(a, 1)，首根为False（等价于 pandas 的 s < s.shift(1)）"""
+    out = np.zeros(len(a), dtype=bool)
+    out[1:] = a[1:] < a[:-1]
+    return out
+
+
 class SignalCalculator:
     """
     信号计算器 - 从期货策略转换
@@ -94,28 +108,38 @@ class SignalCalculator:
         data['MA120'] = np.nan_to_num(MA(data['close'], 120), nan=0).round(2)
         data['MA250'] = np.nan_to_num(MA(data['close'], 250), nan=0).round(2)
 
+        # 与前一根的比较直接在ndarray上进行，避免pandas对齐开销
+        ma1 = data['MA1'].to_numpy()
+        ma2 = data['MA2'].to_numpy()
+        ma3 = data['MA3'].to_numpy()
+        ma4 = data['MA4'].to_numpy()
+        ma1_up, ma1_down = _rising(ma1), _falling(ma1)
+        ma2_down = _falling(ma2)
+        ma3_up, ma3_down = _rising(ma3), _falling(ma3)
+        ma4_up, ma4_down = _rising(ma4), _falling(ma4)
+
         # HA指标(趋势强度)
-        data['H4A1'] = ((data['MA1'] > data['MA1'].shift(1)) &
-                       (data['MA3'] > data['MA3'].shift(1))).astype(int)
+        data['H4A1'] = (ma1_up & ma3_up).astype(int)
         data['HA'] = np.nan_to_num((MA(data['H4A1'], self.N) * 2500 * 16), nan=0).astype(int)
 
         # HD指标
-        data['H4D1'] = (data['MA4'] > data['MA4'].shift(1)).astype(int)
+        data['H4D1'] = ma4_up.astype(int)
         data['HD'] = np.nan_to_num((MA(data['H4D1'], self.N) * 2500 * 14), nan=0).astype(int)
 
         # 下跌趋势检测
-        data['MD12'] = ((data['MA2'] < data['MA2'].shift(1)) &
-                       (data['MA1'] < data['MA1'].shift(1))).astype(int)
-        data['MD23'] = ((data['MA2'] < data['MA2'].shift(1)) &
-                       (data['MA3'] < data['MA3'].shift(1))).astype(int)
-        data['MD34'] = ((data['MA4'] < data['MA4'].shift(1)) &
-                       (data['MA3'] < data['MA3'].shift(1))).astype(int)
-        data['MD123'] = (data['MD12'] > 0) & (data['MD23'] > 0)
-        data['MD234'] = (data['MD23'] > 0) & (data['MD34'] > 0)
-        data['MQDQ'] = ((data['MD123'] > 0) & (data['MD234'] > 0)).astype(int)
+        md12 = ma2_down & ma1_down
+        md23 = ma2_down & ma3_down
+        md34 = ma4_down & ma3_down
+        data['MD12'] = md12.astype(int)
+        data['MD23'] = md23.astype(int)
+        data['MD34'] = md34.astype(int)
+        data['MD123'] = md12 & md23
+        data['MD234'] = md23 & md34
+        data['MQDQ'] = (md12 & md23 & md34).astype(int)
         data['MQD'] = np.nan_to_num((MA(data['MQDQ'], self.N) * 200), nan=0)
         data['WXD1'] = (data['MQD'] > 100.3).astype(int)
-        data['WOD'] = np.nan_to_num(MA(data['WXD1'], self.N) * 350, nan=0)
+        wod = np.nan_to_num(MA(data['WXD1'], self.N) * 350, nan=0)
+        data['WOD'] = wod
 
         # MACD相关
         data['DIF'] = np.nan_to_num((EMA(data['close'], self.SHORT) -
@@ -123,47 +147,44 @@ class SignalCalculator:
         data['DEA'] = np.nan_to_num(MA(data['DIF'], self.MID), nan=0)
 
         # QS指标(强势信号)
-        data['QS1'] = ((data['DIF'] > data['DEA']) &
-                      (data['MA1'] > data['MA1'].shift(1)) &
-                      (data['WOD'] < 80)).astype(int)
-        data['QS'] = -np.nan_to_num((MA(data['QS1'], self.N) * 1500), nan=0).astype(int)
+        qs1 = (data['DIF'].to_numpy() > data['DEA'].to_numpy()) & ma1_up & (wod < 80)
+        data['QS1'] = qs1.astype(int)
+        qs = -np.nan_to_num((MA(qs1.astype(int), self.N) * 1500), nan=0).astype(int)
+        data['QS'] = qs
 
         # ZZ指标
-        data['BA721'] = ((data['MA3'] > data['MA3'].shift(1)) &
-                        (data['MA4'] > data['MA4'].shift(1)) &
-                        (data['WOD'] < 66) &
-                        (ABS(data['QS']) > 300)).astype(int)
-        data['ZZ'] = np.nan_to_num((MA(data['BA721'], self.N) * 25000), nan=0).astype(int)
+        data['BA721'] = (ma3_up & ma4_up & (wod < 66) & (ABS(qs) > 300)).astype(int)
+        zz = np.nan_to_num((MA(data['BA721'], self.N) * 25000), nan=0).astype(int)
+        data['ZZ'] = zz
 
         # J1和F5指标
-        data['MA4Q'] = ((data['MA4'] > data['MA4'].shift(1)) &
-                       (data['WOD'] < 66)).astype(int)
-        data['J1'] = np.nan_to_num(-MA(data['MA4Q'], self.N) * 2500 * 2, nan=0)
-        data['F51'] = ((ABS(data['ZZ']) < 1000) &
-                      (ABS(data['QS']) < 300) &
-                      (ABS(data['J1']) > 4000)).astype(int)
-        data['F5'] = np.nan_to_num((MA(data['F51'], self.N) * 2500 * 20), nan=0).astype(int)
+        data['MA4Q'] = (ma4_up & (wod < 66)).astype(int)
+        j1 = np.nan_to_num(-MA(data['MA4Q'], self.N) * 2500 * 2, nan=0)
+        data['J1'] = j1
+        data['F51'] = ((ABS(zz) < 1000) &
+                      (ABS(qs) < 300) &
+                      (ABS(j1) > 4000)).astype(int)
+        f5 = np.nan_to_num((MA(data['F51'], self.N) * 2500 * 20), nan=0).astype(int)
+        data['F5'] = f5
 
         # QJ指标(趋势变化)
-        data['QJ1'] = ((data['MA4'] < data['MA4'].shift(1)) &
-                      (data['MA3'] < data['MA3'].shift(1)) &
-                      (data['MA2'] < data['MA2'].shift(1)) &
-                      (data['MA1'] < data['MA1'].shift(1))).astype(int)
-        data['QJ'] = -np.nan_to_num((MA(data['QJ1'], self.N) * 2500 * 40), nan=0).astype(int)
+        data['QJ1'] = (ma4_down & ma3_down & ma2_down & ma1_down).astype(int)
+        qj = -np.nan_to_num((MA(data['QJ1'], self.N) * 2500 * 40), nan=0).astype(int)
+        data['QJ'] = qj
 
         # WD3(威力度)
         data['WD3'] = data['WOD'].round().astype(int)
 
         # HZ系列
-        data['H4Z1'] = ((data['MA4'] > data['MA4'].shift(1)) &
-                       (data['MA3'] > data['MA3'].shift(1)) &
-                       (data['MA1'] > data['MA1'].shift(1))).astype(int)
-        data['HZ'] = np.nan_to_num((MA(data['H4Z1'], self.N) * 2500 * 16), nan=0).astype(int)
-        data['F5Z1'] = ((data['F5'] < data['F5'].shift(1)) &
-                       (data['HZ'] > data['HZ'].shift(1))).astype(int)
-        data['F5Z2'] = ((data['F5'] > data['F5'].shift(1)) &
-                       (data['HZ'] > data['HZ'].shift(1))).astype(int)
-        data['TJF5'] = (data['F5Z1'] > 0) | (data['F5Z2'] > 0)
+        data['H4Z1'] = (ma4_up & ma3_up & ma1_up).astype(int)
+        hz = np.nan_to_num((MA(data['H4Z1'], self.N) * 2500 * 16), nan=0).astype(int)
+        data['HZ'] = hz
+        hz_up = _rising(hz)
+        f5z1 = _falling(f5) & hz_up
+        f5z2 = _rising(f5) & hz_up
+        data['F5Z1'] = f5z1.astype(int)
+        data['F5Z2'] = f5z2.astype(int)
+        data['TJF5'] = f5z1 | f5z2
         data['ZF5'] = np.nan_to_num((MA(data['TJF5'], self.N) * 1780 * 8), nan=0).astype(int) * 40
         data['HZ1'] = np.nan_to_num((MA(data['H4Z1'], self.N) * 2500 * 16), nan=0).astype(int)
 
@@ -175,10 +196,11 @@ class SignalCalculator:
             MAX(data['high'], data['LC'])
         )
         data['ACD'] = SUM(IF(data['close'] == data['LC'], 0, data['DIF2']), 0)
-        data['S5W1'] = ((ABS(data['QJ']) < 650000) &
-                       (ABS(data['QJ']) > 40000) &
-                       (ABS(data['QJ']) < ABS(data['QJ'].shift(1))) &
-                       (data['ACD'] > data['ACD'].shift(1))).astype(int)
+        abs_qj = ABS(qj)
+        data['S5W1'] = ((abs_qj < 650000) &
+                       (abs_qj > 40000) &
+                       _falling(abs_qj) &
+                       _rising(data['ACD'].to_numpy())).astype(int)
         data['S5W'] = np.nan_to_num((MA(data['S5W1'], self.N) * 2500 * 190), nan=0).astype(int)
 
         # EXPEMA和CDC
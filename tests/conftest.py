@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""pytest配置：将项目根目录加入路径"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
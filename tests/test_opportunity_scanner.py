@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""机会扫描器的信号判断测试（使用假交易所，不访问网络）"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tools.opportunity_scanner as scanner_mod
+from tools.exchange_factory import ExchangeFactory
+from tools.crypto_config import DEFAULT_STRATEGY_PARAMS
+from tools.opportunity_scanner import Opportunity, OpportunityScanner
+
+
+def _klines(close):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=len(close), freq='h'),
+        'close': close,
+    })
+
+
+class FakeExchange:
+    """返回固定K线的交易所"""
+
+    SERIES = {
+        'UPUSDT': 100.0 * 1.005 ** np.arange(200),    # 持续上涨
+        'DOWNUSDT': 100.0 * 0.995 ** np.arange(200),  # 持续下跌
+    }
+
+    def get_all_symbols(self):
+        return list(self.SERIES)
+
+    def get_24h_tickers(self):
+        return {}
+
+    def get_klines(self, symbol, interval, limit=500):
+        return _klines(self.SERIES[symbol])
+
+    async def get_klines_many(self, symbols, interval, limit=500, session=None,
+                              limiter=None, max_concurrency=20):
+        return {s: self.get_klines(s, interval, limit) for s in symbols}
+
+    def get_current_price(self, symbol):
+        return float(self.SERIES[symbol][-1])
+
+    async def get_current_price_async(self, session, symbol):
+        return self.get_current_price(symbol)
+
+
+@pytest.fixture
+def scanner(monkeypatch):
+    monkeypatch.setattr(ExchangeFactory, 'create',
+                        staticmethod(lambda exchange, market_type: FakeExchange()))
+    monkeypatch.setattr(scanner_mod, 'load_strategy_params', lambda: DEFAULT_STRATEGY_PARAMS)
+    monkeypatch.setattr(scanner_mod, '_load_async_http', lambda: (None, None))
+    return OpportunityScanner(interval='1h', min_volume_usdt=0)
+
+
+def test_bullish_series_is_reported(scanner):
+    opportunities = scanner.scan_once()
+
+    assert [o.symbol for o in opportunities] == ['UPUSDT']
+    opp = opportunities[0]
+    assert isinstance(opp, Opportunity)
+    assert opp.ha > DEFAULT_STRATEGY_PARAMS['trading_conditions']['buy']['HA_threshold']
+    assert opp.price == pytest.approx(FakeExchange.SERIES['UPUSDT'][-1])
+
+
+def test_bearish_series_is_not_reported(scanner):
+    df = _klines(FakeExchange.SERIES['DOWNUSDT'])
+    signals = scanner._calculate_signals('DOWNUSDT', df)
+
+    assert abs(signals['QJ']) > DEFAULT_STRATEGY_PARAMS['trading_conditions']['sell']['QJ_threshold']
+    assert scanner._evaluate('DOWNUSDT', df, signals, 1.0) is None
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+实时信号内核与pandas实现的一致性测试
+价格按最小变动单位取整，相邻MA经常相等，可检验大小比较是否与pandas逐位一致
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.indicators import MA, EMA
+from tools._signal_kernels import _rolling_mean, batch_signals, compute_signals
+
+SIGNAL_PARAMS = dict(M1=5, M2=10, M3=20, M4=60, SHORT=12, LONG=26, MID=9, N=12)
+
+
+def _tick_prices(rng, n=200):
+    """按0.1取整的随机游走收盘价"""
+    return np.round(100 + np.cumsum(rng.choice([-0.1, 0.0, 0.1], n)), 1)
+
+
+def _pandas_signals(close, sp):
+    """pandas版HA/QS/QJ计算（内核替换前的实时监控实现）"""
+    data = pd.DataFrame({'close': close})
+    data['MA1'] = MA(data['close'], sp['M1'])
+    data['MA2'] = MA(data['close'], sp['M2'])
+    data['MA3'] = MA(data['close'], sp['M3'])
+    data['MA4'] = MA(data['close'], sp['M4'])
+
+    data['H4A1'] = ((data['MA1'] > data['MA1'].shift(1)) &
+                    (data['MA3'] > data['MA3'].shift(1))).astype(int)
+    ha = np.nan_to_num(MA(data['H4A1'], sp['N']) * 2500 * 16).astype(int)
+
+    data['DIF'] = EMA(data['close'], sp['SHORT']) - EMA(data['close'], sp['LONG'])
+    data['DEA'] = MA(data['DIF'], sp['MID'])
+    data['QS1'] = ((data['DIF'] > data['DEA']) &
+                   (data['MA1'] > data['MA1'].shift(1))).astype(int)
+    qs = -np.nan_to_num(MA(data['QS1'], sp['N']) * 1500).astype(int)
+
+    data['QJ1'] = ((data['MA4'] < data['MA4'].shift(1)) &
+                   (data['MA3'] < data['MA3'].shift(1)) &
+                   (data['MA2'] < data['MA2'].shift(1)) &
+                   (data['MA1'] < data['MA1'].shift(1))).astype(int)
+    qj = -np.nan_to_num(MA(data['QJ1'], sp['N']) * 2500 * 40).astype(int)
+
+    return ha, qs, qj
+
+
+@pytest.mark.parametrize('window', [5, 9, 12, 20, 60])
+def test_rolling_mean_matches_pandas_bitwise(window):
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        close = _tick_prices(rng)
+        expected = pd.Series(close).rolling(window).mean().to_numpy()
+        np.testing.assert_array_equal(_rolling_mean(close, window), expected)
+
+
+def test_rolling_mean_matches_pandas_on_signed_values():
+    rng = np.random.default_rng(1)
+    x = np.round(rng.normal(0.0, 0.05, 500), 3)
+    expected = pd.Series(x).rolling(9).mean().to_numpy()
+    np.testing.assert_array_equal(_rolling_mean(x, 9), expected)
+
+
+def test_compute_signals_matches_pandas_on_tick_prices():
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        close = _tick_prices(rng)
+        expected = _pandas_signals(close, SIGNAL_PARAMS)
+        actual = compute_signals(close, *SIGNAL_PARAMS.values())
+        for exp, act in zip(expected, actual):
+            np.testing.assert_array_equal(act, exp)
+
+
+def test_batch_signals_matches_per_symbol_latest_value():
+    rng = np.random.default_rng(3)
+    series = [_tick_prices(rng, n) for n in (120, 200, 150)]
+    closes = np.concatenate(series)
+    offsets = np.zeros(len(series) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in series], out=offsets[1:])
+
+    ha, qs, qj = batch_signals(closes, offsets, *SIGNAL_PARAMS.values())
+
+    for i, close in enumerate(series):
+        e_ha, e_qs, e_qj = _pandas_signals(close, SIGNAL_PARAMS)
+        assert (ha[i], qs[i], qj[i]) == (e_ha[-1], e_qs[-1], e_qj[-1])
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+Numba JIT 兼容层
+安装了numba时使用真正的njit/prange，否则退化为普通Python函数
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """无numba时的空装饰器，支持 @njit 与 @njit(...) 两种写法"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+模拟交易止盈止损函数的AOT预编译脚本
+生成 tools/pt_aot.*.so，启动时无需JIT编译（需要安装numba）
+
+用法（在项目根目录执行）:
+    python -m tools._pt_aot
+"""
+
+from pathlib import Path
+
+from numba.pycc import CC
+
+from tools._pt_loops import check_stops as _check_stops
+
+cc = CC('pt_aot')
+cc.output_dir = str(Path(__file__).parent)
+
+
+@cc.export('check_stops', 'Tuple((b1, b1, f8, f8))(f8, f8, f8, f8, f8, f8, f8, b1, b1)')
+def check_stops(price, entry, high, tp_price, sl_price, trail_price, trail_rate, en_tp, en_sl):
+    """与 tools._pt_loops.check_stops 相同，签名固定为 float64/bool"""
+    return _check_stops(price, entry, high, tp_price, sl_price, trail_price, trail_rate, en_tp, en_sl)
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+模拟交易热路径的数值函数
+安装numba时JIT编译，否则以纯Python执行（结果一致）
+"""
+
+from tools._njit import njit
+
+
+@njit(cache=True)
+def check_stops(price, entry, high, tp_price, sl_price, trail_price, trail_rate, en_tp, en_sl):
+    """
+    检查止盈止损
+
+    Args:
+        price: 当前价格
+        entry: 开仓价
+        high: 持仓期间最高价
+        tp_price, sl_price, trail_price: 止盈价、固定止损价、移动止损价
+        trail_rate: 移动止损回撤比率
+        en_tp, en_sl: 是否启用止盈、止损
+
+    Returns:
+        (止盈触发, 止损触发, 新最高价, 新移动止损价)
+    """
+    if price > high:
+        high = price
+        trail_price = price * (1 - trail_rate)
+
+    tp_hit = en_tp and price >= tp_price
+    sl_hit = en_sl and (price <= sl_price or (high > entry and price <= trail_price))
+
+    return tp_hit, sl_hit, high, trail_price
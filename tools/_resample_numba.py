@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+K线重采样的融合聚合内核
+一次遍历每个周期内的数据同时得到 open/high/low/close 与各求和列，按周期并行；
+需要安装numba（未安装时虽可运行但为纯Python循环，调用方应改用numpy实现）
+"""
+
+import numpy as np
+
+from tools._njit import njit, prange
+
+
+@njit(cache=True)
+def _bucket_starts(ts, bin_ns, origin_ns):
+    """升序时间戳中每个周期第一条数据的下标"""
+    n = ts.shape[0]
+    starts = np.empty(n, np.int64)
+    k = 0
+    prev = np.int64(-1)
+    for i in range(n):
+        b = (ts[i] - origin_ns) // bin_ns
+        if i == 0 or b != prev:
+            starts[k] = i
+            k += 1
+            prev = b
+    return starts[:k]
+
+
+@njit(parallel=True, cache=True)
+def fuse_ohlcv(ts, o, h, l, c, sums, bin_ns, origin_ns):
+    """
+    按固定周期聚合K线
+
+    Args:
+        ts: 升序的 int64 纳秒时间戳
+        o, h, l, c: 开高低收 (float64)
+        sums: 需要求和的列，形状 (n, k) 的 float64 数组
+        bin_ns: 周期长度（纳秒）
+        origin_ns: 分桶起点（纳秒）
+
+    Returns:
+        (周期起始时间, open, high, low, close, 求和结果(m, k))，只包含有数据的周期
+    """
+    starts = _bucket_starts(ts, bin_ns, origin_ns)
+    n = ts.shape[0]
+    m = starts.shape[0]
+    k = sums.shape[1]
+
+    out_ts = np.empty(m, np.int64)
+    out_o = np.empty(m)
+    out_h = np.empty(m)
+    out_l = np.empty(m)
+    out_c = np.empty(m)
+    out_sums = np.zeros((m, k))
+
+    for j in prange(m):
+        s = starts[j]
+        e = starts[j + 1] if j + 1 < m else n
+
+        out_ts[j] = origin_ns + (ts[s] - origin_ns) // bin_ns * bin_ns
+        out_o[j] = o[s]
+        out_c[j] = c[e - 1]
+
+        hi = h[s]
+        lo = l[s]
+        for i in range(s + 1, e):
+            if h[i] > hi:
+                hi = h[i]
+            if l[i] < lo:
+                lo = l[i]
+        out_h[j] = hi
+        out_l[j] = lo
+
+        for q in range(k):
+            acc = 0.0
+            for i in range(s, e):
+                acc += sums[i, q]
+            out_sums[j, q] = acc
+
+    return out_ts, out_o, out_h, out_l, out_c, out_sums
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+实时信号内核的AOT预编译脚本
+生成 tools/signal_aot.*.so，启动时无需JIT编译（需要安装numba）
+
+用法（在项目根目录执行）:
+    python -m tools._signal_aot
+"""
+
+from pathlib import Path
+
+from numba.pycc import CC
+
+from tools._signal_kernels import compute_signals as _compute_signals
+
+cc = CC('signal_aot')
+cc.output_dir = str(Path(__file__).parent)
+
+
+@cc.export('compute_signals', 'UniTuple(i8[:], 3)(f8[:], i8, i8, i8, i8, i8, i8, i8, i8)')
+def compute_signals(close, M1, M2, M3, M4, SHORT, LONG, MID, N):
+    """与 tools._signal_kernels.compute_signals 相同，签名固定为 float64 数组"""
+    return _compute_signals(close, M1, M2, M3, M4, SHORT, LONG, MID, N)
+
+
+if __name__ == '__main__':
+    cc.compile()
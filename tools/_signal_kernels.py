@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+实时信号计算内核
+将 MA/EMA 与 HA/QS/QJ 信号计算融合为基于 float64 数组的单次遍历，
+安装numba时JIT编译，否则以纯Python执行（结果一致）
+"""
+
+import numpy as np
+
+from tools._njit import njit, prange
+
+
+@njit(cache=True)
+def _rolling_mean(x, window):
+    """
+    滚动均值，前 window-1 个值为NaN（与 pandas rolling(window).mean() 逐位一致）
+
+    按 pandas roll_mean 的方式增量加减并做Kahan补偿（加、减各自补偿）；
+    窗口内末尾连续相同值覆盖整个窗口时直接取该值，保证相邻MA的相等/大小比较与pandas相同
+    （输入不含NaN）
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    s = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    neg_ct = 0
+    same_ct = 0
+    prev = x[0] if n > 0 else 0.0
+    for i in range(n):
+        # 先移出窗口外的旧值，再加入新值（与pandas顺序相同）
+        if i >= window:
+            v = x[i - window]
+            y = -v - comp_remove
+            t = s + y
+            comp_remove = t - s - y
+            s = t
+            if v < 0.0:
+                neg_ct -= 1
+
+        v = x[i]
+        y = v - comp_add
+        t = s + y
+        comp_add = t - s - y
+        s = t
+        if v < 0.0:
+            neg_ct += 1
+        if v == prev:
+            same_ct += 1
+        else:
+            same_ct = 1
+        prev = v
+
+        if i < window - 1:
+            continue
+
+        r = s / window
+        if same_ct >= window:
+            r = prev
+        elif neg_ct == 0 and r < 0.0:
+            r = 0.0
+        elif neg_ct == window and r > 0.0:
+            r = 0.0
+        out[i] = r
+    return out
+
+
+@njit(cache=True)
+def _ema(x, span):
+    """指数移动平均（与 pandas ewm(span=span, adjust=False).mean() 一致）"""
+    n = x.shape[0]
+    out = np.empty(n)
+    if n == 0:
+        return out
+    alpha = 2.0 / (span + 1.0)
+    old_wt = 1.0 - alpha
+    out[0] = x[0]
+    for i in range(1, n):
+        out[i] = (old_wt * out[i - 1] + alpha * x[i]) / (old_wt + alpha)
+    return out
+
+
+@njit(cache=True)
+def _scaled_int(ma, scale):
+    """MA * scale 截断取整，NaN记为0"""
+    n = ma.shape[0]
+    out = np.zeros(n, np.int64)
+    for i in range(n):
+        if not np.isnan(ma[i]):
+            out[i] = np.int64(ma[i] * scale)
+    return out
+
+
+@njit(cache=True)
+def compute_signals(close, M1, M2, M3, M4, SHORT, LONG, MID, N):
+    """
+    计算HA/QS/QJ信号序列
+
+    Args:
+        close: 收盘价数组 (float64)
+        M1~M4: MA周期
+        SHORT, LONG, MID: MACD参数
+        N: 信号平滑周期
+
+    Returns:
+        (HA, QS, QJ) 三个 int64 数组
+    """
+    n = close.shape[0]
+
+    ma1 = _rolling_mean(close, M1)
+    ma2 = _rolling_mean(close, M2)
+    ma3 = _rolling_mean(close, M3)
+    ma4 = _rolling_mean(close, M4)
+
+    dif = _ema(close, SHORT) - _ema(close, LONG)
+    dea = _rolling_mean(dif, MID)
+
+    # 与前一根比较（NaN比较结果为False，首根记为0）
+    h4a1 = np.zeros(n)
+    qs1 = np.zeros(n)
+    qj1 = np.zeros(n)
+    for i in range(1, n):
+        up1 = ma1[i] > ma1[i - 1]
+        if up1 and ma3[i] > ma3[i - 1]:
+            h4a1[i] = 1.0
+        if up1 and dif[i] > dea[i]:
+            qs1[i] = 1.0
+        if (ma4[i] < ma4[i - 1] and ma3[i] < ma3[i - 1] and
+                ma2[i] < ma2[i - 1] and ma1[i] < ma1[i - 1]):
+            qj1[i] = 1.0
+
+    ha = _scaled_int(_rolling_mean(h4a1, N), 2500.0 * 16)
+    qs = -_scaled_int(_rolling_mean(qs1, N), 1500.0)
+    qj = -_scaled_int(_rolling_mean(qj1, N), 2500.0 * 40)
+
+    return ha, qs, qj
+
+
+@njit(parallel=True, cache=True)
+def batch_signals(closes, offsets, M1, M2, M3, M4, SHORT, LONG, MID, N):
+    """
+    批量计算多个交易对最新一根K线的HA/QS/QJ信号（按交易对并行）
+
+    Args:
+        closes: 所有交易对收盘价首尾拼接的一维数组 (float64)
+        offsets: 长度为交易对数+1，第s个交易对的数据为 closes[offsets[s]:offsets[s+1]]
+        其余参数同 compute_signals
+
+    Returns:
+        (HA, QS, QJ) 三个长度为交易对数的 int64 数组
+    """
+    S = offsets.shape[0] - 1
+    ha = np.zeros(S, np.int64)
+    qs = np.zeros(S, np.int64)
+    qj = np.zeros(S, np.int64)
+    for s in prange(S):
+        h, q, j = compute_signals(closes[offsets[s]:offsets[s + 1]],
+                                  M1, M2, M3, M4, SHORT, LONG, MID, N)
+        ha[s] = h[-1]
+        qs[s] = q[-1]
+        qj[s] = j[-1]
+    return ha, qs, qj
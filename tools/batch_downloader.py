@@ -21,6 +21,8 @@ from typing import List, Dict, Optional
 from loguru import logger
 import json
 
+from tools.data_downloader import write_csv
+
 
 def download_klines_binance(
     base_url: str,
@@ -316,7 +318,7 @@ class BatchDownloader:
                     if save_format == 'parquet':
                         df.to_parquet(filepath, index=False)
                     else:
-                        df.to_csv(filepath, index=False)
+                        write_csv(df, filepath)
 
                     results[symbol] = str(filepath)
                     logger.info(f"✓ {symbol} 完成 ({len(df)}条数据, {filepath.stat().st_size/1024:.1f}KB)")
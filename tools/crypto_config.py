@@ -8,11 +8,31 @@ import json
 import base64
 import hashlib
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
+# orjson直接输出紧凑的UTF-8字节且更快，未安装时回退到标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _dumps(obj) -> bytes:
+    """序列化为紧凑的UTF-8 JSON字节"""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data: bytes):
+    """解析UTF-8 JSON字节"""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
 
 class StrategyConfigCrypto:
     """策略配置加密器"""
@@ -54,13 +74,11 @@ class StrategyConfigCrypto:
 
     def encrypt_config(self, config: Dict[str, Any]) -> bytes:
         """加密配置"""
-        json_data = json.dumps(config, ensure_ascii=False)
-        return self.cipher.encrypt(json_data.encode('utf-8'))
+        return self.cipher.encrypt(_dumps(config))
 
     def decrypt_config(self, encrypted_data: bytes) -> Dict[str, Any]:
         """解密配置"""
-        decrypted = self.cipher.decrypt(encrypted_data)
-        return json.loads(decrypted.decode('utf-8'))
+        return _loads(self.cipher.decrypt(encrypted_data))
 
     def save_encrypted_config(self, config: Dict[str, Any], filepath: str):
         """保存加密配置到文件"""
@@ -139,9 +157,15 @@ def get_config_path() -> Path:
     return Path(__file__).parent.parent / 'config' / 'strategy_params.enc'
 
 
-def init_encrypted_config(password: str = None):
-    """初始化加密配置文件"""
-    crypto = StrategyConfigCrypto(password)
+def init_encrypted_config(password: str = None, crypto: Optional[StrategyConfigCrypto] = None):
+    """
+    初始化加密配置文件
+
+    Args:
+        password: 加密密码
+        crypto: 已创建的加密器（复用其派生好的密钥，此时忽略password）
+    """
+    crypto = crypto or StrategyConfigCrypto(password)
     config_path = get_config_path()
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -150,21 +174,36 @@ def init_encrypted_config(password: str = None):
     return config_path
 
 
-def load_strategy_params(password: str = None) -> Dict[str, Any]:
-    """加载策略参数"""
-    crypto = StrategyConfigCrypto(password)
+def load_strategy_params(password: str = None,
+                         crypto: Optional[StrategyConfigCrypto] = None) -> Dict[str, Any]:
+    """
+    加载策略参数
+
+    Args:
+        password: 加密密码
+        crypto: 已创建的加密器（复用其派生好的密钥，此时忽略password）
+    """
+    crypto = crypto or StrategyConfigCrypto(password)
     config_path = get_config_path()
 
     if not config_path.exists():
         # 首次使用，创建默认配置
-        init_encrypted_config(password)
+        init_encrypted_config(password, crypto)
 
     return crypto.load_encrypted_config(str(config_path))
 
 
-def save_strategy_params(params: Dict[str, Any], password: str = None):
-    """保存策略参数"""
-    crypto = StrategyConfigCrypto(password)
+def save_strategy_params(params: Dict[str, Any], password: str = None,
+                         crypto: Optional[StrategyConfigCrypto] = None):
+    """
+    保存策略参数
+
+    Args:
+        params: 策略参数
+        password: 加密密码
+        crypto: 已创建的加密器（复用其派生好的密钥，此时忽略password）
+    """
+    crypto = crypto or StrategyConfigCrypto(password)
     config_path = get_config_path()
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -4,11 +4,17 @@
 无需API密钥,使用公开接口
 """
 
+import asyncio
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import ClassVar, Dict, List, Optional
 import time
 
 # 尝试导入loguru，如果失败则使用print
@@ -24,10 +30,149 @@ except:
         def success(self, msg): print(f"[SUCCESS] {msg}")
     logger = SimpleLogger()
 
+# aiohttp用于并发下载币安K线分段，未安装时各分段改在线程中用requests会话请求
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+# OKX K线列结构（API返回均为字符串，按列转换为强类型）
+OKX_KLINE_SCHEMA = pa.schema([
+    ('timestamp', pa.timestamp('ms')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.float64()),
+    ('volume_currency', pa.float64()),
+    ('volume_currency_quote', pa.float64()),
+    ('confirm', pa.string()),
+])
+
+
+def _okx_record_batch(rows: list) -> pa.RecordBatch:
+    """将一批OKX原始K线转换为RecordBatch"""
+    columns = list(zip(*rows))
+    arrays = [pa.array(columns[0]).cast(pa.int64()).cast(pa.timestamp('ms'))]
+    arrays += [pa.array(col).cast(field.type)
+               for col, field in zip(columns[1:], list(OKX_KLINE_SCHEMA)[1:])]
+    return pa.RecordBatch.from_arrays(arrays, schema=OKX_KLINE_SCHEMA)
+
+
+# 币安K线列名
+BINANCE_KLINE_COLUMNS = [
+    'timestamp', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_volume', 'trades', 'taker_buy_base',
+    'taker_buy_quote', 'ignore'
+]
+
+# 币安固定长度周期的毫秒数（1M按自然月，长度不固定，不在此表中）
+_BINANCE_INTERVAL_MS: Dict[str, int] = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000, '3d': 259_200_000,
+    '1w': 604_800_000,
+}
+
+
+# OKX交易对的计价币种（按匹配优先级排列）
+_OKX_QUOTES = ('USDT', 'USDC', 'BTC', 'ETH')
+
+
+def to_okx_symbol(symbol: str) -> str:
+    """
+    转换为OKX横杠格式的交易对（BTCUSDT -> BTC-USDT），已含横杠或无法识别计价币种时原样返回
+
+    Args:
+        symbol: 交易对
+
+    Returns:
+        OKX格式交易对
+    """
+    if '-' in symbol:
+        return symbol
+    for quote in _OKX_QUOTES:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return f"{symbol[:-len(quote)]}-{quote}"
+    return symbol
+
+
+def _binance_frame(rows: list) -> pd.DataFrame:
+    """将币安原始K线转换为DataFrame"""
+    df = pd.DataFrame(rows, columns=BINANCE_KLINE_COLUMNS)
+
+    # 数据类型转换
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        df[col] = df[col].astype(float)
+
+    return df
+
+
+def write_csv(df: pd.DataFrame, filepath, chunk_rows: int = 65536):
+    """
+    用Arrow的C++ CSV写入器保存DataFrame（比 DataFrame.to_csv 快数倍）
+
+    按 chunk_rows 行分块转换并写入，额外内存只占一个分块；
+    文件使用1MiB缓冲，分块之间不刷新
+
+    Args:
+        df: 要保存的数据（不写索引）
+        filepath: 输出路径
+        chunk_rows: 每块行数
+    """
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with open(filepath, 'wb', buffering=1 << 20) as f:
+        # 只在必要时加引号（与 to_csv 一致）
+        options = pacsv.WriteOptions(quoting_style='needed')
+        with pacsv.CSVWriter(f, schema, write_options=options) as writer:
+            for start in range(0, len(df), chunk_rows):
+                chunk = df.iloc[start:start + chunk_rows]
+                writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_parquet(df: pd.DataFrame, filepath):
+    """
+    以zstd压缩的Parquet保存K线（列式存储，体积和回测读取时间远小于CSV）
+
+    Args:
+        df: 要保存的数据（不写索引）
+        filepath: 输出路径
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, str(filepath), compression='zstd',
+                   use_dictionary=False, write_statistics=True)
+
+
+def parquet_to_csv(filepath, output_path=None) -> str:
+    """
+    将Parquet格式的K线导出为CSV
+
+    Args:
+        filepath: Parquet文件路径
+        output_path: CSV输出路径，默认与输入同名（扩展名改为.csv）
+
+    Returns:
+        CSV文件路径
+    """
+    output_path = Path(output_path) if output_path else Path(filepath).with_suffix('.csv')
+    write_csv(pq.read_table(str(filepath)).to_pandas(), output_path)
+    return str(output_path)
+
 
 class DataDownloader:
     """历史数据下载器"""
 
+    # OKX周期格式 (1h -> 1H, 1d -> 1D)
+    _OKX_INTERVAL_MAP: ClassVar[Dict[str, str]] = {
+        '1m': '1m', '3m': '3m', '5m': '5m', '15m': '15m', '30m': '30m',
+        '1h': '1H', '2h': '2H', '4h': '4H', '6h': '6H', '12h': '12H',
+        '1d': '1D', '1w': '1W', '1M': '1M'
+    }
+
     def __init__(self, exchange: str = 'binance'):
         """
         初始化下载器
@@ -40,6 +185,18 @@ class DataDownloader:
         self.data_dir = Path(f'data/historical/{self.exchange}')
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
+        # 重试策略交给urllib3：指数退避，遇到429时遵循Retry-After
+        retry = Retry(
+            total=3,
+            backoff_factor=2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            respect_retry_after_header=True
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(max_retries=retry))
+        self.session.mount('http://', HTTPAdapter(max_retries=retry))
+
     def _get_base_url(self) -> str:
         """获取交易所API基础URL"""
         urls = {
@@ -98,58 +255,129 @@ class DataDownloader:
                 'limit': limit
             }
 
-            # 添加重试机制
-            max_retries = 3
-            retry_count = 0
-            success = False
+            try:
+                response = self.session.get(url, params=params, timeout=30)  # 增加超时时间到30秒
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"请求失败，已达到最大重试次数: {e}")
+                break
+
+            if not data:
+                break
+
+            all_data.extend(data)
+            current_ts = data[-1][0] + 1  # 下一批从最后一条的下一毫秒开始
+
+            logger.info(f"已下载 {len(all_data)} 条数据...")
+
+            # 避免请求过快
+            time.sleep(0.1)
+
+        # 转换为DataFrame
+        if not all_data:
+            logger.warning("未下载到任何数据")
+            return pd.DataFrame()
+
+        df = _binance_frame(all_data)
+
+        logger.info(f"✓ 成功下载 {len(df)} 条K线数据")
+        return df
+
+    async def download_klines_binance_async(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: str,
+        end_time: Optional[str] = None,
+        limit: int = 1000,
+        max_concurrency: int = 8
+    ) -> pd.DataFrame:
+        """
+        并发下载币安K线数据（结果与 download_klines_binance 相同）
+
+        先按每段 limit 根K线把时间范围切成互不重叠的分段，再并发请求各分段；
+        周期长度不固定（1M）时退回顺序分页下载
+
+        Args:
+            symbol: 交易对,如 'BTCUSDT'
+            interval: K线周期
+            start_time: 开始时间 'YYYY-MM-DD'
+            end_time: 结束时间 'YYYY-MM-DD' (默认为今天)
+            limit: 单次请求限制(最大1000)
+            max_concurrency: 最大在途请求数
+
+        Returns:
+            包含K线数据的DataFrame
+        """
+        interval_ms = _BINANCE_INTERVAL_MS.get(interval)
+        if interval_ms is None:
+            return await asyncio.to_thread(
+                self.download_klines_binance, symbol, interval, start_time, end_time, limit)
 
-            while retry_count < max_retries and not success:
-                try:
-                    response = requests.get(url, params=params, timeout=30)  # 增加超时时间到30秒
-                    response.raise_for_status()
-                    data = response.json()
+        start_ts = int(datetime.strptime(start_time, '%Y-%m-%d').timestamp() * 1000)
+        if end_time:
+            end_ts = int(datetime.strptime(end_time, '%Y-%m-%d').timestamp() * 1000)
+        else:
+            end_ts = int(datetime.now().timestamp() * 1000)
 
-                    if not data:
-                        break
+        span = interval_ms * limit
+        windows = [(ts, min(ts + span - 1, end_ts)) for ts in range(start_ts, end_ts, span)]
 
-                    all_data.extend(data)
-                    current_ts = data[-1][0] + 1  # 下一批从最后一条的下一毫秒开始
+        logger.info(f"开始下载 {symbol} {interval} K线数据（{len(windows)} 段并发）")
+        logger.info(f"时间范围: {start_time} ~ {end_time or '今天'}")
 
-                    logger.info(f"已下载 {len(all_data)} 条数据...")
-                    success = True
+        url = f"{self.base_url}/api/v3/klines"
+        sem = asyncio.Semaphore(max_concurrency)
 
-                    # 避免请求过快
-                    time.sleep(0.1)
+        def fetch_sync(params):
+            # 带重试的requests会话（aiohttp不可用或请求失败时使用）
+            response = self.session.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            return response.json()
 
-                except requests.exceptions.RequestException as e:
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        logger.warning(f"请求失败，正在重试 ({retry_count}/{max_retries}): {e}")
-                        time.sleep(2)  # 等待2秒后重试
-                    else:
-                        logger.error(f"请求失败，已达到最大重试次数: {e}")
-                        break
+        async def fetch(session, window_start, window_end):
+            params = {
+                'symbol': symbol,
+                'interval': interval,
+                'startTime': window_start,
+                'endTime': window_end,
+                'limit': limit
+            }
+            async with sem:
+                if session is not None:
+                    try:
+                        async with session.get(url, params=params) as response:
+                            response.raise_for_status()
+                            return await response.json(content_type=None)
+                    except Exception as e:
+                        logger.warning(f"分段请求失败，改用重试会话: {e}")
+                return await asyncio.to_thread(fetch_sync, params)
+
+        async def gather_all(session):
+            return await asyncio.gather(*(fetch(session, a, b) for a, b in windows),
+                                        return_exceptions=True)
+
+        if aiohttp is not None:
+            timeout = aiohttp.ClientTimeout(total=30)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                pages = await gather_all(session)
+        else:
+            pages = await gather_all(None)
 
-            if not success:
+        # 分段按时间顺序排列，任一分段失败则只保留其之前的连续数据（与顺序下载一致）
+        all_data = []
+        for page in pages:
+            if isinstance(page, BaseException):
+                logger.error(f"请求失败，已达到最大重试次数: {page}")
                 break
+            all_data.extend(page)
 
-        # 转换为DataFrame
         if not all_data:
             logger.warning("未下载到任何数据")
             return pd.DataFrame()
 
-        df = pd.DataFrame(all_data, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-
-        # 数据类型转换
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
-
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
+        df = _binance_frame(all_data)
 
         logger.info(f"✓ 成功下载 {len(df)} 条K线数据")
         return df
@@ -177,12 +405,7 @@ class DataDownloader:
             包含K线数据的DataFrame
         """
         # 转换interval格式 (1h -> 1H, 1d -> 1D)
-        interval_map = {
-            '1m': '1m', '3m': '3m', '5m': '5m', '15m': '15m', '30m': '30m',
-            '1h': '1H', '2h': '2H', '4h': '4H', '6h': '6H', '12h': '12H',
-            '1d': '1D', '1w': '1W', '1M': '1M'
-        }
-        okx_interval = interval_map.get(interval, interval)
+        okx_interval = self._OKX_INTERVAL_MAP.get(interval, interval)
 
         # 转换时间为时间戳(毫秒)
         start_ts = int(datetime.strptime(start_time, '%Y-%m-%d').timestamp() * 1000)
@@ -191,7 +414,9 @@ class DataDownloader:
         else:
             end_ts = int(datetime.now().timestamp() * 1000)
 
-        all_data = []
+        # 每批数据直接转换为Arrow RecordBatch，避免累积Python嵌套列表
+        batches = []
+        total_rows = 0
 
         logger.info(f"开始下载 {symbol} {okx_interval} K线数据")
         logger.info(f"时间范围: {start_time} ({start_ts}) ~ {end_time or '今天'} ({end_ts})")
@@ -231,36 +456,20 @@ class DataDownloader:
                 'after': after_ts
             }
 
-            # 添加重试机制
-            max_retries = 3
-            retry_count = 0
-            success = False
-
-            while retry_count < max_retries and not success:
-                try:
-                    response = requests.get(url, params=params, timeout=30)
-                    response.raise_for_status()
-                    result = response.json()
-
-                    if result['code'] != '0':
-                        logger.error(f"API错误: {result['msg']}")
-                        break
-
-                    data = result['data']
-                    success = True
-
-                except requests.exceptions.RequestException as e:
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        logger.warning(f"请求失败，正在重试 ({retry_count}/{max_retries}): {e}")
-                        time.sleep(2)
-                    else:
-                        logger.error(f"请求失败，已达到最大重试次数: {e}")
-                        break
-
-            if not success:
+            try:
+                response = self.session.get(url, params=params, timeout=30)
+                response.raise_for_status()
+                result = response.json()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"请求失败，已达到最大重试次数: {e}")
+                break
+
+            if result['code'] != '0':
+                logger.error(f"API错误: {result['msg']}")
                 break
 
+            data = result['data']
+
             # 继续处理data
             if not data:
                 logger.info("没有更多数据，停止下载")
@@ -279,8 +488,9 @@ class DataDownloader:
             logger.debug(f"当前批次数据: {len(data)} 条, 过滤后: {len(filtered_data)} 条")
 
             if filtered_data:
-                all_data.extend(filtered_data)
-                logger.info(f"已下载 {len(all_data)} 条数据...")
+                batches.append(_okx_record_batch(filtered_data))
+                total_rows += len(filtered_data)
+                logger.info(f"已下载 {total_rows} 条数据...")
 
             # 停止条件：如果最旧的数据已经早于或等于开始时间，说明已经覆盖了整个时间范围
             if oldest_ts <= start_ts:
@@ -293,21 +503,13 @@ class DataDownloader:
 
             time.sleep(0.2)
 
-        if not all_data:
+        if not batches:
             logger.warning("未下载到任何数据")
             return pd.DataFrame()
 
-        # 转换为DataFrame
-        df = pd.DataFrame(all_data, columns=[
-            'timestamp', 'open', 'high', 'low', 'close',
-            'volume', 'volume_currency', 'volume_currency_quote', 'confirm'
-        ])
-
-        df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
-
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        # 合并所有批次并排序，最后一次性转换为DataFrame
+        table = pa.Table.from_batches(batches, schema=OKX_KLINE_SCHEMA).sort_by('timestamp')
+        df = table.to_pandas(self_destruct=True)
 
         logger.info(f"✓ 成功下载 {len(df)} 条K线数据")
         return df
@@ -352,15 +554,13 @@ class DataDownloader:
         htx = HTXExchange(market_type='spot')
 
         # HTX每次最多返回2000条数据
-        all_data = []
+        # 累积原始K线字典，最后统一构建一次DataFrame；按时间戳去重
+        raw_rows = []
+        seen = set()
         current_ts = start_ts
 
-        # 计算每根K线的时间间隔（秒）
-        interval_seconds = {
-            '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
-            '1h': 3600, '4h': 14400,
-            '1d': 86400, '1w': 604800, '1M': 2592000
-        }.get(interval, 3600)
+        # 每根K线的时间间隔（秒），循环前查一次
+        interval_seconds = HTXExchange.INTERVAL_SECONDS.get(interval, 3600)
 
         while current_ts < end_ts:
             # 计算本次请求的数量
@@ -373,35 +573,41 @@ class DataDownloader:
             logger.info(f"  下载 {pd.Timestamp(current_ts, unit='s')} 开始的 {limit} 条数据...")
 
             # 获取K线数据
-            df = htx.get_klines(symbol_lower, interval, limit=limit)
+            rows = htx.get_klines_raw(symbol_lower, interval, limit=limit)
 
-            if df is None or df.empty:
+            if not rows:
                 logger.warning(f"  未获取到数据")
                 break
 
             # 过滤时间范围
-            df = df[df['timestamp'] >= pd.Timestamp(current_ts, unit='s')]
-            df = df[df['timestamp'] <= pd.Timestamp(end_ts, unit='s')]
-
-            if not df.empty:
-                all_data.append(df)
+            batch_count = 0
+            batch_max_ts = current_ts
+            for row in rows:
+                ts = row['id']
+                if ts < current_ts or ts > end_ts or ts in seen:
+                    continue
+                seen.add(ts)
+                raw_rows.append(row)
+                batch_count += 1
+                if ts > batch_max_ts:
+                    batch_max_ts = ts
+
+            if batch_count:
                 # 更新当前时间戳到最后一条数据的时间
-                current_ts = int(df['timestamp'].max().timestamp()) + interval_seconds
-                logger.info(f"  ✓ 获取 {len(df)} 条数据")
+                current_ts = batch_max_ts + interval_seconds
+                logger.info(f"  ✓ 获取 {batch_count} 条数据")
             else:
                 break
 
             # 避免请求过快
-            import time
             time.sleep(0.2)
 
-        if not all_data:
+        if not raw_rows:
             logger.error("未获取到任何数据")
             return pd.DataFrame()
 
-        # 合并所有数据
-        df = pd.concat(all_data, ignore_index=True)
-        df = df.drop_duplicates(subset=['timestamp']).sort_values('timestamp').reset_index(drop=True)
+        # 一次性转换所有数据
+        df = HTXExchange.klines_to_dataframe(raw_rows)
 
         logger.info(f"✓ 成功下载 {len(df)} 条K线数据")
         return df
@@ -429,11 +635,11 @@ class DataDownloader:
         """
         # 根据交易所下载数据
         if self.exchange == 'binance':
-            df = self.download_klines_binance(symbol, interval, start_time, end_time)
+            # 按时间分段并发下载
+            df = asyncio.run(self.download_klines_binance_async(symbol, interval, start_time, end_time))
         elif self.exchange == 'okx':
             # OKX使用横杠分隔
-            symbol_okx = symbol.replace('USDT', '-USDT').replace('BTC', 'BTC-')
-            df = self.download_klines_okx(symbol_okx, interval, start_time, end_time)
+            df = self.download_klines_okx(to_okx_symbol(symbol), interval, start_time, end_time)
         elif self.exchange == 'htx':
             df = self.download_klines_htx(symbol, interval, start_time, end_time)
         else:
@@ -450,9 +656,9 @@ class DataDownloader:
 
         # 保存文件
         if format == 'parquet':
-            df.to_parquet(filepath, index=False)
+            write_parquet(df, filepath)
         elif format == 'csv':
-            df.to_csv(filepath, index=False)
+            write_csv(df, filepath)
         else:
             raise ValueError(f"不支持的格式: {format}")
 
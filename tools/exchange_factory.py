@@ -4,12 +4,67 @@
 支持: Binance, OKX, Huobi/HTX
 """
 
+import asyncio
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import ClassVar, NamedTuple, Optional, List, Dict, Tuple
 from loguru import logger
 
+# orjson解析数值密集的K线JSON更快，未安装时回退到标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+# ijson可流式解析大型列表响应，未安装时整体解析
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# aiohttp用于批量并发获取K线，未安装时改用线程池执行同步请求
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def _parse_json(response: requests.Response):
+    """解析响应JSON（优先使用orjson）"""
+    if _orjson is not None:
+        return _orjson.loads(response.content)
+    return response.json()
+
+
+def _iter_json_items(response: requests.Response, prefix: str):
+    """
+    逐个迭代响应中的数组元素
+
+    Args:
+        response: 以stream=True发起的响应
+        prefix: ijson路径，如 'data.item' 表示遍历 data 数组
+    """
+    if ijson is not None:
+        # 让urllib3在读取时自动解压gzip
+        response.raw.decode_content = True
+        return ijson.items(response.raw, prefix)
+
+    data = _parse_json(response)
+    for key in prefix.split('.')[:-1]:
+        data = data[key]
+    return iter(data)
+
+
+class Ticker24h(NamedTuple):
+    """24小时行情快照"""
+    last: float           # 最新价
+    volume_quote: float   # 24h成交额（计价币）
+    pct_change: float     # 24h涨跌幅（%）
+
 
 class ExchangeFactory:
     """交易所工厂类"""
@@ -17,13 +72,15 @@ class ExchangeFactory:
     SUPPORTED_EXCHANGES = ['binance', 'okx', 'htx']
     
     @staticmethod
-    def create(exchange: str, market_type: str = 'spot'):
+    def create(exchange: str, market_type: str = 'spot',
+               session: Optional[requests.Session] = None):
         """
         创建交易所实例
         
         Args:
             exchange: 交易所名称 (binance/okx/htx)
             market_type: 市场类型 (spot/futures)
+            session: 共享的HTTP会话，不传则由实例自建
             
         Returns:
             交易所实例
@@ -34,39 +91,171 @@ class ExchangeFactory:
             raise ValueError(f"不支持的交易所: {exchange}. 支持的交易所: {ExchangeFactory.SUPPORTED_EXCHANGES}")
         
         if exchange == 'binance':
-            return BinanceExchange(market_type)
+            return BinanceExchange(market_type, session)
         elif exchange == 'okx':
-            return OKXExchange(market_type)
+            return OKXExchange(market_type, session)
         elif exchange == 'htx':
-            return HTXExchange(market_type)
+            return HTXExchange(market_type, session)
 
 
 class BaseExchange:
     """交易所基类"""
     
-    def __init__(self, market_type: str = 'spot'):
+    # 连接池大小（并发请求同一主机时复用keep-alive连接）
+    POOL_SIZE: ClassVar[int] = 32
+
+    def __init__(self, market_type: str = 'spot', session: Optional[requests.Session] = None):
         self.market_type = market_type
         self.base_url = ''
         self.name = ''
+
+        # 共享会话：复用连接，并启用gzip压缩减少传输量
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+        self.session.headers.update({'Accept-Encoding': 'gzip', 'User-Agent': 'cryptor/1.0'})
     
     def get_current_price(self, symbol: str) -> Optional[float]:
         """获取当前价格"""
-        raise NotImplementedError
-    
+        try:
+            url, params = self._price_request(symbol)
+            response = self.session.get(url, params=params, timeout=10)
+
+            if response.status_code == 200:
+                return self._parse_price(_parse_json(response))
+        except Exception as e:
+            logger.error(f"获取{self.name}价格失败: {e}")
+
+        return None
+
     def get_klines(self, symbol: str, interval: str, limit: int = 500) -> Optional[pd.DataFrame]:
         """获取K线数据"""
-        raise NotImplementedError
-    
+        try:
+            url, params = self._klines_request(symbol, interval, limit)
+            response = self.session.get(url, params=params, timeout=30)  # 增加超时时间
+
+            if response.status_code == 200:
+                return self._parse_klines(_parse_json(response))
+        except Exception as e:
+            logger.error(f"获取{self.name} K线失败: {e}")
+
+        return None
+
+    async def get_current_price_async(self, session, symbol: str) -> Optional[float]:
+        """
+        异步获取当前价格
+
+        Args:
+            session: aiohttp.ClientSession（超时在会话上配置）
+            symbol: 交易对
+        """
+        try:
+            url, params = self._price_request(symbol)
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    return self._parse_price(await response.json(content_type=None))
+        except Exception as e:
+            logger.error(f"获取{self.name}价格失败: {e}")
+
+        return None
+
+    async def get_klines_async(self, session, symbol: str, interval: str,
+                               limit: int = 500) -> Optional[pd.DataFrame]:
+        """
+        异步获取K线数据
+
+        Args:
+            session: aiohttp.ClientSession（超时在会话上配置）
+            symbol: 交易对
+            interval: K线周期
+            limit: 获取数量
+        """
+        try:
+            url, params = self._klines_request(symbol, interval, limit)
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    return self._parse_klines(await response.json(content_type=None))
+        except Exception as e:
+            logger.error(f"获取{self.name} K线失败: {e}")
+
+        return None
+
+    async def get_klines_many(self, symbols: List[str], interval: str, limit: int = 500,
+                              session=None, limiter=None,
+                              max_concurrency: int = 20) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        并发获取多个交易对的K线数据
+
+        Args:
+            symbols: 交易对列表
+            interval: K线周期
+            limit: 每个交易对获取数量
+            session: aiohttp.ClientSession，不传则临时创建
+            limiter: 异步限速器（如 aiolimiter.AsyncLimiter），不传则不限速
+            max_concurrency: 最大在途请求数
+
+        Returns:
+            {交易对: DataFrame}，获取失败的值为None
+        """
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(sess, symbol):
+            async with sem:
+                if limiter is not None:
+                    async with limiter:
+                        return await fetch_one(sess, symbol)
+                return await fetch_one(sess, symbol)
+
+        async def fetch_one(sess, symbol):
+            if sess is None:
+                return await asyncio.to_thread(self.get_klines, symbol, interval, limit)
+            return await self.get_klines_async(sess, symbol, interval, limit)
+
+        async def gather_all(sess):
+            return await asyncio.gather(*(fetch(sess, s) for s in symbols))
+
+        if session is None and aiohttp is not None:
+            timeout = aiohttp.ClientTimeout(total=30)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                results = await gather_all(session)
+        else:
+            results = await gather_all(session)
+
+        return dict(zip(symbols, results))
+
     def get_all_symbols(self) -> List[str]:
         """获取所有交易对"""
         raise NotImplementedError
 
+    def get_24h_tickers(self) -> Dict[str, Ticker24h]:
+        """一次请求获取全部交易对的24h行情，键为Binance格式交易对"""
+        raise NotImplementedError
+
+    def _price_request(self, symbol: str) -> Tuple[str, Dict]:
+        """构造价格请求的URL和参数"""
+        raise NotImplementedError
+
+    def _parse_price(self, data) -> Optional[float]:
+        """从价格响应中解析最新价"""
+        raise NotImplementedError
+
+    def _klines_request(self, symbol: str, interval: str, limit: int) -> Tuple[str, Dict]:
+        """构造K线请求的URL和参数"""
+        raise NotImplementedError
+
+    def _parse_klines(self, data) -> Optional[pd.DataFrame]:
+        """将K线响应转换为标准DataFrame"""
+        raise NotImplementedError
+
 
 class BinanceExchange(BaseExchange):
     """币安交易所"""
     
-    def __init__(self, market_type: str = 'spot'):
-        super().__init__(market_type)
+    def __init__(self, market_type: str = 'spot', session: Optional[requests.Session] = None):
+        super().__init__(market_type, session)
         self.name = 'Binance'
         
         if market_type == 'futures':
@@ -74,74 +263,99 @@ class BinanceExchange(BaseExchange):
         else:
             self.base_url = 'https://api.binance.com'
     
-    def get_current_price(self, symbol: str) -> Optional[float]:
-        """获取当前价格"""
-        try:
-            url = f"{self.base_url}/api/v3/ticker/price"
-            response = requests.get(url, params={'symbol': symbol}, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return float(data['price'])
-        except Exception as e:
-            logger.error(f"获取Binance价格失败: {e}")
-        
-        return None
-    
-    def get_klines(self, symbol: str, interval: str, limit: int = 500) -> Optional[pd.DataFrame]:
-        """获取K线数据"""
-        try:
+    def _price_request(self, symbol: str) -> Tuple[str, Dict]:
+        return f"{self.base_url}/api/v3/ticker/price", {'symbol': symbol}
+
+    def _parse_price(self, data) -> Optional[float]:
+        return float(data['price'])
+
+    def _klines_request(self, symbol: str, interval: str, limit: int) -> Tuple[str, Dict]:
+        # 现货使用uiKlines（数据格式与klines一致，专为展示优化）
+        if self.market_type == 'futures':
             url = f"{self.base_url}/api/v3/klines"
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'limit': limit
-            }
-            
-            response = requests.get(url, params=params, timeout=30)  # 增加超时时间
+        else:
+            url = f"{self.base_url}/api/v3/uiKlines"
+        params = {
+            'symbol': symbol,
+            'interval': interval,
+            'limit': limit
+        }
+        return url, params
 
-            if response.status_code == 200:
-                data = response.json()
-                
-                df = pd.DataFrame(data, columns=[
-                    'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                    'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-                    'taker_buy_quote', 'ignore'
-                ])
-                
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                for col in ['open', 'high', 'low', 'close', 'volume']:
-                    df[col] = df[col].astype(float)
-                
-                return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
-        
-        except Exception as e:
-            logger.error(f"获取Binance K线失败: {e}")
-        
-        return None
+    def _parse_klines(self, data) -> Optional[pd.DataFrame]:
+        df = pd.DataFrame(data, columns=[
+            'timestamp', 'open', 'high', 'low', 'close', 'volume',
+            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
+            'taker_buy_quote', 'ignore'
+        ])
+
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            df[col] = df[col].astype(float)
+
+        return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
     
     def get_all_symbols(self) -> List[str]:
         """获取所有交易对"""
         try:
             url = f"{self.base_url}/api/v3/exchangeInfo"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                symbols = [s['symbol'] for s in data['symbols'] if s['status'] == 'TRADING']
-                return symbols
+            with self.session.get(url, timeout=10, stream=True) as response:
+                if response.status_code == 200:
+                    # 流式过滤，非交易状态的交易对不会被完整保留
+                    symbols = [s['symbol'] for s in _iter_json_items(response, 'symbols.item')
+                               if s['status'] == 'TRADING']
+                    return symbols
         
         except Exception as e:
             logger.error(f"获取Binance交易对失败: {e}")
         
         return []
 
+    def get_24h_tickers(self) -> Dict[str, Ticker24h]:
+        """一次请求获取全部交易对的24h行情"""
+        try:
+            url = f"{self.base_url}/api/v3/ticker/24hr"
+            response = self.session.get(url, timeout=10)
+
+            if response.status_code == 200:
+                return {
+                    t['symbol']: Ticker24h(
+                        float(t['lastPrice']),
+                        float(t['quoteVolume']),
+                        float(t['priceChangePercent'])
+                    )
+                    for t in _parse_json(response)
+                }
+
+        except Exception as e:
+            logger.error(f"获取Binance 24h行情失败: {e}")
+
+        return {}
+
 
 class OKXExchange(BaseExchange):
     """OKX交易所"""
 
-    def __init__(self, market_type: str = 'spot'):
-        super().__init__(market_type)
+    # Binance: 1m, 5m, 15m, 1h, 4h, 1d
+    # OKX: 1m, 5m, 15m, 1H, 4H, 1D
+    _INTERVAL_MAP: ClassVar[Dict[str, str]] = {
+        '1m': '1m',
+        '3m': '3m',
+        '5m': '5m',
+        '15m': '15m',
+        '30m': '30m',
+        '1h': '1H',
+        '2h': '2H',
+        '4h': '4H',
+        '6h': '6H',
+        '12h': '12H',
+        '1d': '1D',
+        '1w': '1W',
+        '1M': '1M'
+    }
+
+    def __init__(self, market_type: str = 'spot', session: Optional[requests.Session] = None):
+        super().__init__(market_type, session)
         self.name = 'OKX'
         self.base_url = 'https://www.okx.com'
 
@@ -151,66 +365,51 @@ class OKXExchange(BaseExchange):
         else:
             self.inst_type = 'SPOT'  # 现货
 
-    def get_current_price(self, symbol: str) -> Optional[float]:
-        """获取当前价格"""
-        try:
-            # OKX使用 BTC-USDT 格式
-            inst_id = self._convert_symbol(symbol)
-
-            url = f"{self.base_url}/api/v5/market/ticker"
-            response = requests.get(url, params={'instId': inst_id}, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                if data['code'] == '0' and data['data']:
-                    return float(data['data'][0]['last'])
-        except Exception as e:
-            logger.error(f"获取OKX价格失败: {e}")
+    def _price_request(self, symbol: str) -> Tuple[str, Dict]:
+        # OKX使用 BTC-USDT 格式
+        inst_id = self._convert_symbol(symbol)
+        return f"{self.base_url}/api/v5/market/ticker", {'instId': inst_id}
 
+    def _parse_price(self, data) -> Optional[float]:
+        if data['code'] == '0' and data['data']:
+            return float(data['data'][0]['last'])
         return None
 
-    def get_klines(self, symbol: str, interval: str, limit: int = 500) -> Optional[pd.DataFrame]:
-        """获取K线数据"""
-        try:
-            inst_id = self._convert_symbol(symbol)
-            bar = self._convert_interval(interval)
-
-            url = f"{self.base_url}/api/v5/market/candles"
-            params = {
-                'instId': inst_id,
-                'bar': bar,
-                'limit': min(limit, 300)  # OKX最多300根
-            }
+    def _klines_request(self, symbol: str, interval: str, limit: int) -> Tuple[str, Dict]:
+        inst_id = self._convert_symbol(symbol)
+        bar = self._convert_interval(interval)
 
-            response = requests.get(url, params=params, timeout=30)  # 增加超时时间
-
-            if response.status_code == 200:
-                data = response.json()
-                if data['code'] == '0' and data['data']:
-                    df = pd.DataFrame(data['data'], columns=[
-                        'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                        'volCcy', 'volCcyQuote', 'confirm'
-                    ])
+        url = f"{self.base_url}/api/v5/market/candles"
+        params = {
+            'instId': inst_id,
+            'bar': bar,
+            'limit': min(limit, 300)  # OKX最多300根
+        }
+        return url, params
 
-                    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='ms')
-                    for col in ['open', 'high', 'low', 'close', 'volume']:
-                        df[col] = df[col].astype(float)
+    def _parse_klines(self, data) -> Optional[pd.DataFrame]:
+        if data['code'] != '0' or not data['data']:
+            return None
 
-                    # OKX返回的是倒序，需要反转
-                    df = df.sort_values('timestamp').reset_index(drop=True)
+        df = pd.DataFrame(data['data'], columns=[
+            'timestamp', 'open', 'high', 'low', 'close', 'volume',
+            'volCcy', 'volCcyQuote', 'confirm'
+        ])
 
-                    return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+        df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='ms')
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            df[col] = df[col].astype(float)
 
-        except Exception as e:
-            logger.error(f"获取OKX K线失败: {e}")
+        # OKX返回的是倒序，需要反转
+        df = df.sort_values('timestamp').reset_index(drop=True)
 
-        return None
+        return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
 
     def get_all_symbols(self) -> List[str]:
         """获取所有交易对"""
         try:
             url = f"{self.base_url}/api/v5/public/instruments"
-            response = requests.get(url, params={'instType': self.inst_type}, timeout=10)
+            response = self.session.get(url, params={'instType': self.inst_type}, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -224,6 +423,32 @@ class OKXExchange(BaseExchange):
 
         return []
 
+    def get_24h_tickers(self) -> Dict[str, Ticker24h]:
+        """一次请求获取全部交易对的24h行情"""
+        try:
+            url = f"{self.base_url}/api/v5/market/tickers"
+            response = self.session.get(url, params={'instType': self.inst_type}, timeout=10)
+
+            if response.status_code == 200:
+                data = _parse_json(response)
+                if data['code'] == '0':
+                    tickers = {}
+                    for t in data['data']:
+                        last = float(t['last'] or 0)
+                        open_24h = float(t['open24h'] or 0)
+                        # 现货的volCcy24h为计价币成交额，合约为币的数量
+                        volume = float(t['volCcy24h'] or 0)
+                        if self.inst_type != 'SPOT':
+                            volume *= last
+                        pct = (last / open_24h - 1.0) * 100.0 if open_24h else 0.0
+                        tickers[t['instId'].replace('-', '')] = Ticker24h(last, volume, pct)
+                    return tickers
+
+        except Exception as e:
+            logger.error(f"获取OKX 24h行情失败: {e}")
+
+        return {}
+
     def _convert_symbol(self, symbol: str) -> str:
         """转换交易对格式: BTCUSDT -> BTC-USDT"""
         # 简单处理，假设都是USDT交易对
@@ -238,32 +463,35 @@ class OKXExchange(BaseExchange):
 
     def _convert_interval(self, interval: str) -> str:
         """转换时间周期格式"""
-        # Binance: 1m, 5m, 15m, 1h, 4h, 1d
-        # OKX: 1m, 5m, 15m, 1H, 4H, 1D
-        interval_map = {
-            '1m': '1m',
-            '3m': '3m',
-            '5m': '5m',
-            '15m': '15m',
-            '30m': '30m',
-            '1h': '1H',
-            '2h': '2H',
-            '4h': '4H',
-            '6h': '6H',
-            '12h': '12H',
-            '1d': '1D',
-            '1w': '1W',
-            '1M': '1M'
-        }
-
-        return interval_map.get(interval, interval)
+        return self._INTERVAL_MAP.get(interval, interval)
 
 
 class HTXExchange(BaseExchange):
     """火币/HTX交易所"""
 
-    def __init__(self, market_type: str = 'spot'):
-        super().__init__(market_type)
+    # Binance: 1m, 5m, 15m, 1h, 4h, 1d
+    # HTX: 1min, 5min, 15min, 60min, 4hour, 1day
+    _INTERVAL_MAP: ClassVar[Dict[str, str]] = {
+        '1m': '1min',
+        '5m': '5min',
+        '15m': '15min',
+        '30m': '30min',
+        '1h': '60min',
+        '4h': '4hour',
+        '1d': '1day',
+        '1w': '1week',
+        '1M': '1mon'
+    }
+
+    # 每根K线的时间间隔（秒）
+    INTERVAL_SECONDS: ClassVar[Dict[str, int]] = {
+        '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
+        '1h': 3600, '4h': 14400,
+        '1d': 86400, '1w': 604800, '1M': 2592000
+    }
+
+    def __init__(self, market_type: str = 'spot', session: Optional[requests.Session] = None):
+        super().__init__(market_type, session)
         self.name = 'HTX'
 
         if market_type == 'futures':
@@ -271,77 +499,73 @@ class HTXExchange(BaseExchange):
         else:
             self.base_url = 'https://api.huobi.pro'  # 现货API
 
-    def get_current_price(self, symbol: str) -> Optional[float]:
-        """获取当前价格"""
-        try:
-            # HTX使用 btcusdt 格式（小写）
-            symbol_lower = symbol.lower()
+    def _price_request(self, symbol: str) -> Tuple[str, Dict]:
+        # HTX使用 btcusdt 格式（小写）
+        return f"{self.base_url}/market/detail/merged", {'symbol': symbol.lower()}
 
-            url = f"{self.base_url}/market/detail/merged"
-            response = requests.get(url, params={'symbol': symbol_lower}, timeout=10)
+    def _parse_price(self, data) -> Optional[float]:
+        if data['status'] == 'ok':
+            return float(data['tick']['close'])
+        return None
 
-            if response.status_code == 200:
-                data = response.json()
-                if data['status'] == 'ok':
-                    return float(data['tick']['close'])
-        except Exception as e:
-            logger.error(f"获取HTX价格失败: {e}")
+    def _klines_request(self, symbol: str, interval: str, limit: int) -> Tuple[str, Dict]:
+        symbol_lower = symbol.lower()
+        period = self._convert_interval(interval)
 
+        url = f"{self.base_url}/market/history/kline"
+        params = {
+            'symbol': symbol_lower,
+            'period': period,
+            'size': min(limit, 2000)  # HTX最多2000根
+        }
+        return url, params
+
+    def _parse_klines(self, data) -> Optional[pd.DataFrame]:
+        if data['status'] == 'ok' and data['data']:
+            return self.klines_to_dataframe(data['data'])
         return None
 
-    def get_klines(self, symbol: str, interval: str, limit: int = 500) -> Optional[pd.DataFrame]:
-        """获取K线数据"""
+    def get_klines_raw(self, symbol: str, interval: str, limit: int = 500) -> Optional[List[Dict]]:
+        """获取原始K线数据（API返回的字典列表，不构建DataFrame）"""
         try:
-            symbol_lower = symbol.lower()
-            period = self._convert_interval(interval)
-
-            url = f"{self.base_url}/market/history/kline"
-            params = {
-                'symbol': symbol_lower,
-                'period': period,
-                'size': min(limit, 2000)  # HTX最多2000根
-            }
-
-            response = requests.get(url, params=params, timeout=30)  # 增加超时时间
+            url, params = self._klines_request(symbol, interval, limit)
+            response = self.session.get(url, params=params, timeout=30)  # 增加超时时间
 
             if response.status_code == 200:
-                data = response.json()
+                data = _parse_json(response)
                 if data['status'] == 'ok':
-                    df = pd.DataFrame(data['data'])
+                    return data['data']
 
-                    df['timestamp'] = pd.to_datetime(df['id'], unit='s')
-                    df = df.rename(columns={
-                        'open': 'open',
-                        'high': 'high',
-                        'low': 'low',
-                        'close': 'close',
-                        'vol': 'volume'
-                    })
+        except Exception as e:
+            logger.error(f"获取HTX K线失败: {e}")
 
-                    for col in ['open', 'high', 'low', 'close', 'volume']:
-                        df[col] = df[col].astype(float)
+        return None
 
-                    # HTX返回的是倒序，需要反转
-                    df = df.sort_values('timestamp').reset_index(drop=True)
+    @staticmethod
+    def klines_to_dataframe(rows: List[Dict]) -> pd.DataFrame:
+        """将原始K线字典列表一次性转换为标准DataFrame"""
+        df = pd.DataFrame(rows)
 
-                    return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+        df['timestamp'] = pd.to_datetime(df['id'], unit='s')
+        df = df.rename(columns={'vol': 'volume'})
 
-        except Exception as e:
-            logger.error(f"获取HTX K线失败: {e}")
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            df[col] = df[col].astype(float)
 
-        return None
+        # HTX返回的是倒序，需要反转
+        df = df.sort_values('timestamp').reset_index(drop=True)
+
+        return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
 
     def get_all_symbols(self) -> List[str]:
         """获取所有交易对"""
         try:
             url = f"{self.base_url}/v1/common/symbols"
-            response = requests.get(url, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                if data['status'] == 'ok':
-                    # 转换为大写格式 (btcusdt -> BTCUSDT)
-                    symbols = [s['symbol'].upper() for s in data['data'] if s['state'] == 'online']
+            with self.session.get(url, timeout=10, stream=True) as response:
+                if response.status_code == 200:
+                    # 转换为大写格式 (btcusdt -> BTCUSDT)，流式过滤下线交易对
+                    symbols = [s['symbol'].upper() for s in _iter_json_items(response, 'data.item')
+                               if s.get('state') == 'online']
                     return symbols
 
         except Exception as e:
@@ -349,21 +573,30 @@ class HTXExchange(BaseExchange):
 
         return []
 
+    def get_24h_tickers(self) -> Dict[str, Ticker24h]:
+        """一次请求获取全部交易对的24h行情"""
+        try:
+            url = f"{self.base_url}/market/tickers"
+            response = self.session.get(url, timeout=10)
+
+            if response.status_code == 200:
+                data = _parse_json(response)
+                if data['status'] == 'ok':
+                    tickers = {}
+                    for t in data['data']:
+                        last = float(t['close'])
+                        open_24h = float(t['open'])
+                        pct = (last / open_24h - 1.0) * 100.0 if open_24h else 0.0
+                        # vol为计价币成交额
+                        tickers[t['symbol'].upper()] = Ticker24h(last, float(t['vol']), pct)
+                    return tickers
+
+        except Exception as e:
+            logger.error(f"获取HTX 24h行情失败: {e}")
+
+        return {}
+
     def _convert_interval(self, interval: str) -> str:
         """转换时间周期格式"""
-        # Binance: 1m, 5m, 15m, 1h, 4h, 1d
-        # HTX: 1min, 5min, 15min, 60min, 4hour, 1day
-        interval_map = {
-            '1m': '1min',
-            '5m': '5min',
-            '15m': '15min',
-            '30m': '30min',
-            '1h': '60min',
-            '4h': '4hour',
-            '1d': '1day',
-            '1w': '1week',
-            '1M': '1mon'
-        }
-
-        return interval_map.get(interval, interval)
+        return self._INTERVAL_MAP.get(interval, interval)
 
@@ -13,15 +13,32 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-import requests
-import pandas as pd
+import numpy as np
 from datetime import datetime
 import time
+from functools import lru_cache
 from loguru import logger
-from strategies.crypto_signals import SignalCalculator
-from tools.crypto_config import load_strategy_params
+from tools.crypto_config import load_strategy_params, DEFAULT_STRATEGY_PARAMS
 from tools.price_precision import format_price, get_symbol_precision
-from tools.exchange_factory import ExchangeFactory
+
+
+@lru_cache(maxsize=None)
+def _load_signal_kernel():
+    """
+    首次计算信号时才导入信号内核（numba导入较慢，不拖慢CLI参数解析和 --help）
+
+    优先使用AOT预编译的信号内核（python -m tools._signal_aot 生成），否则回退到JIT版本
+
+    Returns:
+        (compute_signals, 是否需要预热JIT编译)
+    """
+    try:
+        from tools.signal_aot import compute_signals
+        return compute_signals, False
+    except ImportError:
+        from tools._njit import NUMBA_AVAILABLE
+        from tools._signal_kernels import compute_signals
+        return compute_signals, NUMBA_AVAILABLE
 
 
 class LiveDataMonitor:
@@ -40,6 +57,10 @@ class LiveDataMonitor:
         self.market_type = market_type
         self.exchange_name = exchange
 
+        # 较重的模块（pandas等）在创建实例时才导入，CLI的 --help 可快速返回
+        from strategies.crypto_signals import SignalCalculator
+        from tools.exchange_factory import ExchangeFactory
+
         # 创建交易所实例
         self.exchange = ExchangeFactory.create(exchange, market_type)
 
@@ -53,11 +74,35 @@ class LiveDataMonitor:
         try:
             self.params = load_strategy_params()
         except Exception:
-            from tools.crypto_config import DEFAULT_STRATEGY_PARAMS
             self.params = DEFAULT_STRATEGY_PARAMS
 
+        # 交易条件阈值只读取一次
+        tc = self.params['trading_conditions']
+        self._ha_thr = tc['buy']['HA_threshold']
+        self._wd3_max = tc['buy']['WD3_max']
+        self._qj_thr = tc['sell']['QJ_threshold']
+        self._wd3_thr = tc['sell']['WD3_threshold']
+
+        # 上一次计算的 (周期, 最后K线时间, 最新收盘价) 及其信号
+        self._last_key = None
+        self._last_signals = None
+
+        # 预热信号内核，JIT编译不占用第一次监控（AOT版本无需预热）
+        if _load_signal_kernel()[1]:
+            self._warmup_signal_kernel()
+
         logger.info(f"✓ 实时监控初始化: {symbol} ({market_type}) - {exchange.upper()}")
 
+    def _warmup_signal_kernel(self):
+        """用100根虚拟K线调用一次信号内核，触发编译（或加载缓存）"""
+        sp = self.params['signal_params']
+        compute_signals = _load_signal_kernel()[0]
+        compute_signals(
+            np.linspace(1.0, 2.0, 100),
+            sp['M1'], sp['M2'], sp['M3'], sp['M4'],
+            sp['SHORT'], sp['LONG'], sp['MID'], sp['N']
+        )
+
     def get_latest_klines(self, interval: str = '1h', limit: int = 100):
         """
         获取最新K线数据（公开API，无需密钥）
@@ -73,15 +118,15 @@ class LiveDataMonitor:
             df = self.exchange.get_klines(self.symbol, interval, limit)
 
             if df is not None:
-                # 统一列名
-                df = df.rename(columns={'timestamp': 'stime'})
+                # 统一列名（原地修改，df为本次请求新建，无需复制）
+                df.rename(columns={'timestamp': 'stime'}, inplace=True)
                 return df
 
             return None
 
         except Exception as e:
             logger.error(f"获取实时数据失败: {e}")
-            return pd.DataFrame()
+            return None
 
     def get_current_price(self):
         """获取当前价格（公开API）"""
@@ -105,84 +150,58 @@ class LiveDataMonitor:
         # 获取最新100根K线（确保指标计算准确）
         df = self.get_latest_klines(interval, limit=100)
 
-        if df.empty:
+        if df is None or df.empty:
             return None
 
-        # 使用信号计算器的指标计算逻辑
-        data = df.copy()
+        # 收盘价一次性转为float64数组，交给融合内核计算
+        close = df['close'].to_numpy(dtype=np.float64)
 
-        # 导入指标函数
-        from strategies.indicators import MA, EMA, SMA, STD, IF, MIN, MAX, SUM, REF, ABS, EXPMEMA
-        from strategies.crypto_signals import SignalCalculator
+        # 最后一根K线未变化（时间与收盘价相同）时直接复用上次结果
+        key = (interval, df['stime'].iat[-1], close[-1])
+        if key == self._last_key:
+            return self._last_signals
 
         # 计算信号参数
         sp = self.params['signal_params']
 
-        # MA系列
-        data['MA1'] = MA(data['close'], sp['M1'])
-        data['MA2'] = MA(data['close'], sp['M2'])
-        data['MA3'] = MA(data['close'], sp['M3'])
-        data['MA4'] = MA(data['close'], sp['M4'])
-
-        # HA指标
-        data['H4A1'] = ((data['MA1'] > data['MA1'].shift(1)) &
-                       (data['MA3'] > data['MA3'].shift(1))).astype(int)
-        data['HA'] = (MA(data['H4A1'], sp['N']) * 2500 * 16).astype(int)
-
-        # QS指标
-        data['DIF'] = EMA(data['close'], sp['SHORT']) - EMA(data['close'], sp['LONG'])
-        data['DEA'] = MA(data['DIF'], sp['MID'])
-        data['WOD'] = 0  # 简化计算
-        data['QS1'] = ((data['DIF'] > data['DEA']) &
-                      (data['MA1'] > data['MA1'].shift(1))).astype(int)
-        data['QS'] = -(MA(data['QS1'], sp['N']) * 1500).astype(int)
-
-        # QJ指标
-        data['QJ1'] = ((data['MA4'] < data['MA4'].shift(1)) &
-                      (data['MA3'] < data['MA3'].shift(1)) &
-                      (data['MA2'] < data['MA2'].shift(1)) &
-                      (data['MA1'] < data['MA1'].shift(1))).astype(int)
-        data['QJ'] = -(MA(data['QJ1'], sp['N']) * 2500 * 40).astype(int)
-
-        # WD3简化计算
-        data['WD3'] = 100
-
-        # 最新一根K线的信号
-        latest = data.iloc[-1]
-
-        return {
-            'time': latest['stime'],
-            'close': latest['close'],
-            'HA': int(latest['HA']),
-            'QS': int(latest['QS']),
-            'QJ': int(latest['QJ']),
-            'WD3': int(latest['WD3'])
+        compute_signals = _load_signal_kernel()[0]
+        ha, qs, qj = compute_signals(
+            close,
+            sp['M1'], sp['M2'], sp['M3'], sp['M4'],
+            sp['SHORT'], sp['LONG'], sp['MID'], sp['N']
+        )
+
+        # 最新一根K线的信号（WD3简化计算）
+        signals = {
+            'time': df['stime'].iat[-1],
+            'close': float(close[-1]),
+            'HA': int(ha[-1]),
+            'QS': int(qs[-1]),
+            'QJ': int(qj[-1]),
+            'WD3': 100
         }
 
-    def check_trading_signal(self, signals: dict):
+        self._last_key = key
+        self._last_signals = signals
+
+        return signals
+
+    def check_trading_signal(self, ha: int, qs: int, qj: int, wd3: int):
         """
         检查交易信号
 
         Args:
-            signals: 信号字典
+            ha, qs, qj, wd3: 最新一根K线的信号值
 
         Returns:
             'BUY', 'SELL', 或 None
         """
-        buy_params = self.params['trading_conditions']['buy']
-        sell_params = self.params['trading_conditions']['sell']
-
-        ha = signals['HA']
-        qs = signals['QS']
-        qj = signals['QJ']
-        wd3 = signals['WD3']
-
         # 买入信号
-        if ha > buy_params['HA_threshold'] and wd3 < buy_params['WD3_max']:
+        if ha > self._ha_thr and wd3 < self._wd3_max:
             return 'BUY'
 
         # 卖出信号
-        if abs(qj) > sell_params['QJ_threshold'] or wd3 > sell_params['WD3_threshold']:
+        if abs(qj) > self._qj_thr or wd3 > self._wd3_thr:
             return 'SELL'
 
         return None
@@ -202,8 +221,14 @@ class LiveDataMonitor:
         # 获取价格精度
         price_precision = get_symbol_precision(self.symbol)
 
+        # 按固定节拍调度，扣除每轮请求与计算耗时，避免累积漂移
+        start = time.monotonic()
+        tick = 0
+
         try:
             while True:
+                tick += 1
+
                 # 获取当前价格
                 price = self.get_current_price()
 
@@ -212,7 +237,9 @@ class LiveDataMonitor:
 
                 if signals and price:
                     # 检查交易信号
-                    action = self.check_trading_signal(signals)
+                    action = self.check_trading_signal(
+                        signals['HA'], signals['QS'], signals['QJ'], signals['WD3']
+                    )
 
                     # 显示信息
                     price_str = format_price(price, price_precision)
@@ -237,8 +264,12 @@ class LiveDataMonitor:
 
                     print(f"{'='*60}")
 
-                # 等待
-                time.sleep(update_seconds)
+                # 等待到下一个节拍；本轮超时则立即进入下一轮，并跳过已错过的节拍
+                remaining = start + tick * update_seconds - time.monotonic()
+                if remaining > 0:
+                    time.sleep(remaining)
+                else:
+                    tick = int((time.monotonic() - start) // update_seconds)
 
         except KeyboardInterrupt:
             logger.info("\n\n监控已停止")
@@ -5,12 +5,24 @@
 支持多种通知方式：控制台、邮件、Telegram、企业微信、钉钉、飞书
 """
 
+import atexit
 import json
-import requests
+import weakref
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+
+# 尚未回收的通知器（弱引用，不阻止回收），进程退出时统一释放连接
+_LIVE_NOTIFIERS = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all_notifiers():
+    """进程退出时关闭所有通知器的SMTP连接与HTTP会话"""
+    for notifier in list(_LIVE_NOTIFIERS):
+        notifier.close()
 
 
 class Notifier:
@@ -28,6 +40,69 @@ class Notifier:
         
         self.config = self._load_config(config_path)
         self.enabled_methods = self.config.get('enabled_methods', ['console'])
+        
+        # HTTP会话在首次推送时创建（仅控制台/邮件通知时无需导入requests）
+        self._session = None
+        
+        # SMTP连接在首次发邮件时建立并保持，连续通知复用同一TLS会话
+        self._smtp = None
+        _LIVE_NOTIFIERS.add(self)
+    
+    def _get_session(self):
+        """获取复用的HTTP会话，避免每条通知都重新进行TCP+TLS握手"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            self._session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=16,
+                max_retries=Retry(total=2, backoff_factor=0.2)
+            )
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
+        
+        return self._session
+    
+    def _get_smtp(self, email_config: Dict) -> 'smtplib.SMTP':
+        """获取已登录的SMTP连接，断开时自动重连"""
+        import smtplib
+
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_smtp()
+        
+        server = smtplib.SMTP(email_config['smtp_server'], email_config.get('smtp_port', 587), timeout=30)
+        server.starttls()
+        server.login(email_config['sender'], email_config['password'])
+        self._smtp = server
+        
+        return server
+    
+    def _close_smtp(self):
+        """关闭SMTP连接（忽略已断开的错误）"""
+        if self._smtp is not None:
+            import smtplib
+
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+    
+    def close(self):
+        """释放SMTP连接与HTTP会话"""
+        self._close_smtp()
+        
+        if self._session is not None:
+            self._session.close()
+            self._session = None
     
     def _load_config(self, config_path: Path) -> Dict:
         """加载配置文件"""
@@ -42,7 +117,8 @@ class Notifier:
             logger.error(f"加载配置文件失败: {e}")
             return {'enabled_methods': ['console']}
     
-    def send(self, title: str, message: str, level: str = 'info'):
+    def send(self, title: str = '', message: str = '', level: str = 'info',
+             batch: Optional[List[Tuple[str, str]]] = None):
         """
         发送通知
         
@@ -50,23 +126,27 @@ class Notifier:
             title: 通知标题
             message: 通知内容
             level: 通知级别 (info/warning/error)
+            batch: 批量通知 [(标题, 内容), ...]，提供时忽略 title/message
         """
-        for method in self.enabled_methods:
-            try:
-                if method == 'console':
-                    self._send_console(title, message, level)
-                elif method == 'email':
-                    self._send_email(title, message)
-                elif method == 'telegram':
-                    self._send_telegram(title, message)
-                elif method == 'wecom':
-                    self._send_wecom(title, message)
-                elif method == 'dingtalk':
-                    self._send_dingtalk(title, message)
-                elif method == 'feishu':
-                    self._send_feishu(title, message)
-            except Exception as e:
-                logger.error(f"发送通知失败 ({method}): {e}")
+        items = batch if batch is not None else [(title, message)]
+        
+        for title, message in items:
+            for method in self.enabled_methods:
+                try:
+                    if method == 'console':
+                        self._send_console(title, message, level)
+                    elif method == 'email':
+                        self._send_email(title, message)
+                    elif method == 'telegram':
+                        self._send_telegram(title, message)
+                    elif method == 'wecom':
+                        self._send_wecom(title, message)
+                    elif method == 'dingtalk':
+                        self._send_dingtalk(title, message)
+                    elif method == 'feishu':
+                        self._send_feishu(title, message)
+                except Exception as e:
+                    logger.error(f"发送通知失败 ({method}): {e}")
     
     def _send_console(self, title: str, message: str, level: str):
         """控制台输出"""
@@ -88,7 +168,6 @@ class Notifier:
         from email.mime.multipart import MIMEMultipart
         
         smtp_server = email_config.get('smtp_server')
-        smtp_port = email_config.get('smtp_port', 587)
         sender = email_config.get('sender')
         password = email_config.get('password')
         receivers = email_config.get('receivers', [])
@@ -104,10 +183,12 @@ class Notifier:
         
         msg.attach(MIMEText(message, 'plain', 'utf-8'))
         
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender, password)
-            server.send_message(msg)
+        try:
+            self._get_smtp(email_config).send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # 保持的连接被服务器关闭，重连后重试一次
+            self._close_smtp()
+            self._get_smtp(email_config).send_message(msg)
         
         logger.info(f"✓ 邮件通知已发送: {title}")
     
@@ -133,7 +214,7 @@ class Notifier:
             'parse_mode': 'Markdown'
         }
         
-        response = requests.post(url, json=payload, timeout=10)
+        response = self._get_session().post(url, json=payload, timeout=10)
         response.raise_for_status()
         
         logger.info(f"✓ Telegram通知已发送: {title}")
@@ -157,7 +238,7 @@ class Notifier:
             }
         }
         
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = self._get_session().post(webhook_url, json=payload, timeout=10)
         response.raise_for_status()
         
         logger.info(f"✓ 企业微信通知已发送: {title}")
@@ -181,7 +262,7 @@ class Notifier:
             }
         }
         
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = self._get_session().post(webhook_url, json=payload, timeout=10)
         response.raise_for_status()
 
         logger.info(f"✓ 钉钉通知已发送: {title}")
@@ -206,7 +287,7 @@ class Notifier:
             }
         }
 
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = self._get_session().post(webhook_url, json=payload, timeout=10)
         response.raise_for_status()
 
         logger.info(f"✓ 飞书通知已发送: {title}")
@@ -4,23 +4,78 @@
 实时监控多个交易对，通过指标分析找出交易机会
 """
 
+from __future__ import annotations
+
 import sys
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import asyncio
 import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict, Optional
-import pandas as pd
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Optional
+import numpy as np
 from loguru import logger
-from tools.exchange_factory import ExchangeFactory
-from strategies.crypto_signals import SignalCalculator
+from tools.crypto_config import load_strategy_params, DEFAULT_STRATEGY_PARAMS
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from tools.exchange_factory import Ticker24h
+
+
+@lru_cache(maxsize=None)
+def _load_async_http():
+    """
+    首次扫描时才导入aiohttp/aiolimiter（导入较慢，不拖慢CLI参数解析和 --help）
+
+    二者均为可选依赖：未安装aiohttp时K线和价格改用线程池执行同步请求，未安装aiolimiter时不限速
+
+    Returns:
+        (aiohttp模块或None, AsyncLimiter类或None)
+    """
+    try:
+        import aiohttp
+    except ImportError:
+        aiohttp = None
+
+    try:
+        from aiolimiter import AsyncLimiter
+    except ImportError:
+        AsyncLimiter = None
+
+    return aiohttp, AsyncLimiter
+
+
+@dataclass
+class Opportunity:
+    """扫描发现的交易机会"""
+
+    # 手动声明 __slots__（兼容Python 3.9，dataclass(slots=True) 需要3.10+）
+    __slots__ = ('symbol', 'exchange', 'price', 'price_change_24h',
+                 'ha', 'qs', 'qj', 'wd3', 'timestamp', 'is_mainstream')
+
+    symbol: str
+    exchange: str
+    price: float
+    price_change_24h: float
+    ha: int
+    qs: float
+    qj: float
+    wd3: float
+    timestamp: float  # Unix时间戳（秒）
+    is_mainstream: bool
 
 
 class OpportunityScanner:
     """机会交易对扫描器"""
+
+    # 并发扫描的最大在途请求数与每秒请求上限
+    MAX_CONCURRENCY = 20
+    MAX_REQUESTS_PER_SECOND = 20
     
     def __init__(
         self,
@@ -49,6 +104,9 @@ class OpportunityScanner:
         self.include_mainstream = include_mainstream
         self.include_altcoins = include_altcoins
         
+        # 较重的模块（pandas等）在创建实例时才导入，CLI的 --help 可快速返回
+        from tools.exchange_factory import ExchangeFactory
+
         # 创建交易所实例
         self.exchange = ExchangeFactory.create(exchange, market_type)
         
@@ -58,6 +116,25 @@ class OpportunityScanner:
             'ADAUSDT', 'DOGEUSDT', 'MATICUSDT', 'DOTUSDT', 'LTCUSDT',
             'AVAXUSDT', 'LINKUSDT', 'ATOMUSDT', 'UNIUSDT', 'ETCUSDT'
         ]
+        self._mainstream_set = frozenset(self.mainstream_coins)
+        
+        # 交易对列表缓存（上架币种变化缓慢，无需每轮扫描都重新获取）
+        self._symbol_cache = None
+        self._symbol_cache_ts = 0.0
+        self._symbol_cache_ttl = 3600
+        
+        # 信号参数与交易条件阈值（与实时监控一致）
+        try:
+            params = load_strategy_params()
+        except Exception:
+            params = DEFAULT_STRATEGY_PARAMS
+        self.signal_params = params['signal_params']
+        tc = params['trading_conditions']
+        self._ha_thr = tc['buy']['HA_threshold']
+        self._qs_thr = tc['buy']['QS_threshold']
+        self._wd3_max = tc['buy']['WD3_max']
+        self._qj_thr = tc['sell']['QJ_threshold']
+        self._wd3_thr = tc['sell']['WD3_threshold']
         
         # 扫描结果
         self.opportunities = []
@@ -69,7 +146,11 @@ class OpportunityScanner:
         logger.info(f"  山寨币: {'包含' if include_altcoins else '排除'}")
     
     def get_scan_symbols(self) -> List[str]:
-        """获取要扫描的交易对列表"""
+        """获取要扫描的交易对列表（缓存 _symbol_cache_ttl 秒）"""
+        if (self._symbol_cache is not None and
+                time.time() - self._symbol_cache_ts < self._symbol_cache_ttl):
+            return self._symbol_cache
+        
         all_symbols = self.exchange.get_all_symbols()
         
         # 过滤USDT交易对
@@ -79,7 +160,7 @@ class OpportunityScanner:
         scan_symbols = []
         
         for symbol in usdt_symbols:
-            is_mainstream = symbol in self.mainstream_coins
+            is_mainstream = symbol in self._mainstream_set
             
             if is_mainstream and self.include_mainstream:
                 scan_symbols.append(symbol)
@@ -88,12 +169,43 @@ class OpportunityScanner:
         
         logger.info(f"✓ 获取到 {len(scan_symbols)} 个交易对")
         
+        # 获取失败（空列表）时不缓存，下一轮重试
+        if scan_symbols:
+            self._symbol_cache = scan_symbols
+            self._symbol_cache_ts = time.time()
+        
         return scan_symbols
     
-    def analyze_symbol(self, symbol: str) -> Optional[Dict]:
+    def filter_by_volume(self, symbols: List[str]) -> Dict[str, Optional[Ticker24h]]:
+        """
+        用一次批量24h行情请求预筛选，成交额不足的交易对不再下载K线
+        
+        Returns:
+            {交易对: 24h行情}，行情获取失败时不过滤且行情为None
+        """
+        tickers = self.exchange.get_24h_tickers()
+        
+        if not tickers:
+            logger.warning("获取24h行情失败，跳过成交量过滤")
+            return {s: None for s in symbols}
+        
+        filtered = {
+            s: tickers[s] for s in symbols
+            if s in tickers and tickers[s].volume_quote >= self.min_volume_usdt
+        }
+        
+        logger.info(f"✓ 成交量过滤后剩余 {len(filtered)}/{len(symbols)} 个交易对")
+        
+        return filtered
+    
+    def analyze_symbol(self, symbol: str, ticker: Optional[Ticker24h] = None) -> Optional[Opportunity]:
         """
         分析单个交易对
         
+        Args:
+            symbol: 交易对
+            ticker: 已获取的24h行情，提供时直接使用其最新价
+        
         Returns:
             如果有机会返回分析结果，否则返回None
         """
@@ -101,87 +213,188 @@ class OpportunityScanner:
             # 获取K线数据
             df = self.exchange.get_klines(symbol, self.interval, limit=200)
             
-            if df is None or len(df) < 100:
-                return None
-            
-            # 计算信号
-            signal_calc = SignalCalculator(symbol, self.market_type)
-            signals = signal_calc.calculate_signals(df)
+            signals = self._calculate_signals(symbol, df)
             
             if not signals:
                 return None
             
             # 获取当前价格
-            current_price = self.exchange.get_current_price(symbol)
-            
-            if current_price is None:
-                return None
-            
-            # 判断是否有买入机会
-            buy_signal = (
-                signals['HA'] == 1 and  # HA指标看涨
-                signals['WD3'] > 0 and  # WD3指标看涨
-                signals['QS'] > 0       # QS指标看涨
-            )
-            
-            # 判断是否有卖出信号（避免）
-            sell_signal = (
-                signals['QJ'] == 1 or   # QJ指标看跌
-                signals['WD3'] < 0      # WD3指标看跌
-            )
+            if ticker is not None:
+                current_price = ticker.last
+            else:
+                current_price = self.exchange.get_current_price(symbol)
             
-            if buy_signal and not sell_signal:
-                # 计算24h涨跌幅
-                price_change_24h = ((df['close'].iloc[-1] - df['close'].iloc[-24]) / 
-                                   df['close'].iloc[-24] * 100) if len(df) >= 24 else 0
-                
-                return {
-                    'symbol': symbol,
-                    'exchange': self.exchange_name,
-                    'price': current_price,
-                    'price_change_24h': price_change_24h,
-                    'signals': signals,
-                    'timestamp': datetime.now(),
-                    'is_mainstream': symbol in self.mainstream_coins
-                }
+            return self._evaluate(symbol, df, signals, current_price)
         
         except Exception as e:
             logger.debug(f"分析 {symbol} 失败: {e}")
         
         return None
 
-    def scan_once(self) -> List[Dict]:
+    def _calculate_signals(self, symbol: str, df: Optional[pd.DataFrame]) -> Optional[Dict]:
+        """根据K线计算信号，数据不足时返回None"""
+        return self._calculate_signals_many({symbol: df}).get(symbol)
+
+    def _calculate_signals_many(self, klines_map: Dict[str, Optional[pd.DataFrame]]) -> Dict[str, Dict]:
+        """
+        一次性计算多个交易对的最新信号（收盘价拼接后交给并行内核）
+
+        Returns:
+            {交易对: 信号字典}，数据不足100根的交易对不包含在内
+        """
+        valid = [(s, df) for s, df in klines_map.items() if df is not None and len(df) >= 100]
+
+        if not valid:
+            return {}
+
+        from tools._signal_kernels import batch_signals
+
+        closes = np.concatenate([df['close'].to_numpy(dtype=np.float64) for _, df in valid])
+        offsets = np.zeros(len(valid) + 1, dtype=np.int64)
+        np.cumsum([len(df) for _, df in valid], out=offsets[1:])
+
+        sp = self.signal_params
+        ha, qs, qj = batch_signals(
+            closes, offsets,
+            sp['M1'], sp['M2'], sp['M3'], sp['M4'],
+            sp['SHORT'], sp['LONG'], sp['MID'], sp['N']
+        )
+
+        # WD3简化计算（与实时监控一致）
+        return {
+            symbol: {'HA': int(ha[i]), 'QS': int(qs[i]), 'QJ': int(qj[i]), 'WD3': 100}
+            for i, (symbol, _) in enumerate(valid)
+        }
+
+    def _evaluate(self, symbol: str, df: pd.DataFrame, signals: Dict,
+                  current_price: Optional[float]) -> Optional[Opportunity]:
+        """
+        根据信号判断是否为交易机会
+
+        信号为内核输出的缩放值（HA为0~40000，QS/QJ取负），阈值比较与实时监控的 check_trading_signal 一致
+        """
+        if current_price is None:
+            return None
+
+        # 判断是否有买入机会
+        buy_signal = (
+            signals['HA'] > self._ha_thr and        # HA趋势强度达到阈值
+            abs(signals['QS']) > self._qs_thr and   # QS确认强势
+            signals['WD3'] < self._wd3_max          # WD3未过热
+        )
+
+        # 判断是否有卖出信号（避免）
+        sell_signal = (
+            abs(signals['QJ']) > self._qj_thr or    # QJ趋势转弱
+            signals['WD3'] > self._wd3_thr          # WD3过热
+        )
+
+        if buy_signal and not sell_signal:
+            # 计算24h涨跌幅
+            close_np = df['close'].to_numpy()
+            price_change_24h = ((close_np[-1] / close_np[-24] - 1.0) * 100.0
+                                if close_np.size >= 24 else 0.0)
+
+            return Opportunity(
+                symbol=symbol,
+                exchange=self.exchange_name,
+                price=current_price,
+                price_change_24h=float(price_change_24h),
+                ha=signals['HA'],
+                qs=signals['QS'],
+                qj=signals['QJ'],
+                wd3=signals['WD3'],
+                timestamp=time.time(),
+                is_mainstream=symbol in self._mainstream_set
+            )
+
+        return None
+
+    def scan_once(self) -> List[Opportunity]:
         """执行一次扫描"""
+        return asyncio.run(self._scan_once_async())
+
+    async def _scan_once_async(self) -> List[Opportunity]:
+        """批量并发获取K线后集中分析（信号量限制并发数，限速器控制请求频率）"""
         logger.info(f"\n{'='*80}")
         logger.info(f"开始扫描 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         logger.info(f"{'='*80}")
 
-        # 获取要扫描的交易对
-        symbols = self.get_scan_symbols()
+        # 获取要扫描的交易对，并按24h成交额预筛选
+        tickers = self.filter_by_volume(self.get_scan_symbols())
 
-        opportunities = []
-        scanned = 0
+        aiohttp, AsyncLimiter = _load_async_http()
+        limiter = (AsyncLimiter(max_rate=self.MAX_REQUESTS_PER_SECOND, time_period=1)
+                   if AsyncLimiter is not None else None)
 
-        for symbol in symbols:
-            scanned += 1
+        if aiohttp is not None:
+            timeout = aiohttp.ClientTimeout(total=30)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                klines_map, signals_map, prices = await self._fetch_signals(session, tickers, limiter)
+        else:
+            klines_map, signals_map, prices = await self._fetch_signals(None, tickers, limiter)
 
-            if scanned % 10 == 0:
-                logger.info(f"进度: {scanned}/{len(symbols)}")
+        opportunities = []
 
-            result = self.analyze_symbol(symbol)
+        for symbol, signals in signals_map.items():
+            try:
+                result = self._evaluate(symbol, klines_map[symbol], signals, prices.get(symbol))
+            except Exception as e:
+                logger.debug(f"分析 {symbol} 失败: {e}")
+                continue
 
             if result:
                 opportunities.append(result)
                 logger.success(f"✅ 发现机会: {symbol}")
 
-            # 避免请求过快
-            time.sleep(0.1)
-
         logger.info(f"\n扫描完成: 发现 {len(opportunities)} 个机会")
 
         return opportunities
 
-    def display_opportunities(self, opportunities: List[Dict]):
+    async def _fetch_signals(self, session, tickers: Dict[str, Optional[Ticker24h]], limiter):
+        """
+        并发获取K线并计算信号，再补齐缺少24h行情的交易对价格
+
+        Args:
+            session: aiohttp.ClientSession，为None时在线程池中执行同步请求
+            tickers: {交易对: 24h行情}
+            limiter: 异步限速器，为None时不限速
+
+        Returns:
+            (K线字典, 信号字典, 价格字典)
+        """
+        symbols = list(tickers)
+
+        klines_map = await self.exchange.get_klines_many(
+            symbols, self.interval, limit=200, session=session,
+            limiter=limiter, max_concurrency=self.MAX_CONCURRENCY
+        )
+        logger.info(f"K线获取完成: {sum(df is not None for df in klines_map.values())}/{len(symbols)}")
+
+        signals_map = self._calculate_signals_many(klines_map)
+
+        # 只为有信号且缺少24h行情的交易对单独查询价格
+        prices = {s: tickers[s].last for s in signals_map if tickers[s] is not None}
+        missing = [s for s in signals_map if s not in prices]
+
+        async def fetch_price(symbol):
+            if session is None:
+                return await asyncio.to_thread(self.exchange.get_current_price, symbol)
+            return await self.exchange.get_current_price_async(session, symbol)
+
+        async def fetch_price_limited(symbol):
+            if limiter is None:
+                return await fetch_price(symbol)
+            async with limiter:
+                return await fetch_price(symbol)
+
+        if missing:
+            results = await asyncio.gather(*(fetch_price_limited(s) for s in missing))
+            prices.update(zip(missing, results))
+
+        return klines_map, signals_map, prices
+
+    def display_opportunities(self, opportunities: List[Opportunity]):
         """显示发现的机会"""
         if not opportunities:
             print("\n❌ 未发现交易机会")
@@ -191,21 +404,39 @@ class OpportunityScanner:
         print(f"发现 {len(opportunities)} 个交易机会")
         print(f"{'='*100}")
 
-        # 按24h涨跌幅排序
-        opportunities.sort(key=lambda x: x['price_change_24h'], reverse=True)
+        # 转为列式数组后按24h涨跌幅排序（稳定排序，涨幅相同保持原顺序）
+        cols = self._to_columns(opportunities)
+        order = np.argsort(-cols['price_change_24h'], kind='stable')
+
+        # 原列表同步排序，供 send_alert 取前几名
+        opportunities[:] = [opportunities[i] for i in order]
 
         print(f"\n{'序号':<4} {'交易对':<12} {'类型':<6} {'价格':<12} {'24h涨跌':<10} {'HA':<4} {'WD3':<6} {'QS':<6}")
         print("-" * 100)
 
-        for i, opp in enumerate(opportunities, 1):
-            coin_type = '主流' if opp['is_mainstream'] else '山寨'
+        for rank, i in enumerate(order, 1):
+            coin_type = '主流' if cols['is_mainstream'][i] else '山寨'
 
-            print(f"{i:<4} {opp['symbol']:<12} {coin_type:<6} "
-                  f"${opp['price']:<11.4f} {opp['price_change_24h']:+.2f}% "
-                  f"{opp['signals']['HA']:<4} {opp['signals']['WD3']:<6.2f} {opp['signals']['QS']:<6.2f}")
+            print(f"{rank:<4} {cols['symbol'][i]:<12} {coin_type:<6} "
+                  f"${cols['price'][i]:<11.4f} {cols['price_change_24h'][i]:+.2f}% "
+                  f"{cols['HA'][i]:<4} {cols['WD3'][i]:<6.2f} {cols['QS'][i]:<6.2f}")
 
         print("-" * 100)
 
+    @staticmethod
+    def _to_columns(opportunities: List[Opportunity]) -> Dict[str, np.ndarray]:
+        """将机会列表转换为按字段组织的数组"""
+        return {
+            'symbol': np.asarray([o.symbol for o in opportunities], dtype=object),
+            'price': np.asarray([o.price for o in opportunities], dtype=np.float64),
+            'price_change_24h': np.asarray([o.price_change_24h for o in opportunities],
+                                           dtype=np.float64),
+            'is_mainstream': np.asarray([o.is_mainstream for o in opportunities], dtype=bool),
+            'HA': np.asarray([o.ha for o in opportunities]),
+            'WD3': np.asarray([o.wd3 for o in opportunities]),
+            'QS': np.asarray([o.qs for o in opportunities]),
+        }
+
     def run_continuous(self, scan_interval: int = 300):
         """
         持续扫描
@@ -232,14 +463,14 @@ class OpportunityScanner:
         except KeyboardInterrupt:
             logger.info("\n\n扫描已停止")
 
-    def send_alert(self, opportunities: List[Dict]):
+    def send_alert(self, opportunities: List[Opportunity]):
         """发送提醒（可以扩展为邮件、微信等）"""
         # 简单的控制台提醒
         print("\n" + "🔔" * 50)
         print(f"⚠️  发现 {len(opportunities)} 个交易机会！")
 
         for opp in opportunities[:5]:  # 只显示前5个
-            print(f"   • {opp['symbol']}: ${opp['price']:.4f} ({opp['price_change_24h']:+.2f}%)")
+            print(f"   • {opp.symbol}: ${opp.price:.4f} ({opp.price_change_24h:+.2f}%)")
 
         print("🔔" * 50 + "\n")
 
@@ -13,7 +13,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from datetime import datetime, timedelta
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import time
 import json
 from loguru import logger
@@ -21,11 +24,67 @@ from tools.live_monitor import LiveDataMonitor
 from tools.crypto_config import load_strategy_params
 from tools.price_precision import format_price, get_symbol_precision, format_amount
 from tools.notifier import Notifier
+from tools._njit import NUMBA_AVAILABLE
+
+# 优先使用AOT预编译的止盈止损函数（python -m tools._pt_aot 生成），否则回退到JIT版本
+try:
+    from tools.pt_aot import check_stops
+    PT_AOT_AVAILABLE = True
+except ImportError:
+    from tools._pt_loops import check_stops
+    PT_AOT_AVAILABLE = False
+
+# orjson序列化交易记录更快，未安装时回退到标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _json_line(obj: dict) -> bytes:
+    """序列化为一行JSON（NDJSON），以换行结尾"""
+    if _orjson is not None:
+        return _orjson.dumps(obj) + b'\n'
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8') + b'\n'
+
+# _check_stop_conditions 返回的标志位
+_STOP_TP = 1
+_STOP_SL = 2
+
+# 定时报告间隔（秒）
+_REPORT_INTERVAL = 24 * 3600
+
+
+def _fmt_ts(ns: int) -> str:
+    """纳秒时间戳 -> 'YYYY-MM-DD HH:MM:SS'（仅在显示时格式化）"""
+    return datetime.fromtimestamp(ns / 1e9).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _trade_for_log(trade: dict) -> dict:
+    """导出用的交易记录：time_ns 转为ISO时间字符串 'time'"""
+    out = {'time': datetime.fromtimestamp(trade['time_ns'] / 1e9).isoformat()}
+    out.update((k, v) for k, v in trade.items() if k != 'time_ns')
+    return out
 
 
 class PaperTrader:
     """模拟交易器"""
 
+    # 固定属性集合：省去实例 __dict__，热循环中的属性访问更快
+    __slots__ = (
+        'symbol', 'market_type', 'exchange_name',
+        'initial_capital', 'capital', 'position', 'entry_price', 'trades',
+        'enable_fees', 'enable_slippage', 'fee_rate_spot', 'fee_rate_futures', 'slippage_rate',
+        'enable_stop_loss', 'enable_take_profit',
+        'take_profit_rate', 'stop_loss_rate', 'trailing_stop_rate', 'highest_price',
+        '_tp_price', '_sl_price', '_trail_price',
+        'total_fees', 'stop_loss_count', 'take_profit_count',
+        '_buy_count', '_win_count', '_loss_count', '_recent',
+        '_fee_rate', '_slip_buy', '_slip_sell',
+        'monitor', 'params', 'log_file', '_log_fh', 'price_precision', 'notifier', '_notify_pool',
+        'start_time', '_next_report_ts',
+    )
+
     def __init__(
         self,
         symbol: str = 'BTCUSDT',
@@ -60,6 +119,7 @@ class PaperTrader:
         self.position = 0.0  # 持仓数量
         self.entry_price = 0.0
         self.trades = []
+        self._recent = deque(maxlen=5)  # 最近交易（报告用）
 
         # 手续费和滑点配置
         self.enable_fees = enable_fees
@@ -76,10 +136,25 @@ class PaperTrader:
         self.trailing_stop_rate = 0.03  # 移动止损 3%
         self.highest_price = 0.0        # 持仓期间最高价
 
+        # 持仓期间的止盈/止损/移动止损价位（开仓时计算）
+        self._tp_price = 0.0
+        self._sl_price = 0.0
+        self._trail_price = 0.0
+
         # 统计数据
         self.total_fees = 0.0
         self.stop_loss_count = 0
         self.take_profit_count = 0
+        self._buy_count = 0
+        self._win_count = 0
+        self._loss_count = 0
+
+        # 缓存手续费率与滑点乘数
+        self._update_cost_cache()
+
+        # 预热止盈止损函数，JIT编译不占用第一次检查（AOT版本无需预热）
+        if NUMBA_AVAILABLE and not PT_AOT_AVAILABLE:
+            check_stops(1.0, 1.0, 1.0, 1.1, 0.95, 0.97, 0.03, True, True)
 
         # 数据监控器
         self.monitor = LiveDataMonitor(symbol, market_type, exchange)
@@ -91,18 +166,29 @@ class PaperTrader:
             from tools.crypto_config import DEFAULT_STRATEGY_PARAMS
             self.params = DEFAULT_STRATEGY_PARAMS
 
-        # 交易记录文件
-        self.log_file = Path(f'paper_trading_{symbol}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+        # 交易记录文件（NDJSON：首行元数据，每笔交易追加一行，结束时追加汇总行）
+        self.log_file = Path(f'paper_trading_{symbol}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.jsonl')
+        self._log_fh = open(self.log_file, 'ab')
+        self._append_log({
+            'type': 'header',
+            'symbol': symbol,
+            'market_type': market_type,
+            'exchange': exchange,
+            'initial_capital': initial_capital,
+            'created_at': datetime.now().isoformat(),
+        })
 
         # 价格精度
         self.price_precision = get_symbol_precision(symbol)
 
         # 通知器
         self.notifier = Notifier()
+        # 通知在后台单线程中按顺序发送，网络卡顿不阻塞交易循环
+        self._notify_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notify')
 
         # 运行时间记录
         self.start_time = None
-        self.last_report_time = None
+        self._next_report_ts = None  # 下次发送24小时报告的 time.monotonic() 时刻
 
         logger.info(f"✓ 模拟交易初始化: {symbol} ({market_type}) - {exchange.upper()}")
         logger.info(f"  初始资金: ${initial_capital:,.2f}")
@@ -117,53 +203,31 @@ class PaperTrader:
             return 0.0
         return self.fee_rate_futures if self.market_type == 'futures' else self.fee_rate_spot
 
-    def _apply_slippage(self, price: float, is_buy: bool) -> float:
-        """应用滑点"""
-        if not self.enable_slippage:
-            return price
+    def _update_cost_cache(self):
+        """缓存手续费率和滑点乘数（修改费率、滑点参数后需重新调用，run() 开始时会自动调用）"""
+        self._fee_rate = self._get_fee_rate()
 
         # 买入时价格上涨，卖出时价格下跌
-        if is_buy:
-            return price * (1 + self.slippage_rate)
-        else:
-            return price * (1 - self.slippage_rate)
+        self._slip_buy = 1 + self.slippage_rate if self.enable_slippage else 1.0
+        self._slip_sell = 1 - self.slippage_rate if self.enable_slippage else 1.0
 
-    def _check_stop_conditions(self, current_price: float) -> tuple:
+    def _check_stop_conditions(self, current_price: float) -> int:
         """
-        检查止盈止损条件
+        检查止盈止损条件（与开仓时计算好的价位直接比较）
 
         Returns:
-            (take_profit_triggered, stop_loss_triggered)
+            触发标志位: _STOP_TP(1)=止盈, _STOP_SL(2)=止损, 0=未触发
         """
         if self.position == 0:
-            return False, False
-
-        # 更新最高价
-        if current_price > self.highest_price:
-            self.highest_price = current_price
-
-        # 计算当前盈亏比率
-        pnl_rate = (current_price - self.entry_price) / self.entry_price
+            return 0
 
-        # 检查止盈
-        take_profit_triggered = False
-        if self.enable_take_profit and pnl_rate >= self.take_profit_rate:
-            take_profit_triggered = True
+        take_profit_triggered, stop_loss_triggered, self.highest_price, self._trail_price = check_stops(
+            float(current_price), self.entry_price, self.highest_price,
+            self._tp_price, self._sl_price, self._trail_price, self.trailing_stop_rate,
+            self.enable_take_profit, self.enable_stop_loss
+        )
 
-        # 检查止损
-        stop_loss_triggered = False
-        if self.enable_stop_loss:
-            # 固定止损
-            if pnl_rate <= -self.stop_loss_rate:
-                stop_loss_triggered = True
-
-            # 移动止损（从最高点回撤）
-            if self.highest_price > self.entry_price:
-                drawdown_from_high = (self.highest_price - current_price) / self.highest_price
-                if drawdown_from_high >= self.trailing_stop_rate:
-                    stop_loss_triggered = True
-
-        return take_profit_triggered, stop_loss_triggered
+        return (_STOP_TP if take_profit_triggered else 0) | (_STOP_SL if stop_loss_triggered else 0)
 
     def buy(self, price: float, reason: str = ""):
         """模拟买入"""
@@ -172,11 +236,10 @@ class PaperTrader:
             return False
 
         # 应用滑点
-        actual_price = self._apply_slippage(price, is_buy=True)
+        actual_price = price * self._slip_buy
 
         # 计算手续费
-        fee_rate = self._get_fee_rate()
-        fee = self.capital * fee_rate
+        fee = self.capital * self._fee_rate
         self.total_fees += fee
 
         # 扣除手续费后的可用资金
@@ -187,8 +250,13 @@ class PaperTrader:
         self.entry_price = actual_price
         self.highest_price = actual_price  # 初始化最高价
 
+        # 止盈止损价位
+        self._tp_price = actual_price * (1 + self.take_profit_rate)
+        self._sl_price = actual_price * (1 - self.stop_loss_rate)
+        self._trail_price = actual_price * (1 - self.trailing_stop_rate)
+
         trade = {
-            'time': datetime.now().isoformat(),
+            'time_ns': time.time_ns(),
             'action': 'BUY',
             'price': price,
             'actual_price': actual_price,
@@ -199,15 +267,19 @@ class PaperTrader:
             'reason': reason
         }
         self.trades.append(trade)
-
-        price_str = format_price(actual_price, self.price_precision)
-        amount_str = format_amount(self.position)
-        logger.info(f"✅ 模拟买入: ${price_str} x {amount_str}")
+        self._recent.append(trade)
+        self._append_log(_trade_for_log(trade))
+        self._buy_count += 1
+
+        # 参数由loguru在输出时才格式化，INFO被过滤时跳过价格格式化与字符串拼接
+        logger.opt(lazy=True).info("✅ 模拟买入: ${} x {}",
+                                   lambda: format_price(actual_price, self.price_precision),
+                                   lambda: format_amount(self.position))
         if self.enable_slippage:
-            logger.info(f"   滑点: ${actual_price - price:.2f}")
+            logger.info("   滑点: ${:.2f}", actual_price - price)
         if self.enable_fees:
-            logger.info(f"   手续费: ${fee:.2f}")
-        logger.info(f"   原因: {reason}")
+            logger.info("   手续费: ${:.2f}", fee)
+        logger.info("   原因: {}", reason)
 
         return True
 
@@ -218,14 +290,13 @@ class PaperTrader:
             return False
 
         # 应用滑点
-        actual_price = self._apply_slippage(price, is_buy=False)
+        actual_price = price * self._slip_sell
 
         # 计算卖出金额
         sell_amount = self.position * actual_price
 
         # 计算手续费
-        fee_rate = self._get_fee_rate()
-        fee = sell_amount * fee_rate
+        fee = sell_amount * self._fee_rate
         self.total_fees += fee
 
         # 扣除手续费后的实际收入
@@ -236,7 +307,7 @@ class PaperTrader:
         pnl_amount = self.capital - self.trades[-1]['capital_before']
 
         trade = {
-            'time': datetime.now().isoformat(),
+            'time_ns': time.time_ns(),
             'action': 'SELL',
             'price': price,
             'actual_price': actual_price,
@@ -249,17 +320,22 @@ class PaperTrader:
             'reason': reason
         }
         self.trades.append(trade)
-
-        price_str = format_price(actual_price, self.price_precision)
-        amount_str = format_amount(self.position)
-        logger.info(f"✅ 模拟卖出: ${price_str} x {amount_str}")
+        self._recent.append(trade)
+        self._append_log(_trade_for_log(trade))
+        self._win_count += pnl > 0
+        self._loss_count += pnl < 0
+
+        # 参数由loguru在输出时才格式化，INFO被过滤时跳过价格格式化与字符串拼接
+        logger.opt(lazy=True).info("✅ 模拟卖出: ${} x {}",
+                                   lambda: format_price(actual_price, self.price_precision),
+                                   lambda: format_amount(self.position))
         if self.enable_slippage:
-            logger.info(f"   滑点: ${price - actual_price:.2f}")
+            logger.info("   滑点: ${:.2f}", price - actual_price)
         if self.enable_fees:
-            logger.info(f"   手续费: ${fee:.2f}")
-        logger.info(f"   盈亏: {pnl*100:+.2f}% (${pnl_amount:+,.2f})")
-        logger.info(f"   资金: ${self.capital:,.2f}")
-        logger.info(f"   原因: {reason}")
+            logger.info("   手续费: ${:.2f}", fee)
+        logger.info("   盈亏: {:+.2f}% (${:+,.2f})", pnl * 100, pnl_amount)
+        logger.info("   资金: ${:,.2f}", self.capital)
+        logger.info("   原因: {}", reason)
 
         self.position = 0.0
         self.entry_price = 0.0
@@ -272,17 +348,15 @@ class PaperTrader:
         if not self.trades:
             return None
 
-        buy_count = len([t for t in self.trades if t['action'] == 'BUY'])
+        # 计数在 buy()/sell() 中增量维护，无需遍历交易记录
+        buy_count = self._buy_count
         return_pct = (self.capital - self.initial_capital) / self.initial_capital * 100
 
-        wins = [t for t in self.trades if 'pnl' in t and t['pnl'] > 0]
-        losses = [t for t in self.trades if 'pnl' in t and t['pnl'] < 0]
-
         return {
             'total_trades': buy_count,
-            'wins': len(wins),
-            'losses': len(losses),
-            'win_rate': len(wins) / max(buy_count, 1) * 100,
+            'wins': self._win_count,
+            'losses': self._loss_count,
+            'win_rate': self._win_count / max(buy_count, 1) * 100,
             'return_pct': return_pct,
             'initial_capital': self.initial_capital,
             'final_capital': self.capital,
@@ -316,7 +390,7 @@ class PaperTrader:
         price_str = f"${current_price:.4f}" if current_price else "获取失败"
 
         # 基本信息
-        report = f"""
+        header = f"""
 交易对: {self.symbol}
 市场类型: {'现货' if self.market_type == 'spot' else '合约'}
 交易所: {self.exchange_name.upper()}
@@ -330,7 +404,7 @@ class PaperTrader:
             perf = self.get_performance()
             profit_loss = perf['final_capital'] - perf['initial_capital']
 
-            report += f"""
+            stats = f"""
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📊 交易统计
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -349,7 +423,7 @@ class PaperTrader:
 止损次数: {perf['stop_loss_count']}
 """
         else:
-            report += f"""
+            stats = f"""
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📊 交易统计
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -359,38 +433,50 @@ class PaperTrader:
 暂无交易记录
 """
 
-        # 最近交易
-        if self.trades:
-            recent_trades = self.trades[-5:]  # 最近5笔交易
-            report += "\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            report += "📝 最近交易\n"
-            report += "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            for trade in recent_trades:
-                time_str = trade['time'][:19]  # 只取日期和时间部分
-                action = trade['action']
+        # 最近交易（逐行收集后一次拼接）
+        recent_lines = []
+        if self._recent:
+            recent_lines.append("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
+                                "📝 最近交易\n"
+                                "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
+            for trade in self._recent:  # 最近5笔交易
+                time_str = _fmt_ts(trade['time_ns'])
                 price = trade['actual_price']
 
-                if action == 'BUY':
-                    report += f"{time_str} | 买入 @ ${price:.4f}\n"
+                if trade['action'] == 'BUY':
+                    recent_lines.append(f"{time_str} | 买入 @ ${price:.4f}\n")
                 else:
                     pnl = trade.get('pnl', 0) * 100
-                    report += f"{time_str} | 卖出 @ ${price:.4f} | 盈亏: {pnl:+.2f}%\n"
+                    recent_lines.append(f"{time_str} | 卖出 @ ${price:.4f} | 盈亏: {pnl:+.2f}%\n")
+
+        return ''.join([header, stats, ''.join(recent_lines)])
 
-        return report
+    def _send_async(self, title: str, message: str, level: str = 'info'):
+        """提交通知到后台线程发送，立即返回"""
+        self._notify_pool.submit(self.notifier.send, title, message, level)
+
+    def _append_log(self, record: dict):
+        """向交易记录文件追加一行并立即落盘（异常退出也不丢失已成交记录）"""
+        self._log_fh.write(_json_line(record))
+        self._log_fh.flush()
 
     def save_log(self):
-        """保存交易记录"""
-        log_data = {
-            'symbol': self.symbol,
-            'market_type': self.market_type,
-            'start_time': self.trades[0]['time'] if self.trades else None,
+        """
+        结束交易记录：追加汇总行并关闭文件
+
+        交易已在成交时逐行写入，此处无需重新序列化全部记录。
+        读取方式: [json.loads(line) for line in open(log_file, encoding='utf-8')]
+        """
+        if self._log_fh.closed:
+            return
+
+        self._append_log({
+            'type': 'summary',
+            'start_time': self.start_time.isoformat() if self.start_time else None,
             'end_time': datetime.now().isoformat(),
             'performance': self.get_performance(),
-            'trades': self.trades
-        }
-
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            json.dump(log_data, f, indent=2, ensure_ascii=False)
+        })
+        self._log_fh.close()
 
         logger.info(f"交易记录已保存: {self.log_file}")
 
@@ -406,9 +492,12 @@ class PaperTrader:
         logger.info(f"K线周期: {interval}, 检查间隔: {check_interval}秒")
         logger.info("按 Ctrl+C 停止\n")
 
+        # 参数可能在初始化后被修改，开始前刷新缓存
+        self._update_cost_cache()
+
         # 记录开始时间
         self.start_time = datetime.now()
-        self.last_report_time = self.start_time
+        self._next_report_ts = time.monotonic() + _REPORT_INTERVAL
 
         # 发送启动通知
         start_msg = f"""
@@ -424,133 +513,148 @@ K线周期: {interval}
 止损: {'启用' if self.enable_stop_loss else '禁用'}
 止盈: {'启用' if self.enable_take_profit else '禁用'}
 """
-        self.notifier.send("🚀 模拟交易已启动", start_msg, 'info')
+        self._send_async("🚀 模拟交易已启动", start_msg, 'info')
 
         try:
-            while True:
-                # 获取当前价格
-                price = self.monitor.get_current_price()
-
-                # 计算信号
-                signals = self.monitor.calculate_live_signals(interval)
-
-                if signals and price:
-                    # 检查止盈止损
-                    if self.position > 0:
-                        take_profit_triggered, stop_loss_triggered = self._check_stop_conditions(price)
-
-                        if take_profit_triggered:
-                            self.take_profit_count += 1
-                            self.sell(price, f"止盈触发 (盈利{self.take_profit_rate*100:.1f}%)")
-                            continue
-
-                        if stop_loss_triggered:
-                            self.stop_loss_count += 1
-                            pnl = (price - self.entry_price) / self.entry_price
-                            if pnl <= -self.stop_loss_rate:
-                                self.sell(price, f"固定止损触发 (亏损{abs(pnl)*100:.1f}%)")
-                            else:
-                                drawdown = (self.highest_price - price) / self.highest_price
-                                self.sell(price, f"移动止损触发 (从高点回撤{drawdown*100:.1f}%)")
-                            continue
-
-                    # 检查交易信号
-                    action = self.monitor.check_trading_signal(signals)
-
-                    # 显示状态
-                    price_str = format_price(price, self.price_precision)
-                    position_str = format_amount(self.position) if self.position > 0 else '无'
-                    print(f"\n{'='*60}")
-                    print(f"时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                    print(f"价格: ${price_str}")
-                    print(f"持仓: {position_str if self.position == 0 else '有 (' + position_str + ')'}")
-                    print(f"资金: ${self.capital:,.2f}")
-
-                    # 如果有持仓，显示盈亏和止盈止损状态
-                    if self.position > 0:
+            asyncio.run(self._run_async(interval, check_interval))
+        except KeyboardInterrupt:
+            self._on_stop()
+
+    async def _run_async(self, interval: str, check_interval: int):
+        """模拟交易主循环（在事件循环中运行，Ctrl+C 时由 run() 收尾）"""
+        while True:
+            now = datetime.now()
+
+            # 计算信号（网络请求在线程中执行），最新K线收盘价即当前价格，无需再单独请求行情
+            signals = await asyncio.to_thread(self.monitor.calculate_live_signals, interval)
+            price = signals['close'] if signals else None
+
+            if price:
+                # 检查止盈止损
+                if self.position > 0:
+                    stop_flags = self._check_stop_conditions(price)
+
+                    if stop_flags & _STOP_TP:
+                        self.take_profit_count += 1
+                        self.sell(price, f"止盈触发 (盈利{self.take_profit_rate*100:.1f}%)")
+                        continue
+
+                    if stop_flags & _STOP_SL:
+                        self.stop_loss_count += 1
                         pnl = (price - self.entry_price) / self.entry_price
-                        print(f"浮动盈亏: {pnl*100:+.2f}%")
-                        print(f"最高价: ${format_price(self.highest_price, self.price_precision)}")
-                        if self.enable_take_profit:
-                            print(f"止盈线: ${format_price(self.entry_price * (1 + self.take_profit_rate), self.price_precision)} (+{self.take_profit_rate*100:.1f}%)")
-                        if self.enable_stop_loss:
-                            print(f"止损线: ${format_price(self.entry_price * (1 - self.stop_loss_rate), self.price_precision)} (-{self.stop_loss_rate*100:.1f}%)")
-
-                    # 执行交易
-                    if action == 'BUY' and self.position == 0:
-                        reason = f"HA={signals['HA']}, WD3={signals['WD3']}"
-                        self.buy(price, reason)
-
-                    elif action == 'SELL' and self.position > 0:
-                        reason = f"QJ={signals['QJ']}, WD3={signals['WD3']}"
-                        self.sell(price, reason)
-
-                    # 显示收益
-                    if self.trades:
-                        perf = self.get_performance()
-                        print(f"\n📊 当前表现:")
-                        print(f"   交易次数: {perf['total_trades']}")
-                        print(f"   胜率: {perf['win_rate']:.1f}%")
-                        print(f"   总收益: {perf['return_pct']:+.2f}%")
-                        print(f"   总手续费: ${perf['total_fees']:,.2f} ({perf['fee_rate_pct']:.2f}%)")
-                        if self.enable_stop_loss:
-                            print(f"   止损次数: {perf['stop_loss_count']}")
-                        if self.enable_take_profit:
-                            print(f"   止盈次数: {perf['take_profit_count']}")
-
-                    print(f"{'='*60}")
-
-                # 检查是否需要发送24小时报告
-                now = datetime.now()
-                if self.last_report_time:
-                    time_since_last_report = now - self.last_report_time
-                    if time_since_last_report >= timedelta(hours=24):
-                        # 生成并发送24小时报告
-                        report = self.generate_report('daily')
-                        self.notifier.send("📊 24小时交易报告", report, 'info')
-                        self.last_report_time = now
-                        logger.info("✓ 已发送24小时报告")
-
-                # 等待
-                time.sleep(check_interval)
+                        if pnl <= -self.stop_loss_rate:
+                            self.sell(price, f"固定止损触发 (亏损{abs(pnl)*100:.1f}%)")
+                        else:
+                            drawdown = (self.highest_price - price) / self.highest_price
+                            self.sell(price, f"移动止损触发 (从高点回撤{drawdown*100:.1f}%)")
+                        continue
+
+                # 检查交易信号
+                action = self.monitor.check_trading_signal(
+                    signals['HA'], signals['QS'], signals['QJ'], signals['WD3']
+                )
+
+                # 显示状态（拼接后一次性输出）
+                price_str = format_price(price, self.price_precision)
+                position_str = format_amount(self.position) if self.position > 0 else '无'
+                lines = [
+                    f"\n{'='*60}",
+                    f"时间: {now.strftime('%Y-%m-%d %H:%M:%S')}",
+                    f"价格: ${price_str}",
+                    f"持仓: {position_str if self.position == 0 else '有 (' + position_str + ')'}",
+                    f"资金: ${self.capital:,.2f}",
+                ]
+
+                # 如果有持仓，显示盈亏和止盈止损状态
+                if self.position > 0:
+                    pnl = (price - self.entry_price) / self.entry_price
+                    lines.append(f"浮动盈亏: {pnl*100:+.2f}%")
+                    lines.append(f"最高价: ${format_price(self.highest_price, self.price_precision)}")
+                    if self.enable_take_profit:
+                        lines.append(f"止盈线: ${format_price(self._tp_price, self.price_precision)} (+{self.take_profit_rate*100:.1f}%)")
+                    if self.enable_stop_loss:
+                        lines.append(f"止损线: ${format_price(self._sl_price, self.price_precision)} (-{self.stop_loss_rate*100:.1f}%)")
+
+                sys.stdout.write('\n'.join(lines) + '\n')
+
+                # 执行交易
+                if action == 'BUY' and self.position == 0:
+                    reason = f"HA={signals['HA']}, WD3={signals['WD3']}"
+                    self.buy(price, reason)
+
+                elif action == 'SELL' and self.position > 0:
+                    reason = f"QJ={signals['QJ']}, WD3={signals['WD3']}"
+                    self.sell(price, reason)
+
+                # 显示收益（交易执行之后的统计）
+                lines = []
+                if self.trades:
+                    perf = self.get_performance()
+                    lines.append(f"\n📊 当前表现:")
+                    lines.append(f"   交易次数: {perf['total_trades']}")
+                    lines.append(f"   胜率: {perf['win_rate']:.1f}%")
+                    lines.append(f"   总收益: {perf['return_pct']:+.2f}%")
+                    lines.append(f"   总手续费: ${perf['total_fees']:,.2f} ({perf['fee_rate_pct']:.2f}%)")
+                    if self.enable_stop_loss:
+                        lines.append(f"   止损次数: {perf['stop_loss_count']}")
+                    if self.enable_take_profit:
+                        lines.append(f"   止盈次数: {perf['take_profit_count']}")
+
+                lines.append(f"{'='*60}")
+                sys.stdout.write('\n'.join(lines) + '\n')
+                sys.stdout.flush()
+
+            # 检查是否需要发送24小时报告
+            if time.monotonic() >= self._next_report_ts:
+                # 生成并发送24小时报告
+                report = self.generate_report('daily')
+                self._send_async("📊 24小时交易报告", report, 'info')
+                self._next_report_ts += _REPORT_INTERVAL
+                logger.info("✓ 已发送24小时报告")
+
+            # 等待
+            await asyncio.sleep(check_interval)
+
+    def _on_stop(self):
+        """停止后平仓、输出统计、保存记录并发送最终报告"""
+        logger.info("\n\n模拟交易已停止")
+
+        # 如果有持仓，平仓
+        if self.position > 0:
+            price = self.monitor.get_current_price()
+            if price:
+                self.sell(price, "手动停止")
 
-        except KeyboardInterrupt:
-            logger.info("\n\n模拟交易已停止")
-
-            # 如果有持仓，平仓
-            if self.position > 0:
-                price = self.monitor.get_current_price()
-                if price:
-                    self.sell(price, "手动停止")
-
-            # 显示最终统计
-            if self.trades:
-                print("\n" + "="*80)
-                print("最终交易统计")
-                print("="*80)
-
-                perf = self.get_performance()
-                print(f"初始资金:    ${perf['initial_capital']:,.2f}")
-                print(f"最终资金:    ${perf['final_capital']:,.2f}")
-                print(f"总收益率:    {perf['return_pct']:+.2f}%")
-                print(f"总手续费:    ${perf['total_fees']:,.2f} ({perf['fee_rate_pct']:.2f}%)")
-                print(f"交易次数:    {perf['total_trades']}")
-                print(f"盈利次数:    {perf['wins']}")
-                print(f"亏损次数:    {perf['losses']}")
-                print(f"胜率:        {perf['win_rate']:.1f}%")
-                if self.enable_stop_loss:
-                    print(f"止损次数:    {perf['stop_loss_count']}")
-                if self.enable_take_profit:
-                    print(f"止盈次数:    {perf['take_profit_count']}")
-                print("="*80)
-
-            # 保存记录
-            self.save_log()
-
-            # 发送最终报告通知
-            final_report = self.generate_report('final')
-            self.notifier.send("🏁 模拟交易已结束 - 最终报告", final_report, 'info')
-            logger.info("✓ 已发送最终报告")
+        # 显示最终统计
+        if self.trades:
+            print("\n" + "="*80)
+            print("最终交易统计")
+            print("="*80)
+
+            perf = self.get_performance()
+            print(f"初始资金:    ${perf['initial_capital']:,.2f}")
+            print(f"最终资金:    ${perf['final_capital']:,.2f}")
+            print(f"总收益率:    {perf['return_pct']:+.2f}%")
+            print(f"总手续费:    ${perf['total_fees']:,.2f} ({perf['fee_rate_pct']:.2f}%)")
+            print(f"交易次数:    {perf['total_trades']}")
+            print(f"盈利次数:    {perf['wins']}")
+            print(f"亏损次数:    {perf['losses']}")
+            print(f"胜率:        {perf['win_rate']:.1f}%")
+            if self.enable_stop_loss:
+                print(f"止损次数:    {perf['stop_loss_count']}")
+            if self.enable_take_profit:
+                print(f"止盈次数:    {perf['take_profit_count']}")
+            print("="*80)
+
+        # 保存记录
+        self.save_log()
+
+        # 发送最终报告通知
+        final_report = self.generate_report('final')
+        self._send_async("🏁 模拟交易已结束 - 最终报告", final_report, 'info')
+        # 等待后台队列中的通知全部发出
+        self._notify_pool.shutdown(wait=True)
+        logger.info("✓ 已发送最终报告")
 
 
 def main():
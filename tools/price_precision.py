@@ -4,6 +4,19 @@
 根据币种价格自动调整显示精度
 """
 
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+
+# 价格分档阈值（升序）与对应精度，PRECISIONS[i] 适用于第i档
+_PRICE_THRESHOLDS = (0.01, 1, 1000)
+_PRICE_PRECISIONS = (
+    8,  # 极低价币（SHIB等）：0.00001234
+    6,  # 低价币：0.123456
+    4,  # ETH等中价币：3,456.7890
+    2,  # BTC等高价币：68,906.70
+)
+
 
 def get_price_precision(price: float) -> int:
     """
@@ -15,14 +28,19 @@ def get_price_precision(price: float) -> int:
     Returns:
         小数位数
     """
-    if price >= 1000:
-        return 2  # BTC等高价币：68,906.70
-    elif price >= 1:
-        return 4  # ETH等中价币：3,456.7890
-    elif price >= 0.01:
-        return 6  # 低价币：0.123456
-    else:
-        return 8  # 极低价币（SHIB等）：0.00001234
+    return _PRICE_PRECISIONS[bisect_right(_PRICE_THRESHOLDS, price)]
+
+
+@lru_cache(maxsize=2048)
+def _format_price_cached(price: float, precision: int) -> str:
+    """按精度格式化价格（带千分位），轮询中价格常重复，结果缓存"""
+    return f"{price:,.{precision}f}"
+
+
+@lru_cache(maxsize=2048)
+def _format_amount_cached(amount: float, precision: int) -> str:
+    """按精度格式化数量，结果缓存"""
+    return f"{amount:.{precision}f}"
 
 
 def format_price(price: float, precision: int = None) -> str:
@@ -39,7 +57,7 @@ def format_price(price: float, precision: int = None) -> str:
     if precision is None:
         precision = get_price_precision(price)
 
-    return f"{price:,.{precision}f}"
+    return _format_price_cached(price, precision)
 
 
 def format_amount(amount: float, precision: int = 6) -> str:
@@ -53,7 +71,7 @@ def format_amount(amount: float, precision: int = 6) -> str:
     Returns:
         格式化后的数量字符串
     """
-    return f"{amount:.{precision}f}"
+    return _format_amount_cached(amount, precision)
 
 
 def format_percentage(pct: float, precision: int = 2) -> str:
@@ -70,8 +88,8 @@ def format_percentage(pct: float, precision: int = 2) -> str:
     return f"{pct:+.{precision}f}%"
 
 
-# 预定义常见币种精度
-SYMBOL_PRECISION = {
+# 预定义常见币种精度（键做字符串驻留，查找时可直接按对象身份命中）
+SYMBOL_PRECISION = {sys.intern(k): v for k, v in {
     # 高价币 - 2位小数
     'BTCUSDT': 2,
     'BCHUSDT': 2,
@@ -95,7 +113,7 @@ SYMBOL_PRECISION = {
     'PEPEUSDT': 8,
     '1000PEPEUSDT': 6,
     '1000SHIBUSDT': 6,
-}
+}.items()}
 
 
 def get_symbol_precision(symbol: str, default_price: float = None) -> int:
@@ -110,8 +128,9 @@ def get_symbol_precision(symbol: str, default_price: float = None) -> int:
         小数位数
     """
     # 优先使用预定义精度
-    if symbol in SYMBOL_PRECISION:
-        return SYMBOL_PRECISION[symbol]
+    precision = SYMBOL_PRECISION.get(symbol)
+    if precision is not None:
+        return precision
 
     # 根据价格自动判断
     if default_price is not None:
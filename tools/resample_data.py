@@ -9,23 +9,190 @@
 3. 保持数据完整性
 """
 
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import numpy as np
 import pandas as pd
-from typing import Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
+from pandas.tseries.frequencies import to_offset
+from typing import Dict, Optional
 from loguru import logger
 import argparse
 
+# 可选的外部执行引擎（多线程、可溢写磁盘），未安装时回退到pandas/numpy实现
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+from tools._njit import NUMBA_AVAILABLE
+from tools._resample_numba import fuse_ohlcv
+from tools.data_downloader import write_csv
+
+ENGINES = ('pandas', 'numba', 'duckdb', 'polars')
+
+
+_DAY_NS = 86_400 * 1_000_000_000
+
+# Parquet输出默认设置：Snappy压缩，约100万行一个行组（利于按列/按统计信息裁剪读取）
+DEFAULT_COMPRESSION = 'snappy'
+DEFAULT_ROW_GROUP_SIZE = 1_048_576
+
+# 聚合方式 -> numpy 按桶归约（first/last 由桶边界下标直接取值）
+_REDUCERS = {
+    'sum': np.add.reduceat,
+    'max': np.maximum.reduceat,
+    'min': np.minimum.reduceat,
+}
+
+
+def _interval_nanos(target_interval: str) -> Optional[int]:
+    """固定长度周期（秒/分/时/天）的纳秒数，月/周等非固定周期返回None"""
+    try:
+        return to_offset(target_interval).nanos
+    except ValueError:
+        return None
+
+
+def _resample_reduceat(
+    ts: np.ndarray,
+    columns: Dict[str, np.ndarray],
+    agg_dict: Dict[str, str],
+    bin_ns: int,
+    origin_ns: int,
+    fused: bool = False
+) -> Dict[str, np.ndarray]:
+    """
+    按固定周期对已排序的K线做一次遍历聚合（与 pandas resample(...).agg 结果一致）
+
+    Args:
+        ts: 升序的 int64 纳秒时间戳
+        columns: 列名 -> 与 ts 等长的数组
+        agg_dict: 列名 -> 'first'/'last'/'max'/'min'/'sum'
+        bin_ns: 周期长度（纳秒）
+        origin_ns: 分桶起点（纳秒），桶标签为 origin_ns + k * bin_ns
+        fused: 使用numba融合内核（所有列一次遍历、按周期并行），需安装numba
+
+    Returns:
+        {'_bucket': 桶起始时间(int64纳秒), 列名: 聚合结果}，只包含有数据的桶
+    """
+    if fused:
+        return _resample_fused(ts, columns, agg_dict, bin_ns, origin_ns)
+
+    bucket = (ts - origin_ns) // bin_ns
+    # 桶编号变化处即新桶起点
+    starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+    ends = np.r_[starts[1:] - 1, len(ts) - 1]
+
+    out = {'_bucket': origin_ns + bucket[starts] * bin_ns}
+    for col, how in agg_dict.items():
+        values = columns[col]
+        if how == 'first':
+            out[col] = values[starts]
+        elif how == 'last':
+            out[col] = values[ends]
+        else:
+            out[col] = _REDUCERS[how](values, starts)
+    return out
+
+
+def _resample_fused(
+    ts: np.ndarray,
+    columns: Dict[str, np.ndarray],
+    agg_dict: Dict[str, str],
+    bin_ns: int,
+    origin_ns: int
+) -> Dict[str, np.ndarray]:
+    """_resample_reduceat 的numba融合版本（开高低收之外的列均为求和列）"""
+    sum_cols = [col for col, how in agg_dict.items() if how == 'sum']
+    sums = np.empty((len(ts), len(sum_cols)))
+    for q, col in enumerate(sum_cols):
+        sums[:, q] = columns[col]
+
+    ohlc = [np.ascontiguousarray(columns[col], dtype=np.float64) for col in ('open', 'high', 'low', 'close')]
+    bucket, o, h, l, c, out_sums = fuse_ohlcv(ts, *ohlc, sums, bin_ns, origin_ns)
+
+    out = {'_bucket': bucket}
+    for col, values in zip(('open', 'high', 'low', 'close'), (o, h, l, c)):
+        out[col] = values.astype(columns[col].dtype, copy=False)
+    for q, col in enumerate(sum_cols):
+        out[col] = out_sums[:, q].astype(columns[col].dtype)
+    return out
+
+
+def _use_fused(engine: str) -> bool:
+    """engine='numba' 且已安装numba时使用融合内核"""
+    if engine != 'numba':
+        return False
+    if not NUMBA_AVAILABLE:
+        logger.warning("未安装numba，改用numpy实现")
+        return False
+    return True
+
+
+def _build_agg_dict(column_names) -> Dict[str, str]:
+    """根据已有列生成聚合规则"""
+    agg_dict = {
+        'open': 'first',    # 开盘价：第一个
+        'high': 'max',      # 最高价：最大值
+        'low': 'min',       # 最低价：最小值
+        'close': 'last',    # 收盘价：最后一个
+        'volume': 'sum',    # 成交量：求和
+    }
+
+    # 如果有额外列，也聚合
+    if 'quote_volume' in column_names:
+        agg_dict['quote_volume'] = 'sum'  # USDT成交额
+    if 'trades' in column_names:
+        agg_dict['trades'] = 'sum'  # 成交笔数
+
+    return agg_dict
+
+
+def _has_nan(columns: Dict[str, np.ndarray]) -> bool:
+    """浮点列中是否存在NaN"""
+    return any(
+        np.issubdtype(v.dtype, np.floating) and np.isnan(v).any()
+        for v in columns.values()
+    )
+
+
+def _reduceat_frame(out: Dict[str, np.ndarray], time_column: str, agg_dict: Dict[str, str]) -> pd.DataFrame:
+    """_resample_reduceat 的结果转为DataFrame（时间列在前）"""
+    out[time_column] = out.pop('_bucket').astype('datetime64[ns]')
+    return pd.DataFrame(out, columns=[time_column, *agg_dict])
+
+
+def _downcast_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """价格/成交量转为float32、成交笔数转为int32（原地修改并返回）"""
+    for col in ('open', 'high', 'low', 'close', 'volume', 'quote_volume'):
+        if col in df.columns:
+            df[col] = df[col].astype('float32')
+    if 'trades' in df.columns:
+        df['trades'] = df['trades'].astype('int32')
+    return df
+
 
 def resample_klines(
     df: pd.DataFrame,
     target_interval: str,
-    time_column: str = 'stime'
+    time_column: str = 'stime',
+    downcast: bool = False,
+    engine: str = 'pandas'
 ) -> pd.DataFrame:
     """
     重采样K线数据
@@ -34,6 +201,8 @@ def resample_klines(
         df: 原始K线数据(DataFrame)
         target_interval: 目标周期,如'15S','30S','1T'(1分钟),'5T'(5分钟)
         time_column: 时间列名称
+        downcast: 是否将结果数值列降为float32/int32（体积减半，价格约保留7位有效数字）
+        engine: 'numba' 时固定周期聚合使用numba融合内核，其余取值使用numpy实现
 
     Returns:
         重采样后的DataFrame
@@ -48,36 +217,52 @@ def resample_klines(
         logger.warning("输入数据为空")
         return df
 
-    # 确保时间列是datetime类型
-    if not pd.api.types.is_datetime64_any_dtype(df[time_column]):
-        df[time_column] = pd.to_datetime(df[time_column])
-
-    # 设置时间索引
-    df_indexed = df.set_index(time_column)
+    # 确保时间列是datetime类型（转换结果只在本函数内使用，不修改调用方的DataFrame）
+    times = df[time_column]
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        times = pd.to_datetime(times)
+        df = df.assign(**{time_column: times})
 
     # 定义聚合规则
-    agg_dict = {
-        'open': 'first',    # 开盘价：第一个
-        'high': 'max',      # 最高价：最大值
-        'low': 'min',       # 最低价：最小值
-        'close': 'last',    # 收盘价：最后一个
-        'volume': 'sum',    # 成交量：求和
-    }
+    agg_dict = _build_agg_dict(df.columns)
 
-    # 如果有额外列，也聚合
-    if 'quote_volume' in df.columns:
-        agg_dict['quote_volume'] = 'sum'  # USDT成交额
-    if 'trades' in df.columns:
-        agg_dict['trades'] = 'sum'  # 成交笔数
+    bin_ns = _interval_nanos(target_interval)
+    columns = {col: df[col].to_numpy() for col in agg_dict}
+
+    # 固定周期、无时区、无缺失值时走 numpy 单次遍历聚合；其余情况交给pandas
+    use_reduceat = (
+        bin_ns is not None
+        and times.dt.tz is None
+        and not times.isna().any()
+        and not _has_nan(columns)
+    )
 
-    # 执行重采样
-    df_resampled = df_indexed.resample(target_interval).agg(agg_dict)
+    if use_reduceat:
+        ts = times.to_numpy('datetime64[ns]').view('i8')
+
+        # 与pandas一致：乱序数据先稳定排序，分桶起点为首条数据当天0点
+        if not times.is_monotonic_increasing:
+            order = np.argsort(ts, kind='mergesort')
+            ts = ts[order]
+            columns = {col: v[order] for col, v in columns.items()}
+        origin_ns = int(ts[0]) // _DAY_NS * _DAY_NS
+
+        out = _resample_reduceat(ts, columns, agg_dict, bin_ns, origin_ns, fused=_use_fused(engine))
+        df_resampled = _reduceat_frame(out, time_column, agg_dict)
+    else:
+        # 直接按列重采样，省去 set_index 复制整表
+        df_resampled = df.resample(target_interval, on=time_column).agg(agg_dict)
+        # Arrow类型的时间列重采样后索引名会丢失，显式恢复
+        df_resampled = df_resampled.rename_axis(time_column)
 
-    # 删除空行(如果某些时间段没有数据)
-    df_resampled = df_resampled.dropna(subset=['open', 'close'])
+        # 删除空行(如果某些时间段没有数据)
+        df_resampled = df_resampled.dropna(subset=['open', 'close'])
 
-    # 重置索引,将时间列恢复为普通列
-    df_resampled = df_resampled.reset_index()
+        # 重置索引,将时间列恢复为普通列
+        df_resampled = df_resampled.reset_index()
+
+    if downcast:
+        _downcast_frame(df_resampled)
 
     logger.info(
         f"✓ 重采样完成: {len(df)} 条 → {len(df_resampled)} 条 "
@@ -87,11 +272,249 @@ def resample_klines(
     return df_resampled
 
 
+# pandas 2.0+ 读取Parquet时保留Arrow类型，省去整表转numpy的复制
+_PANDAS_VERSION = tuple(int(x) for x in pd.__version__.split('.')[:2])
+_READ_PARQUET_KWARGS = {'dtype_backend': 'pyarrow'} if _PANDAS_VERSION >= (2, 0) else {}
+
+# CSV列类型（文件中不存在的列会被忽略；时间列交给Arrow自动识别）
+_CSV_COLUMN_TYPES = {
+    'open': pa.float64(),
+    'high': pa.float64(),
+    'low': pa.float64(),
+    'close': pa.float64(),
+    'volume': pa.float64(),
+    'quote_volume': pa.float64(),
+    'trades': pa.int64(),
+}
+
+
+def _read_csv(input_path: Path) -> pd.DataFrame:
+    """用Arrow多线程按列解析CSV后转为DataFrame（比 pd.read_csv 快且峰值内存更低）"""
+    table = pacsv.read_csv(
+        input_path,
+        read_options=pacsv.ReadOptions(block_size=64 << 20),
+        convert_options=pacsv.ConvertOptions(column_types=_CSV_COLUMN_TYPES)
+    )
+    return table.to_pandas()
+
+
+def _parquet_compression(compression: Optional[str]) -> Optional[str]:
+    """'none' 表示不压缩"""
+    return None if compression in (None, 'none') else compression
+
+
+def _resample_parquet_stream(
+    input_path: Path,
+    output_path: Path,
+    target_interval: str,
+    time_column: str = 'stime',
+    batch_size: int = 1_000_000,
+    compression: Optional[str] = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    downcast: bool = False,
+    fused: bool = False
+) -> bool:
+    """
+    按行组批次流式重采样Parquet文件，内存占用与文件大小无关
+
+    每批只输出已结束的周期，最后一个（可能未结束的）周期的原始行留到下一批合并。
+
+    Args:
+        input_path: 输入Parquet文件
+        output_path: 输出Parquet文件
+        target_interval: 目标周期
+        time_column: 时间列名称
+        batch_size: 每批读取行数
+        compression: 输出压缩算法('snappy'/'zstd'/'none')
+        row_group_size: 输出行组行数（各批结果攒满一个行组再写入）
+        downcast: 是否将数值列降为float32/int32
+        fused: 使用numba融合内核聚合
+
+    Returns:
+        是否完成；数据非固定周期/含时区/含缺失值/乱序时返回False，由调用方整表处理
+    """
+    bin_ns = _interval_nanos(target_interval)
+    if bin_ns is None:
+        return False
+
+    pf = pq.ParquetFile(input_path)
+    agg_dict = _build_agg_dict(pf.schema_arrow.names)
+    read_columns = [time_column, *agg_dict]
+
+    writer = None
+    origin_ns = None
+    carry_ts = np.empty(0, np.int64)
+    carry = {}
+    pending = []  # 尚未凑满行组的输出
+    pending_rows = 0
+    rows_in = rows_out = 0
+
+    def flush(final=False):
+        nonlocal writer, pending, pending_rows, rows_out
+        n = pending_rows if final else pending_rows // row_group_size * row_group_size
+        if n == 0:
+            return
+        table = pa.concat_tables(pending)
+        if writer is None:
+            writer = pq.ParquetWriter(
+                output_path, table.schema,
+                compression=_parquet_compression(compression),
+                use_dictionary=True, write_statistics=True
+            )
+        writer.write_table(table.slice(0, n), row_group_size=row_group_size)
+        rest = table.slice(n)
+        pending = [rest] if rest.num_rows else []
+        pending_rows = rest.num_rows
+        rows_out += n
+
+    def write(ts, columns):
+        nonlocal pending_rows
+        out = _resample_reduceat(ts, columns, agg_dict, bin_ns, origin_ns, fused=fused)
+        frame = _reduceat_frame(out, time_column, agg_dict)
+        if downcast:
+            _downcast_frame(frame)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        pending.append(table)
+        pending_rows += table.num_rows
+        if pending_rows >= row_group_size:
+            flush()
+
+    try:
+        for batch in pf.iter_batches(batch_size=batch_size, columns=read_columns):
+            df = batch.to_pandas()
+            times = df[time_column]
+            if not pd.api.types.is_datetime64_any_dtype(times):
+                times = pd.to_datetime(times)
+            if times.dt.tz is not None or times.isna().any():
+                return False
+
+            columns = {col: df[col].to_numpy() for col in agg_dict}
+            if _has_nan(columns):
+                return False
+            rows_in += len(df)
+
+            # 并入上一批未结束的周期
+            ts = np.concatenate([carry_ts, times.to_numpy('datetime64[ns]').view('i8')])
+            if carry:
+                columns = {col: np.concatenate([carry[col], v]) for col, v in columns.items()}
+            if ts.size == 0:
+                continue
+            if (np.diff(ts) < 0).any():
+                return False
+
+            if origin_ns is None:
+                origin_ns = int(ts[0]) // _DAY_NS * _DAY_NS
+
+            # 最后一个周期可能跨批次，留到下一批
+            last_start = origin_ns + (int(ts[-1]) - origin_ns) // bin_ns * bin_ns
+            cut = int(np.searchsorted(ts, last_start, side='left'))
+            carry_ts = ts[cut:]
+            carry = {col: v[cut:] for col, v in columns.items()}
+
+            if cut:
+                write(ts[:cut], {col: v[:cut] for col, v in columns.items()})
+
+        if carry_ts.size:
+            write(carry_ts, carry)
+        flush(final=True)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        return False
+
+    logger.info(
+        f"✓ 重采样完成: {rows_in} 条 → {rows_out} 条 "
+        f"({target_interval}周期，流式处理)"
+    )
+    return True
+
+
+def _resample_duckdb(
+    input_path: Path,
+    output_path: Path,
+    bin_ns: int,
+    time_column: str,
+    compression: Optional[str],
+    row_group_size: int,
+    downcast: bool
+):
+    """用DuckDB扫描Parquet并按周期聚合，直接写出Parquet（多线程，内存不足时溢写磁盘）"""
+    agg_dict = _build_agg_dict(pq.read_schema(input_path).names)
+    t = f'"{time_column}"'
+    sql_aggs = {
+        'first': f'arg_min({{col}}, {t})',
+        'last': f'arg_max({{col}}, {t})',
+        'max': 'max({col})',
+        'min': 'min({col})',
+        'sum': 'sum({col})',
+    }
+    select = [f"time_bucket(INTERVAL '{bin_ns // 1000} microseconds', {t}, TIMESTAMP '1970-01-01') AS {t}"]
+    for col, how in agg_dict.items():
+        expr = sql_aggs[how].format(col=f'"{col}"')
+        if downcast:
+            expr = f"CAST({expr} AS {'INTEGER' if col == 'trades' else 'FLOAT'})"
+        elif col == 'trades':
+            expr = f"CAST({expr} AS BIGINT)"  # 整数sum默认为HUGEINT，写出时会变成浮点
+        select.append(f'{expr} AS "{col}"')
+
+    src = str(input_path).replace("'", "''")
+    dst = str(output_path).replace("'", "''")
+    codec = _parquet_compression(compression) or 'uncompressed'
+    duckdb.sql(
+        f"COPY (SELECT {', '.join(select)} FROM read_parquet('{src}') GROUP BY 1 ORDER BY 1) "
+        f"TO '{dst}' (FORMAT PARQUET, COMPRESSION {codec}, ROW_GROUP_SIZE {row_group_size})"
+    )
+
+
+def _resample_polars(
+    input_path: Path,
+    output_path: Path,
+    bin_ns: int,
+    time_column: str,
+    compression: Optional[str],
+    row_group_size: int,
+    downcast: bool
+):
+    """用Polars惰性扫描Parquet并按周期聚合（group_by_dynamic），流式写出Parquet"""
+    lf = pl.scan_parquet(input_path)
+    agg_dict = _build_agg_dict(lf.collect_schema().names())
+    pl_aggs = {
+        'first': pl.first,
+        'last': pl.last,
+        'max': pl.max,
+        'min': pl.min,
+        'sum': pl.sum,
+    }
+    aggs = []
+    for col, how in agg_dict.items():
+        expr = pl_aggs[how](col)
+        if downcast:
+            expr = expr.cast(pl.Int32 if col == 'trades' else pl.Float32)
+        aggs.append(expr)
+
+    (
+        lf.sort(time_column)
+        .group_by_dynamic(time_column, every=f'{bin_ns}ns', closed='left', label='left', start_by='window')
+        .agg(aggs)
+        .sink_parquet(
+            output_path,
+            compression=_parquet_compression(compression) or 'uncompressed',
+            row_group_size=row_group_size
+        )
+    )
+
+
 def resample_file(
     input_file: str,
     output_file: Optional[str] = None,
     target_interval: str = '15S',
-    time_column: str = 'stime'
+    time_column: str = 'stime',
+    compression: Optional[str] = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    downcast: bool = False,
+    engine: str = 'pandas'
 ) -> str:
     """
     重采样文件
@@ -101,6 +524,12 @@ def resample_file(
         output_file: 输出文件路径(可选,默认自动生成)
         target_interval: 目标周期
         time_column: 时间列名称
+        compression: Parquet输出压缩算法('snappy'/'zstd'/'none')
+        row_group_size: Parquet输出行组行数
+        downcast: 是否将数值列降为float32/int32
+        engine: 执行引擎('pandas'/'numba'/'duckdb'/'polars')；numba 使用融合聚合内核；duckdb/polars 仅用于
+            Parquet→Parquet 且固定周期，桶按1970-01-01对齐（周期能整除一天时与pandas一致），
+            时间列需为timestamp类型
 
     Returns:
         输出文件路径
@@ -110,19 +539,9 @@ def resample_file(
     if not input_path.exists():
         raise FileNotFoundError(f"文件不存在: {input_file}")
 
-    logger.info(f"读取文件: {input_path.name}")
-
-    # 读取文件
-    if input_path.suffix == '.parquet':
-        df = pd.read_parquet(input_path)
-    elif input_path.suffix == '.csv':
-        df = pd.read_csv(input_path)
-    else:
+    if input_path.suffix not in ('.parquet', '.csv'):
         raise ValueError(f"不支持的文件格式: {input_path.suffix}")
 
-    # 重采样
-    df_resampled = resample_klines(df, target_interval, time_column)
-
     # 生成输出文件名
     if output_file is None:
         # 从原文件名提取信息
@@ -140,15 +559,59 @@ def resample_file(
         output_file = str(input_path.parent / output_name)
 
     output_path = Path(output_file)
+    if output_path.suffix not in ('.parquet', '.csv'):
+        raise ValueError(f"不支持的输出格式: {output_path.suffix}")
+
+    logger.info(f"读取文件: {input_path.name}")
+
+    # 外部引擎：整个扫描+聚合+写出在引擎内完成
+    if engine in ('duckdb', 'polars'):
+        engine_impl = {'duckdb': (duckdb, _resample_duckdb), 'polars': (pl, _resample_polars)}
+        module, resample_func = engine_impl[engine]
+        bin_ns = _interval_nanos(target_interval)
+        if module is None:
+            logger.warning(f"未安装 {engine}，改用pandas引擎")
+        elif bin_ns is None or input_path.suffix != '.parquet' or output_path.suffix != '.parquet':
+            logger.warning(f"{engine} 引擎仅支持固定周期的Parquet→Parquet，改用pandas引擎")
+        else:
+            resample_func(input_path, output_path, bin_ns, time_column,
+                          compression, row_group_size, downcast)
+            logger.info(f"✓ 重采样完成 ({engine}引擎, {target_interval}周期)")
+            logger.info(f"✓ 文件已保存: {output_path}")
+            return str(output_path)
+
+    # Parquet → Parquet 按批次流式处理，避免整表载入内存（输出覆盖输入时不适用）
+    if (input_path.suffix == '.parquet' and output_path.suffix == '.parquet'
+            and output_path.resolve() != input_path.resolve()):
+        if _resample_parquet_stream(input_path, output_path, target_interval, time_column,
+                                    compression=compression, row_group_size=row_group_size,
+                                    downcast=downcast, fused=_use_fused(engine)):
+            logger.info(f"✓ 文件已保存: {output_path}")
+            return str(output_path)
+        logger.info("数据不满足流式处理条件，改为整表处理")
+
+    # 读取文件
+    if input_path.suffix == '.parquet':
+        # 只读取重采样需要的列（宽表中的盘口、主动买卖量等列不反序列化）
+        columns = [time_column, *_build_agg_dict(pq.read_schema(input_path).names)]
+        df = pd.read_parquet(input_path, columns=columns, engine='pyarrow', **_READ_PARQUET_KWARGS)
+    else:
+        logger.info("提示: CSV解析较慢，建议将原始数据保存为 .parquet")
+        df = _read_csv(input_path)
+
+    # 重采样
+    df_resampled = resample_klines(df, target_interval, time_column, downcast=downcast, engine=engine)
 
     # 保存文件
     logger.info(f"保存文件: {output_path.name}")
     if output_path.suffix == '.parquet':
-        df_resampled.to_parquet(output_path, index=False)
-    elif output_path.suffix == '.csv':
-        df_resampled.to_csv(output_path, index=False)
+        df_resampled.to_parquet(
+            output_path, index=False, engine='pyarrow',
+            compression=_parquet_compression(compression), row_group_size=row_group_size,
+            use_dictionary=True, write_statistics=True
+        )
     else:
-        raise ValueError(f"不支持的输出格式: {output_path.suffix}")
+        write_csv(df_resampled, output_path)
 
     logger.info(f"✓ 文件已保存: {output_path}")
 
@@ -161,7 +624,12 @@ def batch_resample(
     target_interval: str = '15s',
     symbol: Optional[str] = None,
     market_type: str = 'spot',
-    exchange: str = 'binance'
+    exchange: str = 'binance',
+    workers: Optional[int] = None,
+    compression: Optional[str] = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    downcast: bool = False,
+    engine: str = 'pandas'
 ):
     """
     批量重采样目录下的所有文件
@@ -173,6 +641,11 @@ def batch_resample(
         symbol: 交易对(可选,如果指定则只处理该交易对)
         market_type: 市场类型
         exchange: 交易所
+        workers: 并行进程数(可选,默认CPU核数;单个文件时串行处理)
+        compression: Parquet输出压缩算法('snappy'/'zstd'/'none')
+        row_group_size: Parquet输出行组行数
+        downcast: 是否将数值列降为float32/int32
+        engine: 执行引擎('pandas'/'numba'/'duckdb'/'polars')
     """
     # 构建搜索路径
     if symbol:
@@ -184,9 +657,15 @@ def batch_resample(
         logger.error(f"目录不存在: {search_path}")
         return
 
-    # 查找所有匹配的文件
+    # 查找所有匹配的文件（等价于 rglob(pattern)，os.walk 基于 scandir，无需逐个 stat）
     pattern = f"*_{source_interval}_*.parquet"
-    files = list(search_path.rglob(pattern))
+    needle = f"_{source_interval}_"
+    files = [
+        Path(root) / name
+        for root, _, names in os.walk(search_path)
+        for name in names
+        if name.endswith('.parquet') and needle in name
+    ]
 
     if not files:
         logger.warning(f"未找到文件: {pattern}")
@@ -201,16 +680,37 @@ def batch_resample(
         # 如果没有单位,假设是秒
         pd_interval = pd_interval + 'S'
 
-    # 批量处理
+    # 批量处理（重采样为CPU密集型，多文件时按文件分配到多个进程）
+    workers = min(workers or os.cpu_count() or 1, len(files))
     success_count = 0
-    for i, file_path in enumerate(files, 1):
-        try:
-            logger.info(f"\n[{i}/{len(files)}] 处理: {file_path.name}")
-            resample_file(str(file_path), target_interval=pd_interval)
-            success_count += 1
-        except Exception as e:
-            logger.error(f"处理失败: {e}")
-            continue
+    if workers <= 1:
+        for i, file_path in enumerate(files, 1):
+            try:
+                logger.info(f"\n[{i}/{len(files)}] 处理: {file_path.name}")
+                resample_file(str(file_path), target_interval=pd_interval,
+                              compression=compression, row_group_size=row_group_size,
+                              downcast=downcast, engine=engine)
+                success_count += 1
+            except Exception as e:
+                logger.error(f"处理失败: {e}")
+                continue
+    else:
+        logger.info(f"使用 {workers} 个进程并行处理")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(resample_file, str(file_path), None, pd_interval,
+                                compression=compression, row_group_size=row_group_size,
+                                downcast=downcast, engine=engine): file_path
+                for file_path in files
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                file_path = futures[future]
+                try:
+                    future.result()
+                    success_count += 1
+                    logger.info(f"[{i}/{len(files)}] 完成: {file_path.name}")
+                except Exception as e:
+                    logger.error(f"[{i}/{len(files)}] 处理失败 {file_path.name}: {e}")
 
     logger.info(f"\n✓ 批量处理完成: {success_count}/{len(files)} 成功")
 
@@ -263,12 +763,23 @@ def main():
                         help='市场类型')
     parser.add_argument('--exchange', type=str, default='binance',
                         help='交易所')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='并行进程数(可选,默认CPU核数)')
 
     # 通用参数
     parser.add_argument('--target', type=str, default='15s',
                         help='目标周期 (如: 15s, 30s, 1m, 5m)')
     parser.add_argument('--time-column', type=str, default='stime',
                         help='时间列名称')
+    parser.add_argument('--compression', type=str, default=DEFAULT_COMPRESSION,
+                        choices=['snappy', 'zstd', 'none'],
+                        help='Parquet输出压缩算法')
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help='Parquet输出行组行数')
+    parser.add_argument('--engine', type=str, default='pandas', choices=ENGINES,
+                        help='执行引擎(numba为融合聚合内核;duckdb/polars需单独安装,仅支持Parquet)')
+    parser.add_argument('--fp32', action='store_true',
+                        help='输出数值列使用float32/int32(文件体积减半,精度约7位有效数字)')
 
     args = parser.parse_args()
 
@@ -302,7 +813,12 @@ def main():
                 target_interval=args.target,
                 symbol=args.symbol,
                 market_type=args.market,
-                exchange=args.exchange
+                exchange=args.exchange,
+                workers=args.workers,
+                compression=args.compression,
+                row_group_size=args.row_group_size,
+                downcast=args.fp32,
+                engine=args.engine
             )
         else:
             # 单文件模式
@@ -321,7 +837,11 @@ def main():
                 input_file=args.input,
                 output_file=args.output,
                 target_interval=pd_interval,
-                time_column=args.time_column
+                time_column=args.time_column,
+                compression=args.compression,
+                row_group_size=args.row_group_size,
+                downcast=args.fp32,
+                engine=args.engine
             )
 
             logger.info(f"\n✓ 处理完成: {output_file}")
@@ -5,15 +5,36 @@
 支持策略文件(.qts)和回测配置文件(.qtb)的加密存储
 """
 
+import os
 import json
 import hashlib
 from pathlib import Path
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from cryptography.hazmat.backends import default_backend
 import base64
 
+# orjson直接输出UTF-8字节且更快，未安装时回退到标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _json_dumps(obj) -> bytes:
+    """序列化为UTF-8 JSON字节（非ASCII字符不转义）"""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """解析UTF-8 JSON字节"""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
 
 class StrategyEncryptor:
     """策略文件加密器"""
@@ -21,6 +42,13 @@ class StrategyEncryptor:
     # 文件类型
     STRATEGY_EXT = '.qts'  # Quant Trading Strategy
     BACKTEST_EXT = '.qtb'  # Quant Trading Backtest
+
+    # 加密格式 v2: 版本(1字节) + 盐(16字节) + nonce(12字节) + AES-256-GCM密文
+    # 旧格式为 Fernet 令牌（PBKDF2 + 固定盐），以 b'gAAAA' 开头，仍可解密
+    FORMAT_V2 = 2
+    SALT_SIZE = 16
+    NONCE_SIZE = 12
+    LEGACY_SALT = b'quant_trading_system_2025'  # 旧格式固定盐值
     
     def __init__(self, password: str):
         """
@@ -30,19 +58,26 @@ class StrategyEncryptor:
             password: 加密密码
         """
         self.password = password
-        self.salt = b'quant_trading_system_2025'  # 固定盐值
-        
-    def _derive_key(self) -> bytes:
-        """从密码派生加密密钥"""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(self.password.encode()))
-        return key
+        self.salt = os.urandom(self.SALT_SIZE)  # 本实例加密新文件使用的随机盐
+        self._ciphers = {}  # 盐 -> AESGCM对象，同一实例批量加解密只派生一次密钥
+        self._legacy_fernet = None
+
+    def _derive_key(self, salt: bytes) -> bytes:
+        """从密码派生AES-256密钥（scrypt）"""
+        kdf = Scrypt(salt=salt, length=32, n=2 ** 15, r=8, p=1, backend=default_backend())
+        return kdf.derive(self.password.encode())
+
+    def _cipher(self, salt: bytes) -> AESGCM:
+        """按盐缓存的AES-GCM加解密对象"""
+        cipher = self._ciphers.get(salt)
+        if cipher is None:
+            cipher = self._ciphers[salt] = AESGCM(self._derive_key(salt))
+        return cipher
+
+    def _derive_legacy_key(self) -> bytes:
+        """旧格式的Fernet密钥（PBKDF2-SHA256，固定盐；hashlib直接调用OpenSSL，可用SHA-NI加速）"""
+        raw = hashlib.pbkdf2_hmac('sha256', self.password.encode(), self.LEGACY_SALT, 100000, dklen=32)
+        return base64.urlsafe_b64encode(raw)
     
     def encrypt_strategy(self, strategy_file: str, output_file: str = None) -> str:
         """
@@ -72,7 +107,7 @@ class StrategyEncryptor:
         }
         
         # 加密
-        encrypted_data = self._encrypt_data(json.dumps(metadata, ensure_ascii=False))
+        encrypted_data = self._encrypt_data(_json_dumps(metadata))
         
         # 确定输出文件路径
         if output_file is None:
@@ -100,7 +135,7 @@ class StrategyEncryptor:
             'config': config
         }
         
-        encrypted_data = self._encrypt_data(json.dumps(metadata, ensure_ascii=False))
+        encrypted_data = self._encrypt_data(_json_dumps(metadata))
         
         with open(output_file, 'wb') as f:
             f.write(encrypted_data)
@@ -120,20 +155,26 @@ class StrategyEncryptor:
         with open(encrypted_file, 'rb') as f:
             encrypted_data = f.read()
         
-        decrypted_json = self._decrypt_data(encrypted_data)
-        return json.loads(decrypted_json)
+        return _json_loads(self._decrypt_data(encrypted_data))
     
-    def _encrypt_data(self, data: str) -> bytes:
-        """加密数据"""
-        key = self._derive_key()
-        f = Fernet(key)
-        return f.encrypt(data.encode())
+    def _encrypt_data(self, data: bytes) -> bytes:
+        """加密数据（v2格式）"""
+        nonce = os.urandom(self.NONCE_SIZE)
+        ciphertext = self._cipher(self.salt).encrypt(nonce, data, None)
+        return bytes([self.FORMAT_V2]) + self.salt + nonce + ciphertext
     
-    def _decrypt_data(self, encrypted_data: bytes) -> str:
-        """解密数据"""
-        key = self._derive_key()
-        f = Fernet(key)
-        return f.decrypt(encrypted_data).decode()
+    def _decrypt_data(self, encrypted_data: bytes) -> bytes:
+        """解密数据（自动识别v2格式与旧Fernet格式）"""
+        if encrypted_data[:1] == bytes([self.FORMAT_V2]):
+            salt_end = 1 + self.SALT_SIZE
+            nonce_end = salt_end + self.NONCE_SIZE
+            cipher = self._cipher(encrypted_data[1:salt_end])
+            nonce = encrypted_data[salt_end:nonce_end]
+            return cipher.decrypt(nonce, encrypted_data[nonce_end:], None)
+
+        if self._legacy_fernet is None:
+            self._legacy_fernet = Fernet(self._derive_legacy_key())
+        return self._legacy_fernet.decrypt(encrypted_data)
     
     @staticmethod
     def verify_password(encrypted_file: str, password: str) -> bool:
@@ -10,6 +10,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import os
 import shutil
 from datetime import datetime
 from tools.crypto_config import (
@@ -21,6 +22,30 @@ from tools.crypto_config import (
 )
 
 
+def _fast_copy(src: Path, dst: Path):
+    """
+    复制文件内容及元数据
+
+    优先用 os.copy_file_range 在内核内复制（支持的文件系统上为reflink/写时复制），
+    不支持时回退为1MB缓冲区的普通复制；最后只调用一次 copystat。
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            # 非Linux或跨文件系统等不支持的情况，从头普通复制
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, length=1 << 20)
+    shutil.copystat(src, dst)
+
+
 def set_distribution_password(new_password: str):
     """
     设置分发密码
@@ -116,7 +141,7 @@ def export_package(output_dir: str, password: str):
         if src.exists():
             dst = output_path / file_path
             dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
+            _fast_copy(src, dst)
             print(f"  ✓ {file_path}")
         else:
             print(f"  ! 跳过（不存在）: {file_path}")
@@ -6,8 +6,41 @@
 """
 
 import ast
+import os
 import re
-from typing import Dict, List, Any, Tuple
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# 文档字符串中的 "param_name: description"
+_DOC_PARAM_RE = re.compile(r'(\w+):\s*(.+?)(?=\n\s*\w+:|$)', re.DOTALL)
+
+
+@lru_cache(maxsize=32)
+def _params_default_re(param_names: Tuple[str, ...]) -> 're.Pattern':
+    """
+    一次匹配多个参数定义（如 fast_period=5）的正则，按参数名组合缓存编译结果
+
+    分组: 1=参数名, 2=等号及空白, 3=值（不含行尾注释及其前面的空白）
+    """
+    names = '|'.join(re.escape(name) for name in param_names)
+    return re.compile(rf'\b({names})(\s*=\s*)([^,\)\n#]*[^,\)\n#\s])')
+
+
+@lru_cache(maxsize=128)
+def _cached_ast(file_path: str, mtime_ns: int) -> Tuple[str, Optional[ast.Module]]:
+    """
+    读取并解析策略文件，按 (路径, 修改时间) 缓存；文件被修改后修改时间变化，自动重新解析
+
+    Returns:
+        (源代码, 语法树)，语法错误时语法树为None
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    try:
+        return content, ast.parse(content)
+    except SyntaxError:
+        return content, None
 
 
 class StrategyParameterParser:
@@ -24,25 +57,23 @@ class StrategyParameterParser:
         Returns:
             参数列表，每个参数包含：name, type, default_value, description
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        try:
-            tree = ast.parse(content)
-        except SyntaxError:
+        content, tree = _cached_ast(file_path, os.stat(file_path).st_mtime_ns)
+        if tree is None:
             return []
         
         parameters = []
         
-        # 遍历所有类定义
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                # 查找__init__方法
-                for item in node.body:
-                    if isinstance(item, ast.FunctionDef) and item.name == '__init__':
-                        # 解析参数
-                        params = StrategyParameterParser._parse_init_params(item, content)
-                        parameters.extend(params)
+        # 遍历模块顶层及其内嵌一层的类定义（不深入函数体，策略类都定义在这两层）
+        classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+        classes += [item for node in classes for item in node.body if isinstance(item, ast.ClassDef)]
+
+        for node in classes:
+            # 查找__init__方法
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name == '__init__':
+                    # 解析参数
+                    params = StrategyParameterParser._parse_init_params(item, content)
+                    parameters.extend(params)
         
         return parameters
     
@@ -57,20 +88,19 @@ class StrategyParameterParser:
         # 解析参数描述
         param_descriptions = StrategyParameterParser._parse_docstring(docstring)
 
+        # 从defaults中获取默认值（defaults对应最后若干个参数）
+        defaults = func_node.args.defaults
+        args_count = len(func_node.args.args) - 1  # 减去self
+        defaults_start = args_count - len(defaults)
+
         # 1. 解析函数参数（跳过self）
-        for arg in func_node.args.args[1:]:
+        for arg_index, arg in enumerate(func_node.args.args[1:]):
             param_name = arg.arg
 
             # 查找默认值
             default_value = None
             param_type = "int"  # 默认类型
 
-            # 从defaults中获取默认值
-            defaults = func_node.args.defaults
-            args_count = len(func_node.args.args) - 1  # 减去self
-            defaults_start = args_count - len(defaults)
-
-            arg_index = func_node.args.args.index(arg) - 1  # 减去self
             if arg_index >= defaults_start:
                 default_node = defaults[arg_index - defaults_start]
                 default_value = StrategyParameterParser._get_node_value(default_node)
@@ -168,8 +198,7 @@ class StrategyParameterParser:
         descriptions = {}
         
         # 匹配 "param_name: description" 格式
-        pattern = r'(\w+):\s*(.+?)(?=\n\s*\w+:|$)'
-        matches = re.findall(pattern, docstring, re.DOTALL)
+        matches = _DOC_PARAM_RE.findall(docstring)
         
         for param_name, description in matches:
             descriptions[param_name] = description.strip()
@@ -192,18 +221,16 @@ class StrategyParameterParser:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # 使用正则表达式替换__init__方法中的默认值
-            for param_name, param_value in new_params.items():
-                # 匹配参数定义，例如: fast_period=5
-                pattern = rf'(\b{param_name}\s*=\s*)([^,\)]+)'
-                
-                # 根据类型格式化新值
-                if isinstance(param_value, str):
-                    new_value = f"'{param_value}'"
-                else:
-                    new_value = str(param_value)
-                
-                content = re.sub(pattern, rf'\g<1>{new_value}', content)
+            # 根据类型格式化新值
+            new_values = {
+                name: repr(value) if isinstance(value, str) else str(value)
+                for name, value in new_params.items()
+            }
+
+            # 所有参数合并为一个正则，单次扫描替换__init__方法中的默认值（只改写值本身）
+            if new_values:
+                pattern = _params_default_re(tuple(new_values))
+                content = pattern.sub(lambda m: m.group(1) + m.group(2) + new_values[m.group(1)], content)
             
             # 写回文件
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -5,7 +5,8 @@
 """
 
 import warnings
-warnings.filterwarnings('ignore', category=Warning, module='urllib3')
+if __name__ == '__main__':
+    warnings.filterwarnings('ignore', category=Warning, module='urllib3')
 
 import sys
 from pathlib import Path
@@ -14,15 +15,114 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import atexit
+import copy
+import hashlib
 import json
-from typing import Any
-from loguru import logger
-from tools.crypto_config import (
-    load_strategy_params,
-    save_strategy_params,
-    init_encrypted_config,
-    DEFAULT_STRATEGY_PARAMS
-)
+import os
+import queue
+import threading
+import weakref
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Optional, Tuple
+
+# orjson解析更快，未安装时回退到标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# loguru 与 tools.crypto_config（含加密库）在用到时才导入，
+# --help 及参数错误等不涉及加密的路径无需加载
+
+# 已解密参数缓存: 密码摘要 -> (配置文件修改时间, 参数)，避免重复构造微调器时重新派生密钥和解密
+_PARAMS_CACHE: Dict[Optional[bytes], Tuple[int, Dict[str, Any]]] = {}
+_PARAMS_CACHE_LOCK = threading.Lock()
+
+# 存活的微调器（弱引用，不阻止回收），进程退出时统一写入尚未保存的修改
+_LIVE_TUNERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_tuners():
+    """进程退出时等待所有微调器的后台写入完成"""
+    for tuner in list(_LIVE_TUNERS):
+        try:
+            tuner.flush()
+        except Exception:
+            # 写入线程已记录失败原因
+            pass
+
+
+def _password_key(password: Optional[str]) -> Optional[bytes]:
+    """缓存键：密码摘要（不在内存中保留明文密码），未提供密码（机器默认密钥）时为None"""
+    if password is None:
+        return None
+    return hashlib.blake2b(password.encode('utf-8'), digest_size=16).digest()
+
+
+def _config_mtime() -> Optional[int]:
+    """加密配置文件的修改时间（纳秒），文件不存在时返回None"""
+    from tools.crypto_config import get_config_path
+
+    try:
+        return os.stat(get_config_path()).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _params_digest(params: Dict[str, Any]) -> bytes:
+    """参数内容摘要（键排序后序列化），用于判断参数与已保存内容是否相同"""
+    if _orjson is not None:
+        blob = _orjson.dumps(params, option=_orjson.OPT_SORT_KEYS | _orjson.OPT_NON_STR_KEYS)
+    else:
+        blob = json.dumps(params, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+
+@lru_cache(maxsize=1)
+def _default_params_blob() -> bytes:
+    """默认参数序列化后的模板（只序列化一次）"""
+    from tools.crypto_config import DEFAULT_STRATEGY_PARAMS
+
+    return json.dumps(DEFAULT_STRATEGY_PARAMS, separators=(',', ':')).encode('utf-8')
+
+
+def _default_params() -> Dict[str, Any]:
+    """
+    返回一份独立的默认参数（从模板反序列化得到深拷贝），
+    修改它不会影响 DEFAULT_STRATEGY_PARAMS
+    """
+    blob = _default_params_blob()
+    if _orjson is not None:
+        return _orjson.loads(blob)
+    return json.loads(blob)
+
+
+@lru_cache(maxsize=1)
+def _valid_param_names() -> Dict[Tuple[str, ...], FrozenSet[str]]:
+    """
+    各参数类别允许修改的参数名（由默认参数生成一次）
+
+    Returns:
+        类别路径 -> 该类别下非字典参数名的集合，如 ('trading_conditions', 'buy') -> {'HA_threshold', ...}
+    """
+    from tools.crypto_config import DEFAULT_STRATEGY_PARAMS
+
+    names = {}
+    stack = [((), DEFAULT_STRATEGY_PARAMS)]
+    while stack:
+        path, section = stack.pop()
+        names[path] = frozenset(k for k, v in section.items() if not isinstance(v, dict))
+        stack.extend((path + (k,), v) for k, v in section.items() if isinstance(v, dict))
+    return names
+
+
+# show_current_params 报告的固定页眉/页脚
+_PARAMS_REPORT_HEADER = "\n" + "=" * 60 + "\n" + "           当前策略参数配置\n" + "=" * 60 + "\n"
+_PARAMS_REPORT_FOOTER = "\n" + "=" * 60 + "\n"
 
 
 class StrategyTuner:
@@ -37,57 +137,230 @@ class StrategyTuner:
         """
         self.password = password
         self.params = None
+        # 是否处于事务外：事务中的修改只标记为脏，退出最外层事务时统一保存一次
+        self._autosave = True
+        self._dirty = False
+        # 后台写入：队列只保留最新的参数快照，连续多次保存合并为一次加密写盘；
+        # 写入线程在队列清空后退出，最近一次写入失败的异常由 flush() 抛出
+        self._save_queue = queue.Queue(maxsize=1)
+        self._save_lock = threading.Lock()
+        self._writer = None
+        self._save_error = None
+        # 加密器在首次使用时创建，PBKDF2密钥派生只做一次
+        self._crypto = None
+        # 最近一次加载/保存的参数摘要（仅后台写入线程更新），内容未变时跳过加密写盘
+        self._last_digest = None
         self._load_params()
+        self._last_digest = _params_digest(self.params)
+        _LIVE_TUNERS.add(self)
+
+    def _get_crypto(self):
+        """返回复用的配置加密器（首次调用时派生密钥）"""
+        from tools.crypto_config import StrategyConfigCrypto
+
+        with self._save_lock:
+            if self._crypto is None:
+                self._crypto = StrategyConfigCrypto(self.password)
+            return self._crypto
 
     def _load_params(self):
         """加载当前参数"""
+        from loguru import logger
+        from tools.crypto_config import load_strategy_params, init_encrypted_config
+
+        key = _password_key(self.password)
+        with _PARAMS_CACHE_LOCK:
+            cached = _PARAMS_CACHE.get(key)
+        if cached is not None and cached[0] == _config_mtime():
+            self.params = copy.deepcopy(cached[1])
+            return
+
+        crypto = self._get_crypto()
         try:
-            self.params = load_strategy_params(self.password)
+            self.params = load_strategy_params(crypto=crypto)
         except Exception as e:
             logger.warning(f"加载配置失败: {e}")
             logger.info("创建默认配置...")
-            init_encrypted_config(self.password)
-            self.params = load_strategy_params(self.password)
+            init_encrypted_config(crypto=crypto)
+            # 刚写入的就是默认参数，无需再派生密钥解密一遍
+            self.params = _default_params()
+        self._cache_params(self.params)
+
+    def _cache_params(self, params: Dict[str, Any]):
+        """以当前配置文件修改时间缓存参数副本"""
+        mtime = _config_mtime()
+        if mtime is None:
+            return
+        with _PARAMS_CACHE_LOCK:
+            _PARAMS_CACHE[_password_key(self.password)] = (mtime, copy.deepcopy(params))
+
+    @classmethod
+    def clear_cache(cls):
+        """清空已解密参数缓存"""
+        with _PARAMS_CACHE_LOCK:
+            _PARAMS_CACHE.clear()
 
     def _save_params(self):
-        """保存参数"""
-        save_strategy_params(self.params, self.password)
-        logger.info("✓ 参数已保存并加密")
+        """提交当前参数快照给后台线程保存（不阻塞），尚未写入的旧快照被替换"""
+        snapshot = copy.deepcopy(self.params)
+        with self._save_lock:
+            try:
+                self._save_queue.get_nowait()
+                self._save_queue.task_done()
+            except queue.Empty:
+                pass
+            self._save_queue.put_nowait(snapshot)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._writer_loop, name='tuner-writer', daemon=True)
+                self._writer.start()
+        self._dirty = False
+
+    def _writer_loop(self):
+        """后台写入线程：加密并保存队列中的参数快照，队列清空后退出"""
+        from loguru import logger
+        from tools.crypto_config import save_strategy_params
+
+        while True:
+            with self._save_lock:
+                try:
+                    snapshot = self._save_queue.get_nowait()
+                except queue.Empty:
+                    self._writer = None
+                    return
+            try:
+                digest = _params_digest(snapshot)
+                if digest == self._last_digest:
+                    logger.info("参数无变化，跳过保存")
+                    self._save_error = None
+                    continue
+                save_strategy_params(snapshot, crypto=self._get_crypto())
+                self._last_digest = digest
+                self._cache_params(snapshot)
+                self._save_error = None
+                logger.info("✓ 参数已保存并加密")
+            except Exception as e:
+                logger.error(f"保存参数失败: {e}")
+                self._save_error = e
+            finally:
+                self._save_queue.task_done()
 
-    def show_current_params(self):
-        """显示当前所有参数"""
-        print("\n" + "=" * 60)
-        print("           当前策略参数配置")
-        print("=" * 60)
+    def flush(self):
+        """
+        保存尚未写入的修改，并等待后台写入完成
 
-        # 信号参数
-        print("\n【信号计算参数】")
-        sp = self.params['signal_params']
-        print(f"  MA周期:    M1={sp['M1']}, M2={sp['M2']}, M3={sp['M3']}, M4={sp['M4']}")
-        print(f"  平滑周期:  M99={sp['M99']}, N={sp['N']}")
-        print(f"  MACD:     SHORT={sp['SHORT']}, LONG={sp['LONG']}, MID={sp['MID']}")
+        Raises:
+            Exception: 最近一次后台写入失败时抛出其异常
+        """
+        if self._dirty:
+            self._save_params()
+        self._save_queue.join()
+        error, self._save_error = self._save_error, None
+        if error is not None:
+            raise error
+
+    @contextmanager
+    def transaction(self):
+        """
+        批量修改参数：事务内的修改只在正常退出时加密保存一次，
+        事务内抛出异常或保存失败时参数回滚到进入事务时的状态
 
-        # 交易条件
-        print("\n【交易条件参数】")
-        tc = self.params['trading_conditions']
-        print(f"  买入条件:  HA>{tc['buy']['HA_threshold']}, WD3<{tc['buy']['WD3_max']}, |QS|>{tc['buy']['QS_threshold']}")
-        print(f"  卖出条件:  |QJ|>{tc['sell']['QJ_threshold']} 或 WD3>{tc['sell']['WD3_threshold']}")
+        用法:
+            with tuner.transaction():
+                tuner.update_signal_param('M1', 6)
+                tuner.update_buy_condition('HA_threshold', 30000)
+        """
+        outermost = self._autosave
+        if not outermost:
+            # 嵌套事务由最外层负责保存和回滚
+            yield self
+            return
+
+        saved_params = copy.deepcopy(self.params)
+        self._autosave = False
+        try:
+            yield self
+            self.flush()
+        except BaseException:
+            self.params = saved_params
+            self._dirty = False
+            raise
+        finally:
+            self._autosave = True
+
+    def _set(self, category_path: Tuple[str, ...], param_name: str, value: Any,
+             cast: Optional[Callable[[Any], Any]] = None, error: str = "无效的参数名") -> Any:
+        """
+        设置单个参数（各更新方法的公共实现），非事务状态下立即保存，保存失败时恢复原值
 
-        # 资金管理
-        print("\n【资金管理参数】")
-        mm = self.params['money_management']
-        print(f"  初始资金:  ${mm['initial_capital']:,.0f}")
-        print(f"  单次交易:  ${mm['stkmoney']:,.0f}")
-        print(f"  止损设置:  移动止损={mm['stoploss']*100:.1f}%, 固定止损={mm['lossrate']*100:.1f}%")
+        Args:
+            category_path: 参数所在类别的路径，如 ('trading_conditions', 'buy')
+            param_name: 参数名（必须已存在于该类别中）
+            value: 新值
+            cast: 类型转换函数，None表示不转换
+            error: 参数名无效时的错误信息前缀
 
-        # 回测参数
-        print("\n【回测参数】")
+        Returns:
+            修改前的值
+        """
+        with self.transaction():
+            return self._assign(self._resolve(category_path), self._valid_names(category_path),
+                                param_name, value, cast, error)
+
+    def _valid_names(self, category_path: Tuple[str, ...]) -> FrozenSet[str]:
+        """类别允许的参数名；默认参数中没有的类别以当前参数中的键为准"""
+        names = _valid_param_names().get(category_path)
+        if names is None:
+            names = frozenset(self._resolve(category_path))
+        return names
+
+    def _resolve(self, category_path: Tuple[str, ...]) -> Dict[str, Any]:
+        """按路径取得参数类别对应的字典"""
+        target = self.params
+        for part in category_path:
+            target = target[part]
+        return target
+
+    def _assign(self, target: Dict[str, Any], valid_names: FrozenSet[str], param_name: str, value: Any,
+                cast: Optional[Callable[[Any], Any]] = None, error: str = "无效的参数名") -> Any:
+        """校验参数名并写入类别字典，返回修改前的值"""
+        if param_name not in valid_names:
+            raise ValueError(f"{error}: {param_name}")
+
+        old_value = target.get(param_name)
+        target[param_name] = cast(value) if cast is not None else value
+        self._dirty = True
+        return old_value
+
+    def show_current_params(self):
+        """显示当前所有参数（整份报告拼接后一次写出）"""
+        sp = self.params['signal_params']
+        tc = self.params['trading_conditions']
+        mm = self.params['money_management']
         bt = self.params['backtest']
-        print(f"  起始索引:  {bt['start_index']}")
-        print(f"  手续费率:  {bt['commission']*100:.2f}%")
-        print(f"  滑点:     {bt['slippage']*100:.2f}%")
 
-        print("\n" + "=" * 60)
+        sys.stdout.write(''.join([
+            _PARAMS_REPORT_HEADER,
+            # 信号参数
+            "\n【信号计算参数】\n",
+            f"  MA周期:    M1={sp['M1']}, M2={sp['M2']}, M3={sp['M3']}, M4={sp['M4']}\n",
+            f"  平滑周期:  M99={sp['M99']}, N={sp['N']}\n",
+            f"  MACD:     SHORT={sp['SHORT']}, LONG={sp['LONG']}, MID={sp['MID']}\n",
+            # 交易条件
+            "\n【交易条件参数】\n",
+            f"  买入条件:  HA>{tc['buy']['HA_threshold']}, WD3<{tc['buy']['WD3_max']}, |QS|>{tc['buy']['QS_threshold']}\n",
+            f"  卖出条件:  |QJ|>{tc['sell']['QJ_threshold']} 或 WD3>{tc['sell']['WD3_threshold']}\n",
+            # 资金管理
+            "\n【资金管理参数】\n",
+            f"  初始资金:  ${mm['initial_capital']:,.0f}\n",
+            f"  单次交易:  ${mm['stkmoney']:,.0f}\n",
+            f"  止损设置:  移动止损={mm['stoploss']*100:.1f}%, 固定止损={mm['lossrate']*100:.1f}%\n",
+            # 回测参数
+            "\n【回测参数】\n",
+            f"  起始索引:  {bt['start_index']}\n",
+            f"  手续费率:  {bt['commission']*100:.2f}%\n",
+            f"  滑点:     {bt['slippage']*100:.2f}%\n",
+            _PARAMS_REPORT_FOOTER,
+        ]))
 
     def update_signal_param(self, param_name: str, value: int):
         """
@@ -97,12 +370,7 @@ class StrategyTuner:
             param_name: 参数名 (M1, M2, M3, M4, M99, N, SHORT, LONG, MID)
             value: 新值
         """
-        if param_name not in self.params['signal_params']:
-            raise ValueError(f"无效的参数名: {param_name}")
-
-        old_value = self.params['signal_params'][param_name]
-        self.params['signal_params'][param_name] = int(value)
-        self._save_params()
+        old_value = self._set(('signal_params',), param_name, value, int)
         print(f"✓ {param_name}: {old_value} → {value}")
 
     def update_buy_condition(self, param_name: str, value: float):
@@ -113,12 +381,7 @@ class StrategyTuner:
             param_name: 参数名 (HA_threshold, WD3_max, QS_threshold)
             value: 新值
         """
-        if param_name not in self.params['trading_conditions']['buy']:
-            raise ValueError(f"无效的买入参数: {param_name}")
-
-        old_value = self.params['trading_conditions']['buy'][param_name]
-        self.params['trading_conditions']['buy'][param_name] = float(value)
-        self._save_params()
+        old_value = self._set(('trading_conditions', 'buy'), param_name, value, float, error="无效的买入参数")
         print(f"✓ 买入-{param_name}: {old_value} → {value}")
 
     def update_sell_condition(self, param_name: str, value: float):
@@ -129,12 +392,7 @@ class StrategyTuner:
             param_name: 参数名 (QJ_threshold, WD3_threshold)
             value: 新值
         """
-        if param_name not in self.params['trading_conditions']['sell']:
-            raise ValueError(f"无效的卖出参数: {param_name}")
-
-        old_value = self.params['trading_conditions']['sell'][param_name]
-        self.params['trading_conditions']['sell'][param_name] = float(value)
-        self._save_params()
+        old_value = self._set(('trading_conditions', 'sell'), param_name, value, float, error="无效的卖出参数")
         print(f"✓ 卖出-{param_name}: {old_value} → {value}")
 
     def update_money_management(self, param_name: str, value: float):
@@ -145,21 +403,39 @@ class StrategyTuner:
             param_name: 参数名
             value: 新值
         """
-        if param_name not in self.params['money_management']:
-            raise ValueError(f"无效的资金管理参数: {param_name}")
-
-        old_value = self.params['money_management'][param_name]
-        self.params['money_management'][param_name] = float(value)
-        self._save_params()
+        old_value = self._set(('money_management',), param_name, value, float, error="无效的资金管理参数")
         print(f"✓ {param_name}: {old_value} → {value}")
 
     def reset_to_default(self):
         """重置为默认参数"""
-        self.params = DEFAULT_STRATEGY_PARAMS.copy()
-        self._save_params()
+        with self.transaction():
+            self.params = _default_params()
+            self._dirty = True
         print("✓ 已重置为默认参数")
 
-    def batch_update(self, updates: dict):
+    def _set_many(self, category_path: Tuple[str, ...], params: Dict[str, Any],
+                  resolved: Dict[Tuple[str, ...], Dict[str, Any]]):
+        """
+        逐个设置某类别下的参数，值为字典时递归合并到对应的子类别
+
+        Args:
+            category_path: 类别路径
+            params: 参数名 -> 新值
+            resolved: 已解析的 类别路径 -> (类别字典, 允许的参数名)，同一类别只遍历一次
+        """
+        entry = resolved.get(category_path)
+        if entry is None:
+            entry = resolved[category_path] = (self._resolve(category_path),
+                                               self._valid_names(category_path))
+        target, valid_names = entry
+
+        for param_name, value in params.items():
+            if isinstance(value, dict):
+                self._set_many(category_path + (param_name,), value, resolved)
+            else:
+                self._assign(target, valid_names, param_name, value)
+
+    def batch_update(self, updates: Mapping[str, Dict[str, Any]]):
         """
         批量更新参数
 
@@ -171,40 +447,97 @@ class StrategyTuner:
                 ...
             }
         """
-        for category, params in updates.items():
-            if '.' in category:
-                # 嵌套路径
-                parts = category.split('.')
-                target = self.params
-                for part in parts:
-                    target = target[part]
-                target.update(params)
-            else:
-                self.params[category].update(params)
+        resolved = {}
+        with self.transaction():
+            for category, params in updates.items():
+                self._set_many(tuple(category.split('.')), params, resolved)
 
-        self._save_params()
         print(f"✓ 批量更新完成: {len(updates)} 个类别")
 
 
+# --set 参数路径前缀 -> (更新方法, 类型转换)
+_SET_DISPATCH = {
+    'signal_params': (StrategyTuner.update_signal_param, int),
+    'money_management': (StrategyTuner.update_money_management, float),
+    'trading_conditions.buy': (StrategyTuner.update_buy_condition, float),
+    'trading_conditions.sell': (StrategyTuner.update_sell_condition, float),
+}
+
+
+@lru_cache(maxsize=1)
+def _set_targets() -> Dict[str, Tuple[Callable, str, Callable[[str], Any]]]:
+    """
+    --set 完整参数路径 -> (更新方法, 参数名, 类型转换)，由默认参数展开一次
+
+    如 'trading_conditions.buy.HA_threshold' -> (update_buy_condition, 'HA_threshold', float)
+    """
+    targets = {}
+    for prefix, (setter, cast) in _SET_DISPATCH.items():
+        for name in _valid_param_names()[tuple(prefix.split('.'))]:
+            targets[f'{prefix}.{name}'] = (setter, name, cast)
+    return targets
+
+# 快速优化预设（batch_update 只读取其中的值，不会保留引用，可直接传入）
+_CONSERVATIVE_PRESET = MappingProxyType({
+    'trading_conditions': {
+        'buy': {'HA_threshold': 30000, 'WD3_max': 120, 'QS_threshold': 1500},
+        'sell': {'QJ_threshold': 40000, 'WD3_threshold': 180}
+    }
+})
+
+_AGGRESSIVE_PRESET = MappingProxyType({
+    'trading_conditions': {
+        'buy': {'HA_threshold': 20000, 'WD3_max': 180, 'QS_threshold': 1000},
+        'sell': {'QJ_threshold': 60000, 'WD3_threshold': 220}
+    }
+})
+
+# 交互式菜单（整段一次写出）
+_MENU_TEXT = "\n".join([
+    "",
+    "=" * 50,
+    "      策略参数微调工具",
+    "=" * 50,
+    "1. 查看当前参数",
+    "2. 修改信号参数 (MA/MACD)",
+    "3. 修改买入条件",
+    "4. 修改卖出条件",
+    "5. 修改资金管理",
+    "6. 重置为默认参数",
+    "7. 快速优化预设",
+    "0. 退出",
+    "-" * 50,
+    "",
+])
+
+
+def _prompt(msg: str) -> str:
+    """
+    显示提示并读取一行输入（替代input，脚本化输入时开销更小）
+
+    Raises:
+        EOFError: 输入已结束
+    """
+    sys.stdout.write(msg)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
 def interactive_menu():
     """交互式菜单"""
     tuner = StrategyTuner()
 
     while True:
-        print("\n" + "=" * 50)
-        print("      策略参数微调工具")
-        print("=" * 50)
-        print("1. 查看当前参数")
-        print("2. 修改信号参数 (MA/MACD)")
-        print("3. 修改买入条件")
-        print("4. 修改卖出条件")
-        print("5. 修改资金管理")
-        print("6. 重置为默认参数")
-        print("7. 快速优化预设")
-        print("0. 退出")
-        print("-" * 50)
-
-        choice = input("请选择操作: ").strip()
+        sys.stdout.write(_MENU_TEXT)
+
+        try:
+            choice = _prompt("请选择操作: ").strip()
+        except EOFError:
+            # 输入结束（如脚本输入已读完）时按退出处理
+            choice = '0'
 
         if choice == '0':
             print("再见!")
@@ -215,42 +548,42 @@ def interactive_menu():
 
         elif choice == '2':
             print("\n信号参数: M1, M2, M3, M4, M99, N, SHORT, LONG, MID")
-            param = input("参数名: ").strip().upper()
+            param = _prompt("参数名: ").strip().upper()
             try:
-                value = int(input("新值: "))
+                value = int(_prompt("新值: "))
                 tuner.update_signal_param(param, value)
             except Exception as e:
                 print(f"错误: {e}")
 
         elif choice == '3':
             print("\n买入参数: HA_threshold, WD3_max, QS_threshold")
-            param = input("参数名: ").strip()
+            param = _prompt("参数名: ").strip()
             try:
-                value = float(input("新值: "))
+                value = float(_prompt("新值: "))
                 tuner.update_buy_condition(param, value)
             except Exception as e:
                 print(f"错误: {e}")
 
         elif choice == '4':
             print("\n卖出参数: QJ_threshold, WD3_threshold")
-            param = input("参数名: ").strip()
+            param = _prompt("参数名: ").strip()
             try:
-                value = float(input("新值: "))
+                value = float(_prompt("新值: "))
                 tuner.update_sell_condition(param, value)
             except Exception as e:
                 print(f"错误: {e}")
 
         elif choice == '5':
             print("\n资金参数: initial_capital, stkmoney, stoploss, lossrate, position_ratio")
-            param = input("参数名: ").strip()
+            param = _prompt("参数名: ").strip()
             try:
-                value = float(input("新值: "))
+                value = float(_prompt("新值: "))
                 tuner.update_money_management(param, value)
             except Exception as e:
                 print(f"错误: {e}")
 
         elif choice == '6':
-            confirm = input("确认重置为默认参数? (y/n): ")
+            confirm = _prompt("确认重置为默认参数? (y/n): ")
             if confirm.lower() == 'y':
                 tuner.reset_to_default()
 
@@ -260,24 +593,14 @@ def interactive_menu():
             print("2. 激进型 - 低阈值，高收益")
             print("3. 平衡型 - 默认参数")
 
-            preset = input("选择预设: ").strip()
+            preset = _prompt("选择预设: ").strip()
 
             if preset == '1':
-                tuner.batch_update({
-                    'trading_conditions': {
-                        'buy': {'HA_threshold': 30000, 'WD3_max': 120, 'QS_threshold': 1500},
-                        'sell': {'QJ_threshold': 40000, 'WD3_threshold': 180}
-                    }
-                })
+                tuner.batch_update(_CONSERVATIVE_PRESET)
                 print("✓ 已应用保守型预设")
 
             elif preset == '2':
-                tuner.batch_update({
-                    'trading_conditions': {
-                        'buy': {'HA_threshold': 20000, 'WD3_max': 180, 'QS_threshold': 1000},
-                        'sell': {'QJ_threshold': 60000, 'WD3_threshold': 220}
-                    }
-                })
+                tuner.batch_update(_AGGRESSIVE_PRESET)
                 print("✓ 已应用激进型预设")
 
             elif preset == '3':
@@ -294,38 +617,34 @@ def main():
     parser = argparse.ArgumentParser(description='策略参数微调工具')
     parser.add_argument('--show', action='store_true', help='显示当前参数')
     parser.add_argument('--reset', action='store_true', help='重置为默认参数')
-    parser.add_argument('--set', type=str, help='设置参数，格式: 类别.参数=值')
+    parser.add_argument('--set', action='append', default=[],
+                        help='设置参数，格式: 类别.参数=值（可重复指定，一次保存）')
     parser.add_argument('--interactive', '-i', action='store_true', help='交互式模式')
 
     args = parser.parse_args()
 
-    tuner = StrategyTuner()
-
+    # 微调器（解密参数）只在需要参数的分支中创建；交互模式由 interactive_menu 自行创建
     if args.show:
-        tuner.show_current_params()
+        StrategyTuner().show_current_params()
 
     elif args.reset:
+        tuner = StrategyTuner()
         tuner.reset_to_default()
         tuner.show_current_params()
 
     elif args.set:
-        # 解析设置命令: signal_params.M1=6
+        # 解析设置命令: signal_params.M1=6，全部成功后只加密保存一次
+        tuner = StrategyTuner()
         try:
-            path, value = args.set.split('=')
-            parts = path.split('.')
-
-            if len(parts) == 2:
-                category, param = parts
-                if category == 'signal_params':
-                    tuner.update_signal_param(param, int(value))
-                elif category == 'money_management':
-                    tuner.update_money_management(param, float(value))
-            elif len(parts) == 3:
-                category, sub, param = parts
-                if sub == 'buy':
-                    tuner.update_buy_condition(param, float(value))
-                elif sub == 'sell':
-                    tuner.update_sell_condition(param, float(value))
+            targets = _set_targets()
+            with tuner.transaction():
+                for item in args.set:
+                    path, value = item.split('=', 1)
+                    target = targets.get(path.strip())
+                    if target is None:
+                        raise ValueError(f"无效的参数: {path}")
+                    setter, param, cast = target
+                    setter(tuner, param, cast(value))
 
         except Exception as e:
             print(f"设置失败: {e}")
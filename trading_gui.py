@@ -7,6 +7,7 @@
 
 import sys
 import os
+import time
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QLabel, QPushButton, QComboBox, QTextEdit, QGroupBox,
@@ -18,9 +19,50 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QProcess
 from PyQt5.QtGui import QIcon, QFont, QColor
 import json
+from contextlib import contextmanager
 from datetime import datetime
-import sys
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from pathlib import Path
+
+# 项目根目录只加入sys.path一次
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+
+# 窗口图标和导入策略目录在模块加载时确定一次，每个窗口不再重复stat
+_MODULE_DIR = Path(_HERE)
+_ICON_PATH = _MODULE_DIR / "icon.png"
+_ICON_EXISTS = _ICON_PATH.is_file()
+_STRATEGY_DIR = _MODULE_DIR / "strategies_imported"
+_STRATEGY_DIR.mkdir(exist_ok=True)
+
+
+@contextmanager
+def _batched_table_update(table):
+    """
+    批量填充表格：期间暂停重绘和排序、屏蔽信号，结束后只重绘一次
+
+    Args:
+        table: QTableWidget
+    """
+    sorting = table.isSortingEnabled()
+    table.setUpdatesEnabled(False)
+    table.setSortingEnabled(False)
+    table.blockSignals(True)
+    try:
+        yield table
+    finally:
+        table.blockSignals(False)
+        table.setSortingEnabled(sorting)
+        table.setUpdatesEnabled(True)
+
+
+# 全局样式表（深色主题），启动时读取一次；文件缺失时使用Qt默认样式
+try:
+    with open(os.path.join(_HERE, 'assets', 'dark.qss'), encoding='utf-8') as _qss_file:
+        _STYLESHEET = _qss_file.read()
+except OSError as _qss_error:
+    print(f"[警告] 样式表加载失败，使用默认样式: {_qss_error}")
+    _STYLESHEET = ''
 
 
 class DownloadThread(QThread):
@@ -149,10 +191,8 @@ class TradingGUI(QMainWindow):
         self.setGeometry(100, 100, 1400, 900)
 
         # 设置窗口图标
-        from pathlib import Path
-        icon_path = Path(__file__).parent / "icon.png"
-        if icon_path.exists():
-            self.setWindowIcon(QIcon(str(icon_path)))
+        if _ICON_EXISTS:
+            self.setWindowIcon(QIcon(str(_ICON_PATH)))
 
         # 初始化配置
         self.config = self.load_config()
@@ -163,6 +203,8 @@ class TradingGUI(QMainWindow):
         self.download_process = None
         self.download_thread = None  # 保留以兼容旧代码
         self.download_output_buffer = {'stdout': '', 'stderr': ''}  # 累积所有输出
+        self._last_progress_ts = 0.0  # 上次刷新下载进度的时间
+        self._pending_progress = None  # 节流期间最新的 (百分比, 消息)
 
         # 初始化回测进程
         self.backtest_process = None
@@ -182,8 +224,7 @@ class TradingGUI(QMainWindow):
         # 初始化策略和配置列表
         self.strategies = []  # 存储导入的策略
         self.backtest_configs = []  # 存储导入的回测配置
-        self.strategy_dir = Path(__file__).parent / "strategies_imported"
-        self.strategy_dir.mkdir(exist_ok=True)
+        self.strategy_dir = _STRATEGY_DIR
 
         # 应用全局样式
         self.apply_stylesheet()
@@ -193,236 +234,7 @@ class TradingGUI(QMainWindow):
 
     def apply_stylesheet(self):
         """应用全局样式表"""
-        stylesheet = """
-            QMainWindow {
-                background-color: #2b2b2b;
-            }
-
-            QWidget {
-                background-color: #2b2b2b;
-                color: #e0e0e0;
-            }
-
-            QGroupBox {
-                font-weight: bold;
-                font-size: 14px;
-                border: 2px solid #404040;
-                border-radius: 6px;
-                margin-top: 12px;
-                padding: 15px;
-                background-color: #353535;
-                color: #ffffff;
-            }
-
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-                color: #ffffff;
-            }
-
-            QPushButton {
-                background-color: #0d7377;
-                color: #ffffff;
-                border: none;
-                padding: 8px 16px;
-                border-radius: 4px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 80px;
-            }
-
-            QPushButton:hover {
-                background-color: #14a085;
-            }
-
-            QPushButton:pressed {
-                background-color: #0a5f62;
-            }
-
-            QPushButton:disabled {
-                background-color: #505050;
-                color: #808080;
-            }
-
-            QLineEdit, QComboBox, QSpinBox, QDoubleSpinBox {
-                padding: 8px;
-                border: 2px solid #404040;
-                border-radius: 4px;
-                background-color: #404040;
-                color: #ffffff;
-                font-size: 14px;
-                min-height: 28px;
-            }
-
-            QLineEdit:focus, QComboBox:focus {
-                border: 2px solid #0d7377;
-                background-color: #4a4a4a;
-            }
-
-            QComboBox::drop-down {
-                border: none;
-                width: 30px;
-            }
-
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #ffffff;
-                margin-right: 10px;
-            }
-
-            QComboBox QAbstractItemView {
-                background-color: #404040;
-                color: #ffffff;
-                selection-background-color: #0d7377;
-                border: 1px solid #0d7377;
-            }
-
-            QTextEdit {
-                border: 2px solid #404040;
-                border-radius: 4px;
-                background-color: #1e1e1e;
-                color: #e0e0e0;
-                padding: 8px;
-                font-size: 14px;
-                font-family: "PingFang SC", "Microsoft YaHei", "SimHei", "Arial", sans-serif;
-            }
-
-            QTabWidget::pane {
-                border: 2px solid #404040;
-                border-radius: 4px;
-                background-color: #353535;
-                padding: 10px;
-            }
-
-            QTabBar::tab {
-                background-color: #2b2b2b;
-                color: #b0b0b0;
-                padding: 12px 24px;
-                margin-right: 2px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-
-            QTabBar::tab:selected {
-                background-color: #353535;
-                color: #14a085;
-                border-bottom: 3px solid #14a085;
-            }
-
-            QTabBar::tab:hover {
-                background-color: #404040;
-                color: #ffffff;
-            }
-
-            QLabel {
-                color: #e0e0e0;
-                font-size: 14px;
-                background-color: transparent;
-            }
-
-            QProgressBar {
-                border: 2px solid #404040;
-                border-radius: 4px;
-                text-align: center;
-                background-color: #2b2b2b;
-                color: #ffffff;
-                font-weight: bold;
-            }
-
-            QProgressBar::chunk {
-                background-color: #0d7377;
-                border-radius: 2px;
-            }
-
-            QTableWidget {
-                border: 2px solid #404040;
-                border-radius: 4px;
-                background-color: #353535;
-                gridline-color: #404040;
-                color: #e0e0e0;
-            }
-
-            QTableWidget::item {
-                padding: 5px;
-                color: #e0e0e0;
-            }
-
-            QTableWidget::item:selected {
-                background-color: #0d7377;
-                color: #ffffff;
-            }
-
-            QHeaderView::section {
-                background-color: #1e1e1e;
-                color: #ffffff;
-                padding: 10px;
-                border: none;
-                font-weight: bold;
-                font-size: 13px;
-            }
-
-            QMenuBar {
-                background-color: #2b2b2b;
-                color: #e0e0e0;
-            }
-
-            QMenuBar::item:selected {
-                background-color: #404040;
-            }
-
-            QMenu {
-                background-color: #353535;
-                color: #e0e0e0;
-                border: 1px solid #404040;
-            }
-
-            QMenu::item:selected {
-                background-color: #0d7377;
-            }
-
-            QStatusBar {
-                background-color: #1e1e1e;
-                color: #e0e0e0;
-            }
-
-            QScrollBar:vertical {
-                background-color: #2b2b2b;
-                width: 12px;
-                border-radius: 6px;
-            }
-
-            QScrollBar::handle:vertical {
-                background-color: #505050;
-                border-radius: 6px;
-                min-height: 20px;
-            }
-
-            QScrollBar::handle:vertical:hover {
-                background-color: #606060;
-            }
-
-            QScrollBar:horizontal {
-                background-color: #2b2b2b;
-                height: 12px;
-                border-radius: 6px;
-            }
-
-            QScrollBar::handle:horizontal {
-                background-color: #505050;
-                border-radius: 6px;
-                min-width: 20px;
-            }
-
-            QScrollBar::handle:horizontal:hover {
-                background-color: #606060;
-            }
-        """
-        self.setStyleSheet(stylesheet)
+        self.setStyleSheet(_STYLESHEET)
 
     def init_ui(self):
         """初始化用户界面"""
@@ -542,30 +354,63 @@ class TradingGUI(QMainWindow):
         return top_widget
 
     def create_tabs(self):
-        """创建功能标签页"""
-        # 1. 数据下载
-        self.tab_widget.addTab(self.create_data_download_tab(), "📥 数据下载")
-
-        # 2. 回测测试
-        self.tab_widget.addTab(self.create_backtest_tab(), "📊 回测测试")
-
-        # 3. 模拟交易
-        self.tab_widget.addTab(self.create_paper_trading_tab(), "🎮 模拟交易")
-
-        # 4. 实盘交易
-        self.tab_widget.addTab(self.create_live_trading_tab(), "💰 实盘交易")
-
-        # 5. 策略列表
-        self.tab_widget.addTab(self.create_strategy_tab(), "📋 策略列表")
+        """创建功能标签页（先放占位页，首次切换到某页时才构建其控件）"""
+        self._tab_factories = [
+            (self.create_data_download_tab, "📥 数据下载"),   # 1. 数据下载
+            (self.create_backtest_tab, "📊 回测测试"),        # 2. 回测测试
+            (self.create_paper_trading_tab, "🎮 模拟交易"),   # 3. 模拟交易
+            (self.create_live_trading_tab, "💰 实盘交易"),    # 4. 实盘交易
+            (self.create_strategy_tab, "📋 策略列表"),        # 5. 策略列表
+            (self.create_monitor_tab, "📈 实盘监控"),         # 6. 实盘监控
+            (self.create_scanner_tab, "🔍 机会扫描"),         # 7. 机会扫描
+            (self.create_notification_tab, "🔔 通知配置"),    # 8. 通知配置
+        ]
+        self._built_tabs = set()
+
+        for _, label in self._tab_factories:
+            self.tab_widget.addTab(QWidget(), label)
+
+        self.tab_widget.currentChanged.connect(self._ensure_tab)
+        self._ensure_tab(self.tab_widget.currentIndex())
+
+    def _ensure_tab(self, index):
+        """
+        确保标签页已构建（首次访问时用真实页面替换占位页）
 
-        # 6. 实盘监控
-        self.tab_widget.addTab(self.create_monitor_tab(), "📈 实盘监控")
+        Args:
+            index: 标签页索引
+        """
+        if index in self._built_tabs or not 0 <= index < len(self._tab_factories):
+            return
+        self._built_tabs.add(index)
+
+        factory, label = self._tab_factories[index]
+        page = factory()
+
+        # 替换占位页时不触发currentChanged，并保持当前选中的标签页
+        current = self.tab_widget.currentIndex()
+        self.tab_widget.blockSignals(True)
+        placeholder = self.tab_widget.widget(index)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, page, label)
+        self.tab_widget.setCurrentIndex(current)
+        self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+
+    def _tab_index(self, factory):
+        """
+        返回由指定构建方法创建的标签页索引
 
-        # 7. 机会扫描
-        self.tab_widget.addTab(self.create_scanner_tab(), "🔍 机会扫描")
+        Args:
+            factory: 标签页构建方法（如 self.create_backtest_tab）
 
-        # 8. 通知配置
-        self.tab_widget.addTab(self.create_notification_tab(), "🔔 通知配置")
+        Returns:
+            标签页索引
+        """
+        for index, (tab_factory, _) in enumerate(self._tab_factories):
+            if tab_factory == factory:
+                return index
+        raise ValueError(f"未注册的标签页: {factory.__name__}")
 
     def create_data_download_tab(self):
         """创建数据下载标签页"""
@@ -645,6 +490,11 @@ class TradingGUI(QMainWindow):
         self.stop_download_btn.setMinimumHeight(40)
         btn_layout.addWidget(self.stop_download_btn)
 
+        export_csv_btn = QPushButton("导出CSV")
+        export_csv_btn.clicked.connect(self.export_to_csv)
+        export_csv_btn.setMinimumHeight(40)
+        btn_layout.addWidget(export_csv_btn)
+
         layout.addLayout(btn_layout)
         layout.addStretch()
 
@@ -1460,6 +1310,7 @@ class TradingGUI(QMainWindow):
         self.download_btn.setEnabled(False)
         self.stop_download_btn.setEnabled(True)
         self.download_progress.setValue(0)
+        self._pending_progress = None
 
         # 清空输出缓冲区
         self.download_output_buffer = {'stdout': '', 'stderr': ''}
@@ -1482,7 +1333,8 @@ class TradingGUI(QMainWindow):
             'symbol': symbol,
             'market': market_en,
             'interval': interval,
-            'start_date': start_date
+            'start_date': start_date,
+            'storage_format': self.config.get('storage_format', 'parquet')
         })
 
         # 启动下载进程
@@ -1492,11 +1344,62 @@ class TradingGUI(QMainWindow):
 
         self.statusBar.showMessage("正在下载数据...")
 
+    def export_to_csv(self):
+        """将已下载的Parquet数据导出为CSV（保存在同一目录）"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择要导出的数据文件",
+            "data/historical",
+            "Parquet文件 (*.parquet);;All Files (*)"
+        )
+
+        if not file_path:
+            return
+
+        try:
+            from tools.data_downloader import parquet_to_csv
+            output_path = parquet_to_csv(file_path)
+            self.log(f"已导出CSV: {output_path}", "success")
+            QMessageBox.information(self, "导出成功", f"CSV已保存到:\n{output_path}")
+        except Exception as e:
+            self.log(f"导出CSV失败: {str(e)}", "error")
+            QMessageBox.critical(self, "导出失败", f"导出CSV失败:\n{str(e)}")
+
     def on_download_progress(self, percent, message):
         """下载进度更新"""
         self.download_progress.setValue(percent)
         self.log(f"[{percent}%] {message}", "info")
 
+    # 下载进度刷新的最小间隔（秒），即最多10次/秒
+    PROGRESS_INTERVAL = 0.1
+
+    def _throttle_download_progress(self, percent, message):
+        """
+        节流刷新下载进度：间隔不足时只保留最新进度，到期后一次性刷新（100%立即刷新）
+
+        Args:
+            percent: 进度百分比
+            message: 进度消息
+        """
+        remaining = self.PROGRESS_INTERVAL - (time.monotonic() - self._last_progress_ts)
+        if percent >= 100 or remaining <= 0:
+            self._pending_progress = None
+            self._last_progress_ts = time.monotonic()
+            self.on_download_progress(percent, message)
+            return
+
+        if self._pending_progress is None:
+            QTimer.singleShot(int(remaining * 1000) + 1, self._flush_download_progress)
+        self._pending_progress = (percent, message)
+
+    def _flush_download_progress(self):
+        """刷新节流期间积压的最新下载进度"""
+        if self._pending_progress is not None:
+            percent, message = self._pending_progress
+            self._pending_progress = None
+            self._last_progress_ts = time.monotonic()
+            self.on_download_progress(percent, message)
+
     def on_download_finished(self, success, message):
         """下载完成（QThread方式）"""
         if success:
@@ -1517,9 +1420,17 @@ class TradingGUI(QMainWindow):
             # 读取标准输出并累积
             output = bytes(self.download_process.readAllStandardOutput()).decode('utf-8')
             self.download_output_buffer['stdout'] += output
+            progress = None
             for line in output.strip().split('\n'):
-                if line.strip() and not line.startswith('{'):
+                if line.startswith('PROGRESS:'):
+                    # 子进程进度: PROGRESS:<百分比>:<消息>，同一批输出只取最新一条
+                    percent, _, message = line.rstrip('\r')[len('PROGRESS:'):].partition(':')
+                    if percent.isdigit():
+                        progress = (int(percent), message)
+                elif line.strip() and not line.startswith('{'):
                     self.log(line, "info")
+            if progress is not None:
+                self._throttle_download_progress(*progress)
 
             # 读取标准错误（loguru输出到stderr）并累积
             error_output = bytes(self.download_process.readAllStandardError()).decode('utf-8')
@@ -1710,7 +1621,6 @@ class TradingGUI(QMainWindow):
         """查看回测报告"""
         if not self.last_backtest_report:
             # 如果没有最近的报告，让用户选择报告文件
-            from pathlib import Path
             report_dir = Path('reports/backtest')
             if not report_dir.exists():
                 QMessageBox.warning(self, "无报告", "还没有生成任何回测报告！\n请先运行回测。")
@@ -1729,7 +1639,6 @@ class TradingGUI(QMainWindow):
         # 读取并显示报告
         try:
             import json
-            from pathlib import Path
 
             with open(self.last_backtest_report, 'r', encoding='utf-8') as f:
                 report = json.load(f)
@@ -2197,6 +2106,12 @@ class TradingGUI(QMainWindow):
 
     def update_strategy_table(self):
         """更新策略表格"""
+        self._ensure_tab(self._tab_index(self.create_strategy_tab))  # 策略列表页（可能尚未打开过）
+        with _batched_table_update(self.strategy_table):
+            self._fill_strategy_table()
+
+    def _fill_strategy_table(self):
+        """按 self.strategies 填充策略表格（先一次性设置行数）"""
         self.strategy_table.setRowCount(len(self.strategies))
 
         for i, strategy in enumerate(self.strategies):
@@ -2604,7 +2519,6 @@ class TradingGUI(QMainWindow):
             return
 
         # 选择输出路径
-        from pathlib import Path
         default_output = str(Path(file_path).with_suffix('.qts'))
         output_path, _ = QFileDialog.getSaveFileName(
             self,
@@ -2668,7 +2582,6 @@ class TradingGUI(QMainWindow):
 
             # 添加到列表
             from datetime import datetime
-            from pathlib import Path
             config_info = {
                 'name': Path(file_path).stem,
                 'config': data['config'],
@@ -2688,6 +2601,12 @@ class TradingGUI(QMainWindow):
 
     def update_backtest_config_table(self):
         """更新回测配置表格"""
+        self._ensure_tab(self._tab_index(self.create_strategy_tab))  # 策略列表页（可能尚未打开过）
+        with _batched_table_update(self.backtest_config_table):
+            self._fill_backtest_config_table()
+
+    def _fill_backtest_config_table(self):
+        """按 self.backtest_configs 填充回测配置表格（先一次性设置行数）"""
         self.backtest_config_table.setRowCount(len(self.backtest_configs))
 
         for i, config in enumerate(self.backtest_configs):
@@ -2869,7 +2788,7 @@ class TradingGUI(QMainWindow):
         config = self.backtest_configs[index]['config']
 
         # 切换到回测标签页
-        self.tab_widget.setCurrentIndex(1)  # 回测测试是第2个标签页（索引从0开始）
+        self.tab_widget.setCurrentIndex(self._tab_index(self.create_backtest_tab))
 
         # 处理嵌套结构的配置（如market_config）
         if 'market_config' in config:
@@ -3179,6 +3098,8 @@ class TradingGUI(QMainWindow):
 
     def encrypt_backtest_config(self):
         """加密回测配置"""
+        self._ensure_tab(self._tab_index(self.create_backtest_tab))  # 回测测试页（可能尚未打开过）
+
         # 获取当前回测标签页的配置
         symbol = self.backtest_symbol.text().strip()
         market = self.backtest_market.currentText()